@@ -1,7 +1,6 @@
 #!/usr/bin/python3
 
 import collections
-import io
 import sys
 
 class Graph:
@@ -96,6 +95,49 @@ class Graph:
 
         return node in self._node_neighbors
 
+    @classmethod
+    def from_edge_arrays(cls,
+                         node_count,
+                         sources,
+                         targets,
+                         weights=None,
+                         directed=True):
+        """
+        Builds a graph with the nodes 1, ..., n and the edges given as
+        parallel lists of their sources, targets and weights in one batch,
+        without validating every edge on its own (the edges of the
+        assignments are distinct).
+
+        @type  node_count: number
+        @param node_count: The number of nodes.
+        @type  sources: list
+        @param sources: The source nodes of the edges.
+        @type  targets: list
+        @param targets: The target nodes of the edges.
+        @type  weights: list
+        @param weights: The edge weights or None for the weight 0.
+        @type  directed: boolean
+        @param directed: Whether the edges are directed.
+        @rtype: Graph
+        """
+
+        if weights is None:
+            weights = [0] * len(sources)
+        if not directed:
+            sources, targets = sources + targets, targets + sources
+            weights = weights + weights
+
+        graph = cls()
+        for node in range(1, node_count + 1):
+            graph.add_node(node)
+
+        graph._edge_weights.update(zip(zip(sources, targets), weights))
+        node_neighbors = graph._node_neighbors
+        for u, v in zip(sources, targets):
+            node_neighbors[u].append(v)
+
+        return graph
+
     def add_node(self, node):
         """
         Adds the given node to the graph.
@@ -177,25 +219,51 @@ class GraphUtil:
                  previsit=None,
                  postvisit=None,
                  excluded=None):
+        """
+        Explores the graph in the Depth First order with an explicit stack
+        of (node, neighbor iterator) frames instead of recursion, so that
+        the depth of the search is not limited by the interpreter's stack.
+
+        The previsit and postvisit hooks are fired in the same order as in
+        the recursive formulation.
+        """
+
+        nodes = graph.nodes()
+
         visited.add(node)
 
         if previsit is not None:
             previsit(node)
 
-        if node in graph.nodes():
-            for neighbor in graph.neighbors(node):
+        if node in nodes:
+            stack = [ (node, iter(graph.neighbors(node))) ]
+        else:
+            stack = [ (node, iter(())) ]
+
+        while stack:
+            current, neighbors = stack[-1]
+
+            for neighbor in neighbors:
                 if neighbor not in visited:
                     if excluded is not None and neighbor in excluded:
                         continue
-                    self._explore(graph,
-                                  neighbor,
-                                  visited,
-                                  previsit,
-                                  postvisit,
-                                  excluded)
 
-        if postvisit is not None:
-            postvisit(node)
+                    visited.add(neighbor)
+
+                    if previsit is not None:
+                        previsit(neighbor)
+
+                    if neighbor in nodes:
+                        stack.append((neighbor,
+                                      iter(graph.neighbors(neighbor))))
+                    else:
+                        stack.append((neighbor, iter(())))
+                    break
+            else:
+                stack.pop()
+
+                if postvisit is not None:
+                    postvisit(current)
 
     def reaches(self, graph, x, y):
         """
@@ -217,26 +285,34 @@ class Solver:
 
     def __init__(self):
         if __name__ == '__main__':
-            input_stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
-            self.input_processor = input_stream
+            # reads the whole input at once
+            self.input_data = sys.stdin.buffer.read()
 
     def _input(self):
-        return self.input_processor.readline().strip()
+        return self.input_data
+
+    def _input_integers(self):
+        """
+        Returns all integers of the input, split in one pass.
+        """
+
+        return [int(x) for x in self._input().split()]
 
     def _output(self, text):
         print(text)
 
     def solve(self):
-        n, m = map(int, self._input().split())
+        integers = self._input_integers()
+        n, m = integers[0], integers[1]
 
-        graph = Graph()
-        for i in range(1, n + 1):
-            graph.add_node(i)
-        for i in range(m):
-            u, v = map(int, self._input().split())
-            graph.add_undirected_edge(u, v)
+        # the edges follow as pairs of integers and are added in one batch
+        end = 2 + 2 * m
+        graph = Graph.from_edge_arrays(n,
+                                       integers[2:end:2],
+                                       integers[3:end:2],
+                                       directed=False)
 
-        x, y = map(int, self._input().split())
+        x, y = integers[end], integers[end + 1]
 
         self._output(1 if GraphUtil().reaches(graph, x, y) else 0)
 
@@ -16,7 +16,7 @@ class SolverSolveTestCase(unittest.TestCase):
         pass
 
     def generate_input(self):
-        return self.input_list.pop(0)
+        return '\n'.join(self.input_list)
 
     def accumulate_output(self, text):
         return self.output_list.append(text)
@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 
+import array
 import collections
-import io
 import sys
 
 class Graph:
@@ -96,6 +96,49 @@ class Graph:
 
         return node in self._node_neighbors
 
+    @classmethod
+    def from_edge_arrays(cls,
+                         node_count,
+                         sources,
+                         targets,
+                         weights=None,
+                         directed=True):
+        """
+        Builds a graph with the nodes 1, ..., n and the edges given as
+        parallel lists of their sources, targets and weights in one batch,
+        without validating every edge on its own (the edges of the
+        assignments are distinct).
+
+        @type  node_count: number
+        @param node_count: The number of nodes.
+        @type  sources: list
+        @param sources: The source nodes of the edges.
+        @type  targets: list
+        @param targets: The target nodes of the edges.
+        @type  weights: list
+        @param weights: The edge weights or None for the weight 0.
+        @type  directed: boolean
+        @param directed: Whether the edges are directed.
+        @rtype: Graph
+        """
+
+        if weights is None:
+            weights = [0] * len(sources)
+        if not directed:
+            sources, targets = sources + targets, targets + sources
+            weights = weights + weights
+
+        graph = cls()
+        for node in range(1, node_count + 1):
+            graph.add_node(node)
+
+        graph._edge_weights.update(zip(zip(sources, targets), weights))
+        node_neighbors = graph._node_neighbors
+        for u, v in zip(sources, targets):
+            node_neighbors[u].append(v)
+
+        return graph
+
     def add_node(self, node):
         """
         Adds the given node to the graph.
@@ -204,25 +247,120 @@ class GraphUtil:
                  previsit=None,
                  postvisit=None,
                  excluded=None):
+        """
+        Explores the graph in the Depth First order with an explicit stack
+        of (node, neighbor iterator) frames instead of recursion, so that
+        the depth of the search is not limited by the interpreter's stack.
+
+        The previsit and postvisit hooks are fired in the same order as in
+        the recursive formulation.
+        """
+
+        nodes = graph.nodes()
+
         visited.add(node)
 
         if previsit is not None:
             previsit(node)
 
-        if node in graph.nodes():
-            for neighbor in graph.neighbors(node):
+        if node in nodes:
+            stack = [ (node, iter(graph.neighbors(node))) ]
+        else:
+            stack = [ (node, iter(())) ]
+
+        while stack:
+            current, neighbors = stack[-1]
+
+            for neighbor in neighbors:
                 if neighbor not in visited:
                     if excluded is not None and neighbor in excluded:
                         continue
-                    self._explore(graph,
-                                  neighbor,
-                                  visited,
-                                  previsit,
-                                  postvisit,
-                                  excluded)
 
-        if postvisit is not None:
-            postvisit(node)
+                    visited.add(neighbor)
+
+                    if previsit is not None:
+                        previsit(neighbor)
+
+                    if neighbor in nodes:
+                        stack.append((neighbor,
+                                      iter(graph.neighbors(neighbor))))
+                    else:
+                        stack.append((neighbor, iter(())))
+                    break
+            else:
+                stack.pop()
+
+                if postvisit is not None:
+                    postvisit(current)
+
+    def _tarjan(self, graph):
+        """
+        Labels every node with the number of its strongly connected
+        component in one iterative pass of Tarjan's algorithm.
+
+        The components are numbered in the order they are completed, which
+        is a reverse topological order of the condensation.
+
+        Returns the list of nodes, the array of component numbers indexed
+        like the list of nodes and the number of components.
+        """
+
+        nodes = [x for x in graph.nodes()]
+        node_index = {}
+        for i, node in enumerate(nodes):
+            node_index[node] = i
+
+        node_count = len(nodes)
+        discovery = array.array('l', [-1]) * node_count
+        lowlink = array.array('l', [0]) * node_count
+        component = array.array('l', [-1]) * node_count
+        on_stack = bytearray(node_count)
+        stack = []
+        clock = 0
+        component_count = 0
+
+        for root in range(node_count):
+            if discovery[root] != -1:
+                continue
+
+            discovery[root] = lowlink[root] = clock
+            clock += 1
+            stack.append(root)
+            on_stack[root] = 1
+            call_stack = [ (root, iter(graph.neighbors(nodes[root]))) ]
+
+            while call_stack:
+                v, neighbors = call_stack[-1]
+
+                for neighbor in neighbors:
+                    w = node_index[neighbor]
+                    if discovery[w] == -1:
+                        discovery[w] = lowlink[w] = clock
+                        clock += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        call_stack.append((w, iter(graph.neighbors(neighbor))))
+                        break
+                    elif on_stack[w] and discovery[w] < lowlink[v]:
+                        lowlink[v] = discovery[w]
+                else:
+                    call_stack.pop()
+
+                    if call_stack:
+                        u = call_stack[-1][0]
+                        if lowlink[v] < lowlink[u]:
+                            lowlink[u] = lowlink[v]
+
+                    if lowlink[v] == discovery[v]:
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = 0
+                            component[w] = component_count
+                            if w == v:
+                                break
+                        component_count += 1
+
+        return nodes, component, component_count
 
     def explore(self,
                 graph,
@@ -285,9 +423,7 @@ class GraphUtil:
 
         self.depth_first_search(reverse_graph)
 
-        nodes_ordered_by_postorder = []
-        for k, v in enumerate(self.postorder):
-            nodes_ordered_by_postorder.insert(0, v)
+        nodes_ordered_by_postorder = [x for x in reversed(self.postorder)]
 
         strongly_connected_components = []
 
@@ -306,6 +442,26 @@ class GraphUtil:
 
         return strongly_connected_components
 
+    def tarjan_strongly_connected_components(self, graph):
+        """
+        Finds the strongly connected components with Tarjan's algorithm.
+
+        Unlike the Kosaraju-style strongly_connected_components, it makes a
+        single Depth First pass over the graph and keeps integer lowlink
+        arrays instead of materializing the reversed graph.
+
+        The components are returned in a reverse topological order of the
+        condensation, that is, sink components come first.
+        """
+
+        nodes, component, component_count = self._tarjan(graph)
+
+        strongly_connected_components = [[] for i in range(component_count)]
+        for i, node in enumerate(nodes):
+            strongly_connected_components[component[i]].append(node)
+
+        return strongly_connected_components
+
 class Solver:
     """
     Computes the number of strongly connected components of a given directed
@@ -314,30 +470,35 @@ class Solver:
 
     def __init__(self):
         if __name__ == '__main__':
-            input_stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
-            self.input_processor = input_stream
+            # reads the whole input at once
+            self.input_data = sys.stdin.buffer.read()
 
     def _input(self):
-        return self.input_processor.readline().strip()
+        return self.input_data
+
+    def _input_integers(self):
+        """
+        Returns all integers of the input, split in one pass.
+        """
+
+        return [int(x) for x in self._input().split()]
 
     def _output(self, text):
         print(text)
 
     def solve(self):
-        n, m = map(int, self._input().split())
+        integers = self._input_integers()
+        n, m = integers[0], integers[1]
 
-        graph = Graph()
-        for i in range(1, n + 1):
-            graph.add_node(i)
-        for i in range(m):
-            u, v = map(int, self._input().split())
-            graph.add_directed_edge(u, v)
+        # the edges follow as pairs of integers and are added in one batch
+        end = 2 + 2 * m
+        graph = Graph.from_edge_arrays(n,
+                                       integers[2:end:2],
+                                       integers[3:end:2])
 
-        result = GraphUtil().strongly_connected_components(graph)
+        result = GraphUtil().tarjan_strongly_connected_components(graph)
 
         self._output(len(result))
 
 if __name__ == '__main__':
-    sys.setrecursionlimit(200000)
-
     Solver().solve()
@@ -1,12 +1,15 @@
 #!/usr/bin/python3
 
+import array
 import collections
-import io
 import sys
 
 class Graph:
     """
     Represents the graph data structure.
+
+    Every node is also interned as a dense integer index, and the edges are
+    mirrored in per-index lists of neighbor indices and weights.
     """
 
     def __init__(self):
@@ -17,6 +20,11 @@ class Graph:
         self._node_neighbors = {}
         self._edge_weights = {}
 
+        self._nodes = []
+        self._node_index = {}
+        self._index_neighbors = []
+        self._index_weights = []
+
     def __repr__(self):
         """
         Returns a string representation of the graph.
@@ -73,6 +81,27 @@ class Graph:
 
         return self._edge_weights.keys()
 
+    def index(self, node):
+        """
+        Returns the dense integer index of the given node.
+
+        @type  node: node
+        @param node: The node identifier.
+        @rtype: int
+        """
+
+        return self._node_index[node]
+
+    def interned(self):
+        """
+        Returns the list of nodes ordered by their indices and the lists of
+        neighbor indices and edge weights of every node index.
+
+        @rtype: tuple
+        """
+
+        return self._nodes, self._index_neighbors, self._index_weights
+
     def weight(self, edge):
         """
         Returns the weight associated with the edge (which is a tuple of two
@@ -96,6 +125,53 @@ class Graph:
 
         return node in self._node_neighbors
 
+    @classmethod
+    def from_edge_arrays(cls,
+                         node_count,
+                         sources,
+                         targets,
+                         weights=None,
+                         directed=True):
+        """
+        Builds a graph with the nodes 1, ..., n and the edges given as
+        parallel lists of their sources, targets and weights in one batch,
+        without validating every edge on its own (the edges of the
+        assignments are distinct).
+
+        @type  node_count: number
+        @param node_count: The number of nodes.
+        @type  sources: list
+        @param sources: The source nodes of the edges.
+        @type  targets: list
+        @param targets: The target nodes of the edges.
+        @type  weights: list
+        @param weights: The edge weights or None for the weight 0.
+        @type  directed: boolean
+        @param directed: Whether the edges are directed.
+        @rtype: Graph
+        """
+
+        if weights is None:
+            weights = [0] * len(sources)
+        if not directed:
+            sources, targets = sources + targets, targets + sources
+            weights = weights + weights
+
+        graph = cls()
+        for node in range(1, node_count + 1):
+            graph.add_node(node)
+
+        graph._edge_weights.update(zip(zip(sources, targets), weights))
+        node_neighbors = graph._node_neighbors
+        index_neighbors = graph._index_neighbors
+        index_weights = graph._index_weights
+        for u, v, weight in zip(sources, targets, weights):
+            node_neighbors[u].append(v)
+            index_neighbors[u - 1].append(v - 1)
+            index_weights[u - 1].append(weight)
+
+        return graph
+
     def add_node(self, node):
         """
         Adds the given node to the graph.
@@ -110,9 +186,19 @@ class Graph:
 
         if not node in self._node_neighbors:
             self._node_neighbors[node] = []
+
+            self._node_index[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._index_neighbors.append([])
+            self._index_weights.append([])
         else:
             raise ValueError('Node %s already in the graph.' % node)
 
+    def _add_index_edge(self, u, v, weight):
+        i = self._node_index[u]
+        self._index_neighbors[i].append(self._node_index[v])
+        self._index_weights[i].append(weight)
+
     def add_directed_edge(self, u, v, weight=0):
         """
         Add a directed edge connecting two given nodes to the graph.
@@ -134,6 +220,7 @@ class Graph:
         if edge not in self._edge_weights:
             self._node_neighbors[u].append(v)
             self._edge_weights[edge] = weight
+            self._add_index_edge(u, v, weight)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge)
 
@@ -159,49 +246,140 @@ class Graph:
         if edge1 not in self._edge_weights:
             self._node_neighbors[u].append(v)
             self._edge_weights[edge1] = weight
+            self._add_index_edge(u, v, weight)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge1)
 
         if edge2 not in self._edge_weights:
             self._node_neighbors[v].append(u)
             self._edge_weights[edge2] = weight
+            self._add_index_edge(v, u, weight)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge2)
 
 class GraphUtil:
 
-    def _create_distance_and_previous_maps(self, graph):
-        distance_map = {}
-        predecessor_map = {}
-        for node in graph.nodes():
-            distance_map[node] = float('inf')
-            predecessor_map[node] = None
+    # the thresholds of the direction-optimizing Breadth First Search: it
+    # goes bottom-up when the frontier has more than 1/ALPHA of the
+    # unexplored edges and back top-down when the frontier has less than
+    # 1/BETA of the nodes
+    BOTTOM_UP_ALPHA = 14
+    BOTTOM_UP_BETA = 24
+
+    def _frontier_bfs(self,
+                      index_neighbors,
+                      sources,
+                      levels,
+                      parents,
+                      visited,
+                      index_predecessors=None):
+        """
+        Explores the interned graph in the Breadth First order one frontier
+        (one level) at a time from all given source indices at once, so the
+        level of every reached node is its distance to the nearest source.
+
+        Writes into the given buffers: the levels and the parents (-1 for
+        the sources) of the reached nodes and their flags in the visited
+        bytearray. Already visited nodes are neither sources nor reached
+        again, so the buffers can be shared by several searches.
+
+        With the reversed adjacency lists, switches between the top-down
+        steps (the frontier scans its out-edges) and the bottom-up steps
+        (every unvisited node scans its in-edges for a frontier node), which
+        pay off while the frontier covers a large part of the graph.
+        """
 
-        return distance_map, predecessor_map
+        node_count = len(index_neighbors)
+
+        frontier = []
+        for s in sources:
+            if not visited[s]:
+                visited[s] = 1
+                levels[s] = 0
+                frontier.append(s)
+
+        unexplored_edge_count = 0
+        if index_predecessors is not None:
+            for neighbors in index_neighbors:
+                unexplored_edge_count += len(neighbors)
+
+        top_down = True
+        level = 0
+        while frontier:
+            level += 1
+
+            if index_predecessors is not None:
+                frontier_edge_count = 0
+                for u in frontier:
+                    frontier_edge_count += len(index_neighbors[u])
+
+                if (top_down and frontier_edge_count >
+                    unexplored_edge_count / self.BOTTOM_UP_ALPHA):
+                    top_down = False
+                elif (not top_down and
+                      len(frontier) < node_count / self.BOTTOM_UP_BETA):
+                    top_down = True
+
+                unexplored_edge_count -= frontier_edge_count
+
+            next_frontier = []
+            if top_down:
+                for u in frontier:
+                    for v in index_neighbors[u]:
+                        if not visited[v]:
+                            visited[v] = 1
+                            levels[v] = level
+                            parents[v] = u
+                            next_frontier.append(v)
+            else:
+                # a visited predecessor of an unvisited node was visited by
+                # this search (any earlier search would have reached the
+                # node), so its level tells if it is in the frontier
+                for v in range(node_count):
+                    if not visited[v]:
+                        for u in index_predecessors[v]:
+                            if levels[u] == level - 1:
+                                visited[v] = 1
+                                levels[v] = level
+                                parents[v] = u
+                                next_frontier.append(v)
+                                break
+
+            frontier = next_frontier
 
     def shortest_path_tree(self, graph, start):
         """
         Constructs a distance layer tree of the shortest paths from the
         start vertex.
 
-        Performs the search in the Breadth First order.
+        Performs the search in the Breadth First order one frontier at a
+        time. The graph is undirected, so its adjacency lists serve as the
+        reversed ones for the bottom-up steps as well.
         """
 
-        distance_map, predecessor_map = \
-                                  self._create_distance_and_previous_maps(graph)
+        nodes, index_neighbors, index_weights = graph.interned()
 
-        distance_map[start] = 0
+        levels = array.array('l', [-1]) * len(nodes)
+        parents = array.array('l', [-1]) * len(nodes)
+        visited = bytearray(len(nodes))
 
-        queue = []
-        queue.append(start)
+        self._frontier_bfs(index_neighbors,
+                           [ graph.index(start) ],
+                           levels,
+                           parents,
+                           visited,
+                           index_neighbors)
 
-        while len(queue) > 0:
-            node = queue.pop(0)
-            for neighbor in graph.neighbors(node):
-                if distance_map[neighbor] == float('inf'):
-                    queue.append(neighbor)
-                    distance_map[neighbor] = distance_map[node] + 1
-                    predecessor_map[neighbor] = node
+        distance_map = {}
+        predecessor_map = {}
+        for i, node in enumerate(nodes):
+            if levels[i] == -1:
+                distance_map[node] = float('inf')
+                predecessor_map[node] = None
+            else:
+                distance_map[node] = levels[i]
+                predecessor_map[node] = (None if parents[i] == -1
+                                         else nodes[parents[i]])
 
         return distance_map, predecessor_map
 
@@ -221,26 +399,34 @@ class Solver:
 
     def __init__(self):
         if __name__ == '__main__':
-            input_stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
-            self.input_processor = input_stream
+            # reads the whole input at once
+            self.input_data = sys.stdin.buffer.read()
 
     def _input(self):
-        return self.input_processor.readline().strip()
+        return self.input_data
+
+    def _input_integers(self):
+        """
+        Returns all integers of the input, split in one pass.
+        """
+
+        return [int(x) for x in self._input().split()]
 
     def _output(self, text):
         print(text)
 
     def solve(self):
-        n, m = map(int, self._input().split())
+        integers = self._input_integers()
+        n, m = integers[0], integers[1]
 
-        graph = Graph()
-        for i in range(1, n + 1):
-            graph.add_node(i)
-        for i in range(m):
-            u, v = map(int, self._input().split())
-            graph.add_undirected_edge(u, v)
+        # the edges follow as pairs of integers and are added in one batch
+        end = 2 + 2 * m
+        graph = Graph.from_edge_arrays(n,
+                                       integers[2:end:2],
+                                       integers[3:end:2],
+                                       directed=False)
 
-        start, destination = map(int, self._input().split())
+        start, destination = integers[end], integers[end + 1]
 
         distance, previous = GraphUtil().shortest_path_tree(graph, start)
 
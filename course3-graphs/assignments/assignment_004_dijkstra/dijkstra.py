@@ -1,7 +1,6 @@
 #!/usr/bin/python3
 
 import enum
-import io
 import sys
 
 class HeapMode(enum.Enum):
@@ -184,6 +183,230 @@ class BinHeap:
 
         self._size = original_size
 
+class IndexedBinHeap(BinHeap):
+    """
+    Represents a binary heap that keeps track of the position of every datum,
+    so that the priority of a datum can be changed in O(log n) without
+    scanning the heap.
+
+    Every datum must be hashable and may occur in the heap at most once.
+    """
+
+    def __init__(self, mode=HeapMode.min):
+        super().__init__(mode)
+        self._positions = {}
+
+    def _swap(self, i, j):
+        heap_list = self._heap_list
+        heap_list[i], heap_list[j] = heap_list[j], heap_list[i]
+        self._positions[heap_list[i].datum] = i
+        self._positions[heap_list[j].datum] = j
+
+    def _sift_down(self, index):
+        while self._left_child(index) < self.size:
+            priority_child = self._priority_child(index)
+
+            if not self._has_greater_priority(
+                self._heap_list[priority_child],
+                self._heap_list[index],
+                self.mode):
+                break
+
+            self._swap(index, priority_child)
+            index = priority_child
+
+    def _sift_up(self, index):
+        while index > 0:
+            parent = self._parent(index)
+
+            if not self._has_greater_priority(
+                self._heap_list[index],
+                self._heap_list[parent],
+                self.mode):
+                break
+
+            self._swap(index, parent)
+            index = parent
+
+    def contains(self, datum):
+        """
+        Returns whether the given datum is in the heap.
+        """
+
+        return datum in self._positions
+
+    def position(self, datum):
+        """
+        Returns the index of the given datum in the heap list.
+        """
+
+        if datum not in self._positions:
+            raise KeyError('{} not in the heap.'.format(datum))
+
+        return self._positions[datum]
+
+    def build(self, list):
+        self._positions = {}
+        for i, item in enumerate(list):
+            if item.datum in self._positions:
+                raise ValueError('{} already in the heap.'.format(item.datum))
+            self._positions[item.datum] = i
+
+        super().build(list)
+
+    def extract(self):
+        min_element = self._heap_list[0]
+        last_element = self._heap_list.pop()
+        self._size = self.size - 1
+        del self._positions[min_element.datum]
+
+        if self.size > 0:
+            self._heap_list[0] = last_element
+            self._positions[last_element.datum] = 0
+            self._sift_down(0)
+
+        return min_element
+
+    def insert(self, item):
+        if item.datum in self._positions:
+            raise ValueError('{} already in the heap.'.format(item.datum))
+
+        self._heap_list.append(item)
+        self._size = self.size + 1
+        self._positions[item.datum] = self.size - 1
+        self._sift_up(self.size - 1)
+
+    def change_priority(self, index, p):
+        if index < 0 or index >= self.size:
+            raise IndexError()
+
+        item = self._heap_list[index]
+        old_item = HeapItem(item.priority, item.datum)
+        item._priority = p
+        if self._has_greater_priority(item, old_item, self.mode):
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def decrease_key(self, datum, priority):
+        """
+        Moves the given datum towards the top of the heap by assigning it a
+        higher priority (a smaller one for the min mode, a larger one for the
+        max mode).
+        """
+
+        index = self.position(datum)
+        item = self._heap_list[index]
+        if self._has_greater_priority(item.priority, priority, self.mode):
+            raise ValueError(
+                'Priority {} of {} is not higher than {}.'.format(
+                    priority, datum, item.priority))
+
+        item._priority = priority
+        self._sift_up(index)
+
+    def sort_in_place(self, data):
+        super().sort_in_place(data)
+
+        self._positions = {}
+        for i, item in enumerate(self._heap_list):
+            self._positions[item.datum] = i
+
+class BucketQueue:
+    """
+    Represents a Dial's bucket queue: a min priority queue of non-negative
+    integer priorities that never differ by more than the given maximum
+    spread, such as the tentative distances of the Dijkstra's algorithm with
+    edge weights of at most the spread.
+
+    The datums are kept in a circular array of spread + 1 buckets indexed by
+    their priorities modulo the number of buckets, so insert and
+    decrease_key are O(1) and extract scans at most spread + 1 buckets.
+
+    Every datum must be hashable and may occur in the queue at most once.
+    """
+
+    def __init__(self, maximum_spread):
+        if maximum_spread < 0:
+            raise ValueError('Maximum spread must be non-negative.')
+
+        self._buckets = [{} for i in range(maximum_spread + 1)]
+        self._priorities = {}
+        self._minimum = 0
+
+    @property
+    def mode(self):
+        return HeapMode.min
+
+    @property
+    def size(self):
+        return len(self._priorities)
+
+    def contains(self, datum):
+        """
+        Returns whether the given datum is in the queue.
+        """
+
+        return datum in self._priorities
+
+    def _check_priority(self, priority):
+        if priority < 0:
+            raise ValueError(
+                'Priority {} must be non-negative.'.format(priority))
+
+        if (self.size > 0 and
+            priority - self._minimum >= len(self._buckets)):
+            raise ValueError(
+                'Priority {} exceeds the spread of the queue.'.format(
+                    priority))
+
+    def insert(self, item):
+        if item.datum in self._priorities:
+            raise ValueError('{} already in the heap.'.format(item.datum))
+
+        priority = item.priority
+        self._check_priority(priority)
+
+        if self.size == 0 or priority < self._minimum:
+            self._minimum = priority
+        self._buckets[priority % len(self._buckets)][item.datum] = None
+        self._priorities[item.datum] = priority
+
+    def extract(self):
+        buckets = self._buckets
+        priority = self._minimum
+        bucket = buckets[priority % len(buckets)]
+        while not bucket:
+            priority += 1
+            bucket = buckets[priority % len(buckets)]
+        self._minimum = priority
+
+        # the buckets keep their datums in the insertion order
+        datum = next(iter(bucket))
+        del bucket[datum]
+        del self._priorities[datum]
+
+        return HeapItem(priority, datum)
+
+    def decrease_key(self, datum, priority):
+        """
+        Assigns the given datum a smaller priority.
+        """
+
+        if datum not in self._priorities:
+            raise KeyError('{} not in the heap.'.format(datum))
+
+        old_priority = self._priorities[datum]
+        if priority > old_priority:
+            raise ValueError(
+                'Priority {} of {} is not higher than {}.'.format(
+                    priority, datum, old_priority))
+        self._check_priority(priority)
+
+        del self._buckets[old_priority % len(self._buckets)][datum]
+        del self._priorities[datum]
+        self.insert(HeapItem(priority, datum))
+
 class Graph:
     """
     Represents the graph data structure.
@@ -276,6 +499,49 @@ class Graph:
 
         return node in self._node_neighbors
 
+    @classmethod
+    def from_edge_arrays(cls,
+                         node_count,
+                         sources,
+                         targets,
+                         weights=None,
+                         directed=True):
+        """
+        Builds a graph with the nodes 1, ..., n and the edges given as
+        parallel lists of their sources, targets and weights in one batch,
+        without validating every edge on its own (the edges of the
+        assignments are distinct).
+
+        @type  node_count: number
+        @param node_count: The number of nodes.
+        @type  sources: list
+        @param sources: The source nodes of the edges.
+        @type  targets: list
+        @param targets: The target nodes of the edges.
+        @type  weights: list
+        @param weights: The edge weights or None for the weight 0.
+        @type  directed: boolean
+        @param directed: Whether the edges are directed.
+        @rtype: Graph
+        """
+
+        if weights is None:
+            weights = [0] * len(sources)
+        if not directed:
+            sources, targets = sources + targets, targets + sources
+            weights = weights + weights
+
+        graph = cls()
+        for node in range(1, node_count + 1):
+            graph.add_node(node)
+
+        graph._edge_weights.update(zip(zip(sources, targets), weights))
+        node_neighbors = graph._node_neighbors
+        for u, v in zip(sources, targets):
+            node_neighbors[u].append(v)
+
+        return graph
+
     def add_node(self, node):
         """
         Adds the given node to the graph.
@@ -369,11 +635,15 @@ class GraphUtil:
 
         return False
 
-    def dijkstra_shortest_paths(self, graph, start):
+    def dijkstra_shortest_paths(self, graph, start, maximum_weight=None):
         """
         Finds the shortest paths between vertices in a graph, which may
         represent, for example, road networks. It was conceived by computer
         scientist Edsger W. Dijkstra in 1956 and published three years later.
+
+        When the edge weights are non-negative integers of at most the given
+        maximum weight, the vertices are kept in a Dial's bucket queue
+        instead of a binary heap.
         """
 
         distance_map, predecessor_map = \
@@ -381,9 +651,11 @@ class GraphUtil:
 
         distance_map[start] = 0
 
-        priority_queue = BinHeap(HeapMode.min)
-        for node, value in distance_map.items():
-            priority_queue.insert(HeapItem(value, node))
+        if maximum_weight is None:
+            priority_queue = IndexedBinHeap(HeapMode.min)
+        else:
+            priority_queue = BucketQueue(maximum_weight)
+        priority_queue.insert(HeapItem(0, start))
 
         while priority_queue.size > 0:
             min_item = priority_queue.extract()
@@ -394,14 +666,12 @@ class GraphUtil:
                                predecessor_map,
                                node,
                                neighbor):
-                    index = None
-                    for i, value in enumerate(priority_queue.elements):
-                        if value.datum == neighbor:
-                            index = i
-                            break
-                    edge_distance = (distance_map[node] +
-                                     graph.weight((node, neighbor)))
-                    priority_queue.change_priority(index, edge_distance)
+                    if priority_queue.contains(neighbor):
+                        priority_queue.decrease_key(neighbor,
+                                                    distance_map[neighbor])
+                    else:
+                        priority_queue.insert(HeapItem(distance_map[neighbor],
+                                                       neighbor))
 
         return distance_map, predecessor_map
 
@@ -415,29 +685,41 @@ class Solver:
 
     def __init__(self):
         if __name__ == '__main__':
-            input_stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
-            self.input_processor = input_stream
+            # reads the whole input at once
+            self.input_data = sys.stdin.buffer.read()
 
     def _input(self):
-        return self.input_processor.readline().strip()
+        return self.input_data
+
+    def _input_integers(self):
+        """
+        Returns all integers of the input, split in one pass.
+        """
+
+        return [int(x) for x in self._input().split()]
 
     def _output(self, text):
         print(text)
 
     def solve(self):
-        n, m = map(int, self._input().split())
-
-        graph = Graph()
-        for i in range(1, n + 1):
-            graph.add_node(i)
-        for i in range(m):
-            u, v, weight = map(int, self._input().split())
-            graph.add_directed_edge(u, v, weight)
-
-        u, v = map(int, self._input().split())
-
-        distance_map, previous_map = GraphUtil().dijkstra_shortest_paths(graph,
-                                                                         u)
+        integers = self._input_integers()
+        n, m = integers[0], integers[1]
+
+        # the edges follow as triples of integers and are added in one batch
+        end = 2 + 3 * m
+        weights = integers[4:end:3]
+        graph = Graph.from_edge_arrays(n,
+                                       integers[2:end:3],
+                                       integers[3:end:3],
+                                       weights)
+        maximum_weight = max(weights, default=0)
+
+        u, v = integers[end], integers[end + 1]
+
+        distance_map, previous_map = GraphUtil().dijkstra_shortest_paths(
+                                                                graph,
+                                                                u,
+                                                                maximum_weight)
 
         result = distance_map[v]
         self._output(result if result != float('inf') else -1)
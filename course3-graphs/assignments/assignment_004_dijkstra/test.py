@@ -11,16 +11,12 @@ class SolverSolveTestCase(unittest.TestCase):
         self.solver._input = self.generate_input
         self.solver._output = self.accumulate_output
         self.output_list = []
-        self.index = 0
 
     def tearDown(self):
         pass
 
     def generate_input(self):
-        line = self.input_list[self.index]
-        self.index += 1
-
-        return line
+        return '\n'.join(self.input_list)
 
     def accumulate_output(self, text):
         return self.output_list.append(text)
@@ -1,6 +1,5 @@
 #!/usr/bin/python3
 
-import io
 import sys
 
 class Graph:
@@ -95,6 +94,49 @@ class Graph:
 
         return node in self._node_neighbors
 
+    @classmethod
+    def from_edge_arrays(cls,
+                         node_count,
+                         sources,
+                         targets,
+                         weights=None,
+                         directed=True):
+        """
+        Builds a graph with the nodes 1, ..., n and the edges given as
+        parallel lists of their sources, targets and weights in one batch,
+        without validating every edge on its own (the edges of the
+        assignments are distinct).
+
+        @type  node_count: number
+        @param node_count: The number of nodes.
+        @type  sources: list
+        @param sources: The source nodes of the edges.
+        @type  targets: list
+        @param targets: The target nodes of the edges.
+        @type  weights: list
+        @param weights: The edge weights or None for the weight 0.
+        @type  directed: boolean
+        @param directed: Whether the edges are directed.
+        @rtype: Graph
+        """
+
+        if weights is None:
+            weights = [0] * len(sources)
+        if not directed:
+            sources, targets = sources + targets, targets + sources
+            weights = weights + weights
+
+        graph = cls()
+        for node in range(1, node_count + 1):
+            graph.add_node(node)
+
+        graph._edge_weights.update(zip(zip(sources, targets), weights))
+        node_neighbors = graph._node_neighbors
+        for u, v in zip(sources, targets):
+            node_neighbors[u].append(v)
+
+        return graph
+
     def add_node(self, node):
         """
         Adds the given node to the graph.
@@ -169,6 +211,35 @@ class Graph:
 
 class GraphUtil:
 
+    def _predecessor_cycle(self, predecessor_map, nodes, excluded):
+        """
+        Walks the predecessor map from every given node and returns the
+        first cycle met, in the order of its edges, or an empty list.
+
+        Nodes visited by an earlier walk end a walk, so the whole check takes
+        time linear in the number of walked nodes.
+        """
+
+        walk_ids = {}
+        for walk_id, node in enumerate(nodes):
+            while (node is not None and
+                   node not in walk_ids and
+                   node not in excluded):
+                walk_ids[node] = walk_id
+                node = predecessor_map[node]
+
+            if node is not None and walk_ids.get(node) == walk_id:
+                cycle = [ node ]
+                predecessor = predecessor_map[node]
+                while predecessor != node:
+                    cycle.append(predecessor)
+                    predecessor = predecessor_map[predecessor]
+                cycle.reverse()
+
+                return cycle
+
+        return []
+
     def bellman_ford_negative_cycle_detector(self, graph, start):
         """
         Finds the shortest paths between vertices in a graph, which may
@@ -194,6 +265,51 @@ class GraphUtil:
 
         return False
 
+    def spfa_negative_cycle_detector(self, graph, start):
+        """
+        Detects a negative cycle reachable from the start node with the
+        queue-based Bellman-Ford algorithm: every round only relaxes the
+        edges leaving the nodes whose distances changed in the previous
+        round, and the search stops as soon as a round changes nothing or
+        the predecessor walks from the changed nodes meet a cycle (such a
+        cycle always has a negative weight).
+
+        Returns the negative cycle as a list of nodes where every node has
+        an edge to the next one and the last one has an edge to the first
+        one, or an empty list.
+        """
+
+        distance_map = {}
+        predecessor_map = {}
+        for node in graph.nodes():
+            distance_map[node] = float('inf')
+            predecessor_map[node] = None
+
+        distance_map[start] = 0
+
+        queue = [ start ]
+        while len(queue) > 0:
+            next_queue = []
+            queued = set()
+            for node in queue:
+                for neighbor in graph.neighbors(node):
+                    edge_distance = (distance_map[node] +
+                                     graph.weight((node, neighbor)))
+                    if distance_map[neighbor] > edge_distance:
+                        distance_map[neighbor] = edge_distance
+                        predecessor_map[neighbor] = node
+                        if neighbor not in queued:
+                            queued.add(neighbor)
+                            next_queue.append(neighbor)
+
+            queue = next_queue
+
+            cycle = self._predecessor_cycle(predecessor_map, queue, set())
+            if len(cycle) > 0:
+                return cycle
+
+        return []
+
 class Solver:
     """
     Given an directed graph with possibly negative edge weights and with n
@@ -215,24 +331,32 @@ class Solver:
 
     def __init__(self):
         if __name__ == '__main__':
-            input_stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
-            self.input_processor = input_stream
+            # reads the whole input at once
+            self.input_data = sys.stdin.buffer.read()
 
     def _input(self):
-        return self.input_processor.readline().strip()
+        return self.input_data
+
+    def _input_integers(self):
+        """
+        Returns all integers of the input, split in one pass.
+        """
+
+        return [int(x) for x in self._input().split()]
 
     def _output(self, text):
         print(text)
 
     def solve(self):
-        n, m = map(int, self._input().split())
+        integers = self._input_integers()
+        n, m = integers[0], integers[1]
 
-        graph = Graph()
-        for i in range(1, n + 1):
-            graph.add_node(i)
-        for i in range(m):
-            u, v, weight = map(int, self._input().split())
-            graph.add_directed_edge(u, v, weight)
+        # the edges follow as triples of integers and are added in one batch
+        end = 2 + 3 * m
+        graph = Graph.from_edge_arrays(n,
+                                       integers[2:end:3],
+                                       integers[3:end:3],
+                                       integers[4:end:3])
 
         virtual_node = n + 1
         graph.add_node(virtual_node)
@@ -240,11 +364,10 @@ class Solver:
             graph.add_directed_edge(virtual_node, i, 0)
 
         start_node = virtual_node
-        negative_cycle_detected = \
-                  GraphUtil().bellman_ford_negative_cycle_detector(graph,
-                                                                   start_node)
+        negative_cycle = GraphUtil().spfa_negative_cycle_detector(graph,
+                                                                  start_node)
 
-        self._output(1 if negative_cycle_detected else 0)
+        self._output(1 if len(negative_cycle) > 0 else 0)
 
 if __name__ == '__main__':
     Solver().solve()
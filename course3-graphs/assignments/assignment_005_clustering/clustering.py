@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 
-import enum
+import array
 import io
 import math
 import sys
@@ -8,6 +8,9 @@ import sys
 class Graph:
     """
     Represents the graph data structure.
+
+    Every node is also interned as a dense integer index, and the edges are
+    mirrored in per-index lists of neighbor indices and weights.
     """
 
     def __init__(self):
@@ -18,6 +21,11 @@ class Graph:
         self._node_neighbors = {}
         self._edge_weights = {}
 
+        self._nodes = []
+        self._node_index = {}
+        self._index_neighbors = []
+        self._index_weights = []
+
     def __repr__(self):
         """
         Returns a string representation of the graph.
@@ -74,6 +82,16 @@ class Graph:
 
         return self._edge_weights.keys()
 
+    def interned(self):
+        """
+        Returns the list of nodes ordered by their indices and the lists of
+        neighbor indices and edge weights of every node index.
+
+        @rtype: tuple
+        """
+
+        return self._nodes, self._index_neighbors, self._index_weights
+
     def weight(self, edge):
         """
         Returns the weight associated with the edge (which is a tuple of two
@@ -111,9 +129,19 @@ class Graph:
 
         if not node in self._node_neighbors:
             self._node_neighbors[node] = []
+
+            self._node_index[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._index_neighbors.append([])
+            self._index_weights.append([])
         else:
             raise ValueError('Node %s already in the graph.' % node)
 
+    def _add_index_edge(self, u, v, weight):
+        i = self._node_index[u]
+        self._index_neighbors[i].append(self._node_index[v])
+        self._index_weights[i].append(weight)
+
     def add_directed_edge(self, u, v, weight=0):
         """
         Add a directed edge connecting two given nodes to the graph.
@@ -135,6 +163,7 @@ class Graph:
         if edge not in self._edge_weights:
             self._node_neighbors[u].append(v)
             self._edge_weights[edge] = weight
+            self._add_index_edge(u, v, weight)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge)
 
@@ -160,275 +189,289 @@ class Graph:
         if edge1 not in self._edge_weights:
             self._node_neighbors[u].append(v)
             self._edge_weights[edge1] = weight
+            self._add_index_edge(u, v, weight)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge1)
 
         if edge2 not in self._edge_weights:
             self._node_neighbors[v].append(u)
             self._edge_weights[edge2] = weight
+            self._add_index_edge(v, u, weight)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge2)
 
-class UnionFindNode:
+class ArrayUnionFind:
+    """
+    Represents disjoint sets of the integers 0, 1, ..., n - 1 in two flat
+    arrays instead of wrapper nodes: the parent of every element and the
+    size of every tree (meaningful at the roots only).
 
-    def __init__ (self, value):
-        self.value = value
-        self.parent = None
-        self.rank = None
+    Union by size keeps the trees shallow and find() halves the path it
+    follows (every visited element is pointed to its grandparent), so no
+    recursion is needed.
+    """
 
-    def __str__(self):
-        return str(self.value)
+    def __init__(self, n):
+        """
+        Initializes n singletons.
 
-    def __repr__(self):
-        return '[{}, parent={}, rank={}]'.format(self.value,
-                                                 self.parent,
-                                                 self.rank)
+        @type  n: int
+        @param n: The number of elements.
+        """
 
-    def __lt__(self, other):
-        if other is None or not isinstance(other, UnionFindNode):
-            return False
+        self._parent = array.array('i', range(n))
+        self._size = array.array('i', [1]) * n
+        self._component_count = n
 
-        return self.value < other.value
+    def __len__(self):
+        return len(self._parent)
 
-    def __eq__(self, other):
-        if other is None or not isinstance(other, UnionFindNode):
-            return False
+    @property
+    def component_count(self):
+        return self._component_count
 
-        return self.value == other.value
+    def find(self, x):
+        """
+        Follows parent links until it reaches the root.
 
-    def __gt__(self, other):
-        if other is None or not isinstance(other, UnionFindNode):
-            return False
+        Applies path halving.
+        """
 
-        return self.value > other.value
+        parent = self._parent
+        if not (0 <= x < len(parent)):
+            raise ValueError('{} not in the set.'.format(x))
 
-class UnionFind:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
 
-    def make_set(self, x):
-        """
-        Makes a set containing only a given element (a singleton).
-        """
-
-        x.parent = x
-        x.rank = 0
+        return x
 
     def union(self, x, y):
         """
-        Combines two trees into one by attaching the root of one to the root
-        of the other.
+        Attaches the root of the smaller tree to the root of the larger one.
+
+        Returns whether x and y were in different sets.
         """
 
         x_root = self.find(x)
         y_root = self.find(y)
 
-        if x_root.rank > y_root.rank:
-            y_root.parent = x_root
-        elif x_root.rank < y_root.rank:
-            x_root.parent = y_root
-        elif x_root != y_root:
-            # x and y are not in the same set, so merge them
-            y_root.parent = x_root
-            x_root.rank = x_root.rank + 1
+        if x_root == y_root:
+            return False
 
-    def find(self, x):
+        size = self._size
+        if size[x_root] < size[y_root]:
+            x_root, y_root = y_root, x_root
+        self._parent[y_root] = x_root
+        size[x_root] += size[y_root]
+        self._component_count -= 1
+
+        return True
+
+    def union_many(self, pairs):
+        """
+        Unites every (x, y) pair in turn and returns the number of unions
+        that merged two different sets.
         """
-        Follows parent nodes until it reaches the root.
 
-        Applies path compression.
+        merge_count = 0
+        for x, y in pairs:
+            if self.union(x, y):
+                merge_count += 1
+
+        return merge_count
+
+    def find_many(self, xs):
+        """
+        Returns the list of the roots of the given elements.
         """
 
-        if x.parent == None:
-            raise ValueError('{} not in the set.'.format(x))
+        return [self.find(x) for x in xs]
 
-        if x.parent == x:
-            return x
-        else:
-            x.parent = self.find(x.parent)
+    def component_size(self, x):
+        """
+        Returns the number of elements in the set of x.
+        """
 
-            return x.parent
+        return self._size[self.find(x)]
 
-class HeapMode(enum.Enum):
-    min = 0
-    max = 1
+class Dendrogram:
+    """
+    Represents the single-linkage dendrogram of a graph: the sequence of
+    merges Kruskal's algorithm makes while it joins the clusters (connected
+    components) by the next lightest edge, starting with every node in a
+    cluster of its own.
+
+    After the first n - k merges, there are k clusters, and the weight of the
+    next merge is their spacing, that is, the smallest weight of an edge
+    between two different clusters. Thus, the clusters and the spacing for
+    every k are available from the same precomputed merges.
+    """
 
-class HeapItem:
+    def __init__(self, nodes, merges):
+        """
+        Initializes a dendrogram.
 
-    def __init__(self, priority, datum=None):
-        self._priority = priority
-        self._datum = datum
+        @type  nodes: list
+        @param nodes: The nodes of the graph.
+        @type  merges: list
+        @param merges: The (weight, u, v) edges accepted by Kruskal's
+                       algorithm in their order.
+        """
 
-    def __str__(self):
-        return str(self.datum)
+        self._nodes = nodes
+        self._merges = merges
 
-    def __repr__(self):
-        return ('[priority=' + str(self.priority) +
-                ', datum=' + str(self.datum) + ']')
+    @property
+    def nodes(self):
+        return self._nodes
 
-    def __lt__(self, other):
-        if self.priority < other.priority:
-            return True
-        elif self.priority == other.priority:
-            if (self.datum is not None and other.datum is not None and
-                self.datum < other.datum):
-                    return True
+    @property
+    def merges(self):
+        return self._merges
 
-        return False
+    @property
+    def minimum_cluster_count(self):
+        """
+        Returns the number of clusters left after all merges, which is the
+        number of connected components of the graph.
+        """
 
-    def __eq__(self, other):
-        return (self.priority == other.priority and
-            self.datum == other.datum)
+        return len(self._nodes) - len(self._merges)
 
-    def __gt__(self, other):
-        if self.priority > other.priority:
-            return True
-        elif self.priority == other.priority:
-            if (self.datum is not None and other.datum is not None and
-                self.datum > other.datum):
-                    return True
+    def _check_cluster_count(self, k):
+        if not (1 <= k <= len(self._nodes)):
+            raise ValueError('Must be 1 <= k <= |V|.')
 
-        return False
+        if k < self.minimum_cluster_count:
+            message = 'Could not form k clusters. Got {} clusters.'
+            raise ValueError(message.format(self.minimum_cluster_count))
 
-    @property
-    def priority(self):
-        return self._priority
+    def _union_find(self, merge_count):
+        node_index = {}
+        for i, node in enumerate(self._nodes):
+            node_index[node] = i
 
-    @property
-    def datum(self):
-        return self._datum
+        union_find_set = ArrayUnionFind(len(self._nodes))
+        union_find_set.union_many(
+                                (node_index[u], node_index[v])
+                                for weight, u, v in self._merges[:merge_count])
 
-class BinHeap:
+        return union_find_set, node_index
 
-    def __init__(self, mode=HeapMode.min):
-        self._mode = mode
-        self._size = 0
-        self._heap_list = []
+    def linkage(self):
+        """
+        Returns the merges as (left, right, weight, size) tuples, where the
+        nodes are the clusters 0, 1, ..., n - 1 (in the order of the nodes),
+        the i-th merge creates the cluster n + i, left and right are the
+        merged clusters and size is the number of nodes in the new cluster.
+        """
 
-    def __str__(self):
-        return str(self._heap_list)
+        union_find_set, node_index = self._union_find(0)
 
-    def __repr__(self):
-        return ('[mode=' + str(self.mode) + ', size=' + str(self.size) +
-                ', list=' + str(self.elements) + ']')
+        # the cluster id of every root
+        cluster_ids = [x for x in range(len(self._nodes))]
 
-    @property
-    def mode(self):
-        return self._mode
+        result = []
+        for i, (weight, u, v) in enumerate(self._merges):
+            u_root = union_find_set.find(node_index[u])
+            v_root = union_find_set.find(node_index[v])
+            size = (union_find_set.component_size(u_root) +
+                    union_find_set.component_size(v_root))
+            result.append((cluster_ids[u_root],
+                           cluster_ids[v_root],
+                           weight,
+                           size))
 
-    @property
-    def size(self):
-        return self._size
+            union_find_set.union(u_root, v_root)
+            root = union_find_set.find(u_root)
+            cluster_ids[root] = len(self._nodes) + i
 
-    @property
-    def elements(self):
-        return self._heap_list
+        return result
 
-    def _parent(self, index):
-        return (index - 1) // 2
+    def spacing(self, k):
+        """
+        Returns the spacing of k clusters, that is, the smallest weight of an
+        edge between two different clusters, or None if there is no such
+        edge.
+        """
 
-    def _left_child(self, index):
-        return 2 * index + 1
+        self._check_cluster_count(k)
 
-    def _right_child(self, index):
-        return 2 * index + 2
+        merge_count = len(self._nodes) - k
+        if merge_count < len(self._merges):
+            return self._merges[merge_count][0]
 
-    def _has_greater_priority(self, x, y, mode):
-        if mode == HeapMode.min:
-            return x < y
-        else:
-            return x > y
+        return None
 
-    def _priority_child(self, index):
-        if self._right_child(index) >= self.size:
-            return self._left_child(index)
-        else:
-            left_child = self._left_child(index)
-            right_child = self._right_child(index)
-            if self._has_greater_priority(
-                self._heap_list[left_child],
-                self._heap_list[right_child],
-                self.mode):
-                return left_child
-            else:
-                return right_child
-
-    def _sift_down(self, index):
-        while self._left_child(index) < self.size:
-            priority_child = self._priority_child(index)
-
-            if self._has_greater_priority(
-                self._heap_list[priority_child],
-                self._heap_list[index],
-                self.mode):
-                self._heap_list[index], self._heap_list[priority_child] = \
-                                              (self._heap_list[priority_child],
-                                               self._heap_list[index])
-
-            index = priority_child
-
-    def _sift_up(self, index):
-        while self._parent(index) >= 0:
-            parent = self._parent(index)
-
-            if self._has_greater_priority(
-                self._heap_list[index],
-                self._heap_list[parent],
-                self.mode):
-                self._heap_list[index], self._heap_list[parent] = \
-                                                      (self._heap_list[parent],
-                                                       self._heap_list[index])
-
-            index = parent
-
-    def build(self, list):
-        self._size = len(list)
-        self._heap_list = list
-
-        i = self._parent(self.size - 1)
-        while i >= 0:
-            self._sift_down(i)
-            i -= 1
-
-    def extract(self):
-        min_element = self._heap_list[0]
-        self._heap_list[0] = self._heap_list[self.size - 1]
-        self._size = self.size - 1
-        self._heap_list.pop()
-        self._sift_down(0)
-
-        return min_element
-
-    def insert(self, index):
-        self._heap_list.append(index)
-        self._size = self.size + 1
-        self._sift_up(self.size - 1)
-
-    def change_priority(self, index, p):
-        if index < 0 or index > self.size:
-            raise IndexError()
-
-        old_item = HeapItem(self._heap_list[index].priority,
-                            self._heap_list[index].datum)
-        new_item = HeapItem(p, self._heap_list[index].datum)
-        self._heap_list[index]._priority = p
-        if self._has_greater_priority(new_item, old_item, self.mode):
-            self._sift_up(index)
-        else:
-            self._sift_down(index)
+    def labels(self, k):
+        """
+        Returns a dictionary that maps every node to the number of its
+        cluster (0, 1, ..., k - 1, numbered in the order of the nodes) when
+        there are k clusters.
+        """
 
-    def sort_in_place(self, data):
-        self.build(data)
+        self._check_cluster_count(k)
 
-        original_size = self.size
-        for i in range(1, len(data)):
-            self._heap_list[0], self._heap_list[self.size - 1] = \
-                             self._heap_list[self.size - 1], self._heap_list[0]
-            self._size -= 1
-            self._sift_down(0)
+        union_find_set, node_index = self._union_find(len(self._nodes) - k)
 
-        self._size = original_size
+        root_labels = {}
+        labels = {}
+        roots = union_find_set.find_many(range(len(self._nodes)))
+        for node, root in zip(self._nodes, roots):
+            if root not in root_labels:
+                root_labels[root] = len(root_labels)
+            labels[node] = root_labels[root]
+
+        return labels
+
+    def clusters(self, k):
+        """
+        Returns the list of the k clusters, every one a list of nodes.
+        """
+
+        clusters = [[] for i in range(k)]
+        for node, label in self.labels(k).items():
+            clusters[label].append(node)
+
+        return clusters
 
 class GraphUtil:
 
+    def _kruskal_merges(self, graph):
+        """
+        Runs Kruskal's algorithm and returns the (weight, u, v) edges it
+        accepts in their order.
+        """
+
+        merges = []
+
+        nodes, index_neighbors, index_weights = graph.interned()
+
+        sources = []
+        targets = []
+        weights = []
+        for u in range(len(nodes)):
+            sources.extend([u] * len(index_neighbors[u]))
+            targets.extend(index_neighbors[u])
+            weights.extend(index_weights[u])
+
+        union_find_set = ArrayUnionFind(len(nodes))
+
+        # a spanning forest has at most |V| - 1 edges
+        maximum_merge_count = len(nodes) - 1
+        for position in sorted(range(len(weights)), key=weights.__getitem__):
+            if len(merges) >= maximum_merge_count:
+                break
+
+            u = sources[position]
+            v = targets[position]
+            if union_find_set.union(u, v):
+                merges.append((weights[position], nodes[u], nodes[v]))
+
+        return merges
+
     def k_cluster_minimum_spanning_tree(self, graph, k):
         """
         Given a connected undirected graph G = (V, E) with positive edge
@@ -457,57 +500,20 @@ class GraphUtil:
         algorithm has created after a certain point.
         """
 
-        if not (1 <= k <= len(graph.nodes())):
-            raise ValueError('Must be 1 <= k <= |V|.')
-
-        minimum_spanning_tree = Graph()
-
-        union_find_set = UnionFind()
+        dendrogram = self.single_linkage_clustering(graph)
 
-        cluster_count = len(graph.nodes())
-        node_to_wrapper_node_map = {}
-        priority_queue = BinHeap(HeapMode.min)
-        for node in graph.nodes():
-            minimum_spanning_tree.add_node(node)
+        return dendrogram.spacing(k)
 
-            wrapper_node = UnionFindNode(node)
-            node_to_wrapper_node_map[node] = wrapper_node
-            union_find_set.make_set(wrapper_node)
-
-        for u, v in graph.edges():
-            edge = (node_to_wrapper_node_map[u], node_to_wrapper_node_map[v])
-            priority_queue.insert(HeapItem(graph.weight((u, v)), edge))
-
-        while priority_queue.size > 0 and cluster_count > k:
-            min_item = priority_queue.extract()
-            u_node, v_node = min_item.datum
-            if union_find_set.find(u_node) != union_find_set.find(v_node):
-                minimum_spanning_tree.add_undirected_edge(u_node.value,
-                                                          v_node.value,
-                                                          min_item.priority)
-                union_find_set.union(u_node, v_node)
-                cluster_count -= 1
+    def single_linkage_clustering(self, graph):
+        """
+        Given an undirected graph G = (V, E), computes its single-linkage
+        dendrogram with one pass of Kruskal's algorithm, so the clusters
+        and the spacing of every k can be queried without rebuilding the
+        minimum spanning tree.
+        """
 
-        if cluster_count != k:
-            message = 'Could not form k clusters. Got {} clusters.'
-            raise ValueError(message.format(cluster_count))
-
-        maximum_minimum_distance = None
-        nodes = [x for x in minimum_spanning_tree.nodes()]
-        for i in range(len(nodes)):
-            for j in range(i + 1, len(nodes)):
-                node1 = node_to_wrapper_node_map[nodes[i]]
-                node2 = node_to_wrapper_node_map[nodes[j]]
-                if union_find_set.find(node1) != union_find_set.find(node2):
-                    x1, y1 = nodes[i]
-                    x2, y2 = nodes[j]
-                    distance = math.sqrt(math.pow(x1 - x2, 2) +
-                                         math.pow(y1 - y2, 2))
-                    if (maximum_minimum_distance == None or
-                        distance < maximum_minimum_distance):
-                        maximum_minimum_distance = distance
-
-        return maximum_minimum_distance
+        return Dendrogram([x for x in graph.nodes()],
+                          self._kruskal_merges(graph))
 
 class Solver:
     """
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 
-import enum
+import array
 import io
 import math
 import sys
@@ -169,302 +169,161 @@ class Graph:
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge2)
 
-class UnionFindNode:
-
-    def __init__ (self, value):
-        self.value = value
-        self.parent = None
-        self.rank = None
-
-    def __str__(self):
-        return str(self.value)
-
-    def __repr__(self):
-        return '[{}, parent={}, rank={}]'.format(self.value,
-                                                 self.parent,
-                                                 self.rank)
-
-    def __lt__(self, other):
-        if other is None or not isinstance(other, UnionFindNode):
-            return False
-
-        return self.value < other.value
-
-    def __eq__(self, other):
-        if other is None or not isinstance(other, UnionFindNode):
-            return False
-
-        return self.value == other.value
-
-    def __gt__(self, other):
-        if other is None or not isinstance(other, UnionFindNode):
-            return False
-
-        return self.value > other.value
+class ArrayUnionFind:
+    """
+    Represents disjoint sets of the integers 0, 1, ..., n - 1 in two flat
+    arrays instead of wrapper nodes: the parent of every element and the
+    size of every tree (meaningful at the roots only).
 
-class UnionFind:
+    Union by size keeps the trees shallow and find() halves the path it
+    follows (every visited element is pointed to its grandparent), so no
+    recursion is needed.
+    """
 
-    def make_set(self, x):
-        """
-        Makes a set containing only a given element (a singleton).
+    def __init__(self, n):
         """
+        Initializes n singletons.
 
-        x.parent = x
-        x.rank = 0
-
-    def union(self, x, y):
-        """
-        Combines two trees into one by attaching the root of one to the root
-        of the other.
+        @type  n: int
+        @param n: The number of elements.
         """
 
-        x_root = self.find(x)
-        y_root = self.find(y)
+        self._parent = array.array('i', range(n))
+        self._size = array.array('i', [1]) * n
+        self._component_count = n
 
-        if x_root.rank > y_root.rank:
-            y_root.parent = x_root
-        elif x_root.rank < y_root.rank:
-            x_root.parent = y_root
-        elif x_root != y_root:
-            # x and y are not in the same set, so merge them
-            y_root.parent = x_root
-            x_root.rank = x_root.rank + 1
+    def __len__(self):
+        return len(self._parent)
+
+    @property
+    def component_count(self):
+        return self._component_count
 
     def find(self, x):
         """
-        Follows parent nodes until it reaches the root.
+        Follows parent links until it reaches the root.
 
-        Applies path compression.
+        Applies path halving.
         """
 
-        if x.parent == None:
+        parent = self._parent
+        if not (0 <= x < len(parent)):
             raise ValueError('{} not in the set.'.format(x))
 
-        if x.parent == x:
-            return x
-        else:
-            x.parent = self.find(x.parent)
-
-            return x.parent
-
-class HeapMode(enum.Enum):
-    min = 0
-    max = 1
-
-class HeapItem:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
 
-    def __init__(self, priority, datum=None):
-        self._priority = priority
-        self._datum = datum
+        return x
 
-    def __str__(self):
-        return str(self.datum)
-
-    def __repr__(self):
-        return ('[priority=' + str(self.priority) +
-                ', datum=' + str(self.datum) + ']')
-
-    def __lt__(self, other):
-        if self.priority < other.priority:
-            return True
-        elif self.priority == other.priority:
-            if (self.datum is not None and other.datum is not None and
-                self.datum < other.datum):
-                    return True
-
-        return False
-
-    def __eq__(self, other):
-        return (self.priority == other.priority and
-            self.datum == other.datum)
-
-    def __gt__(self, other):
-        if self.priority > other.priority:
-            return True
-        elif self.priority == other.priority:
-            if (self.datum is not None and other.datum is not None and
-                self.datum > other.datum):
-                    return True
+    def union(self, x, y):
+        """
+        Attaches the root of the smaller tree to the root of the larger one.
 
-        return False
+        Returns whether x and y were in different sets.
+        """
 
-    @property
-    def priority(self):
-        return self._priority
+        x_root = self.find(x)
+        y_root = self.find(y)
 
-    @property
-    def datum(self):
-        return self._datum
+        if x_root == y_root:
+            return False
 
-class BinHeap:
+        size = self._size
+        if size[x_root] < size[y_root]:
+            x_root, y_root = y_root, x_root
+        self._parent[y_root] = x_root
+        size[x_root] += size[y_root]
+        self._component_count -= 1
 
-    def __init__(self, mode=HeapMode.min):
-        self._mode = mode
-        self._size = 0
-        self._heap_list = []
+        return True
 
-    def __str__(self):
-        return str(self._heap_list)
+    def union_many(self, pairs):
+        """
+        Unites every (x, y) pair in turn and returns the number of unions
+        that merged two different sets.
+        """
 
-    def __repr__(self):
-        return ('[mode=' + str(self.mode) + ', size=' + str(self.size) +
-                ', list=' + str(self.elements) + ']')
+        merge_count = 0
+        for x, y in pairs:
+            if self.union(x, y):
+                merge_count += 1
 
-    @property
-    def mode(self):
-        return self._mode
+        return merge_count
 
-    @property
-    def size(self):
-        return self._size
+    def find_many(self, xs):
+        """
+        Returns the list of the roots of the given elements.
+        """
 
-    @property
-    def elements(self):
-        return self._heap_list
+        return [self.find(x) for x in xs]
 
-    def _parent(self, index):
-        return (index - 1) // 2
+    def component_size(self, x):
+        """
+        Returns the number of elements in the set of x.
+        """
 
-    def _left_child(self, index):
-        return 2 * index + 1
+        return self._size[self.find(x)]
 
-    def _right_child(self, index):
-        return 2 * index + 2
+class GraphUtil:
 
-    def _has_greater_priority(self, x, y, mode):
-        if mode == HeapMode.min:
-            return x < y
-        else:
-            return x > y
+    def _kruskal_points(self, points):
+        """
+        Runs Kruskal's algorithm on the complete graph of the points, whose
+        n(n - 1)/2 edges are kept in flat arrays of endpoint indices and
+        distances instead of a Graph, and returns the (u, v, distance) edges
+        of the tree as indices into the points.
+        """
 
-    def _priority_child(self, index):
-        if self._right_child(index) >= self.size:
-            return self._left_child(index)
-        else:
-            left_child = self._left_child(index)
-            right_child = self._right_child(index)
-            if self._has_greater_priority(
-                self._heap_list[left_child],
-                self._heap_list[right_child],
-                self.mode):
-                return left_child
-            else:
-                return right_child
-
-    def _sift_down(self, index):
-        while self._left_child(index) < self.size:
-            priority_child = self._priority_child(index)
-
-            if self._has_greater_priority(
-                self._heap_list[priority_child],
-                self._heap_list[index],
-                self.mode):
-                self._heap_list[index], self._heap_list[priority_child] = \
-                                              (self._heap_list[priority_child],
-                                               self._heap_list[index])
-
-            index = priority_child
-
-    def _sift_up(self, index):
-        while self._parent(index) >= 0:
-            parent = self._parent(index)
-
-            if self._has_greater_priority(
-                self._heap_list[index],
-                self._heap_list[parent],
-                self.mode):
-                self._heap_list[index], self._heap_list[parent] = \
-                                                      (self._heap_list[parent],
-                                                       self._heap_list[index])
-
-            index = parent
-
-    def build(self, list):
-        self._size = len(list)
-        self._heap_list = list
-
-        i = self._parent(self.size - 1)
-        while i >= 0:
-            self._sift_down(i)
-            i -= 1
-
-    def extract(self):
-        min_element = self._heap_list[0]
-        self._heap_list[0] = self._heap_list[self.size - 1]
-        self._size = self.size - 1
-        self._heap_list.pop()
-        self._sift_down(0)
-
-        return min_element
-
-    def insert(self, index):
-        self._heap_list.append(index)
-        self._size = self.size + 1
-        self._sift_up(self.size - 1)
-
-    def change_priority(self, index, p):
-        if index < 0 or index > self.size:
-            raise IndexError()
-
-        old_item = HeapItem(self._heap_list[index].priority,
-                            self._heap_list[index].datum)
-        new_item = HeapItem(p, self._heap_list[index].datum)
-        self._heap_list[index]._priority = p
-        if self._has_greater_priority(new_item, old_item, self.mode):
-            self._sift_up(index)
-        else:
-            self._sift_down(index)
+        sources = array.array('i')
+        targets = array.array('i')
+        weights = array.array('d')
+        for i in range(len(points)):
+            x1, y1 = points[i]
+            for j in range(i + 1, len(points)):
+                x2, y2 = points[j]
+                sources.append(i)
+                targets.append(j)
+                weights.append(math.sqrt((x1 - x2) * (x1 - x2) +
+                                         (y1 - y2) * (y1 - y2)))
 
-    def sort_in_place(self, data):
-        self.build(data)
+        set = ArrayUnionFind(len(points))
 
-        original_size = self.size
-        for i in range(1, len(data)):
-            self._heap_list[0], self._heap_list[self.size - 1] = \
-                             self._heap_list[self.size - 1], self._heap_list[0]
-            self._size -= 1
-            self._sift_down(0)
+        edges = []
+        # sorts the edges once and stops when the tree spans all points
+        for position in sorted(range(len(weights)), key=weights.__getitem__):
+            if set.component_count <= 1:
+                break
 
-        self._size = original_size
+            u = sources[position]
+            v = targets[position]
+            if set.union(u, v):
+                edges.append((u, v, weights[position]))
 
-class GraphUtil:
+        return edges
 
-    def kruskal(self, graph):
+    def euclidean_minimum_spanning_tree(self, points):
         """
-        Given a connected undirected graph G = (V, E) with positive edge
-        weights, computes a minimum spanning tree that consists of a subset
-        of edges E′ ⊆ E of minimum total weight such that the graph (V, E′)
-        is connected.
+        Given n pairwise different points on a plane, computes a minimum
+        spanning tree of the complete graph whose edge weights are the
+        Euclidean distances between the points.
 
         Greedy Strategy: Repeatedly adds the next lightest edge if this
         doesn’t produce a cycle.
+
+        Kruskal's algorithm has to sort all n(n - 1)/2 edges, so it still
+        takes O(n^2) memory, but only the flat arrays of the edges rather
+        than a Graph with two dictionary entries per edge.
         """
 
         minimum_spanning_tree = Graph()
+        for point in points:
+            minimum_spanning_tree.add_node(point)
 
-        set = UnionFind()
-
-        node_to_wrapper_node_map = {}
-        priority_queue = BinHeap(HeapMode.min)
-        for node in graph.nodes():
-            minimum_spanning_tree.add_node(node)
-
-            wrapper_node = UnionFindNode(node)
-            node_to_wrapper_node_map[node] = wrapper_node
-            set.make_set(wrapper_node)
-
-        for u, v in graph.edges():
-            edge = (node_to_wrapper_node_map[u], node_to_wrapper_node_map[v])
-            priority_queue.insert(HeapItem(graph.weight((u, v)), edge))
-
-        while priority_queue.size > 0:
-            min_item = priority_queue.extract()
-            u_node, v_node = min_item.datum
-            if set.find(u_node) != set.find(v_node):
-                minimum_spanning_tree.add_undirected_edge(u_node.value,
-                                                          v_node.value,
-                                                          min_item.priority)
-                set.union(u_node, v_node)
+        for u, v, distance in self._kruskal_points(points):
+            minimum_spanning_tree.add_undirected_edge(points[u],
+                                                      points[v],
+                                                      distance)
 
         return minimum_spanning_tree
 
@@ -493,28 +352,17 @@ class Solver:
         n = int(self._input())
 
         points = []
-        graph = Graph()
         for i in range(n):
             x, y = map(int, self._input().split())
             points.append((x, y))
-            graph.add_node((x, y))
-        for i in range(len(points)):
-            for j in range(i + 1, len(points)):
-                x1, y1 = points[i]
-                x2, y2 = points[j]
-                distance = math.sqrt(math.pow(x1 - x2, 2) +
-                                     math.pow(y1 - y2, 2))
-                graph.add_undirected_edge((x1, y1),
-                                          (x2, y2),
-                                          distance)
 
-        tree = GraphUtil().kruskal(graph)
+        tree = GraphUtil().euclidean_minimum_spanning_tree(points)
 
         visited_edges = set()
         total = 0
         for u, v in tree.edges():
             if (u, v) not in visited_edges:
-                total += graph.weight((u, v))
+                total += tree.weight((u, v))
                 visited_edges.add((u, v))
                 visited_edges.add((v, u))
 
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir,
+                                'practice',
+                                'graph'))
+
+import contraction_hierarchy
+import graph_util
+
+def grid_graph(rows, columns, seed):
+    """
+    Generates a road-like graph: a grid of rows x columns nodes with
+    undirected edges of random integer weights between adjacent nodes.
+    """
+
+    generator = random.Random(seed)
+
+    graph = graph_util.Graph()
+    for row in range(rows):
+        for column in range(columns):
+            graph.add_node((row, column))
+    for row in range(rows):
+        for column in range(columns):
+            if row + 1 < rows:
+                graph.add_undirected_edge((row, column),
+                                          (row + 1, column),
+                                          generator.randint(1, 100))
+            if column + 1 < columns:
+                graph.add_undirected_edge((row, column),
+                                          (row, column + 1),
+                                          generator.randint(1, 100))
+
+    return graph
+
+def benchmark(rows, columns, query_count, seed):
+    """
+    Reports the preprocessing time of a contraction hierarchy and the mean
+    query times of the hierarchy, of the bidirectional Dijkstra's algorithm
+    and of the full Dijkstra's algorithm.
+    """
+
+    graph = grid_graph(rows, columns, seed)
+    util = graph_util.GraphUtil()
+
+    start_time = time.perf_counter()
+    hierarchy = contraction_hierarchy.ContractionHierarchy.build(graph)
+    preprocessing_time = time.perf_counter() - start_time
+
+    generator = random.Random(seed)
+    nodes = [x for x in graph.nodes()]
+    queries = [(generator.choice(nodes), generator.choice(nodes))
+               for i in range(query_count)]
+
+    start_time = time.perf_counter()
+    dijkstra_distances = []
+    for source, target in queries:
+        distance_map, predecessor_map = util.dijkstra_shortest_paths(graph,
+                                                                     source)
+        dijkstra_distances.append(distance_map[target])
+    dijkstra_time = (time.perf_counter() - start_time) / query_count
+
+    start_time = time.perf_counter()
+    for source, target in queries:
+        util.shortest_path(graph, source, target, reverse_graph=graph)
+    bidirectional_time = (time.perf_counter() - start_time) / query_count
+
+    start_time = time.perf_counter()
+    hierarchy_distances = []
+    for source, target in queries:
+        hierarchy_distances.append(hierarchy.distance(source, target))
+    hierarchy_time = (time.perf_counter() - start_time) / query_count
+
+    if hierarchy_distances != dijkstra_distances:
+        raise AssertionError('The hierarchy disagrees with Dijkstra.')
+
+    # the number of queries that pays off the preprocessing
+    if dijkstra_time > hierarchy_time:
+        break_even_queries = preprocessing_time / (dijkstra_time -
+                                                   hierarchy_time)
+    else:
+        break_even_queries = math.inf
+
+    return {
+        'benchmark': 'contraction_hierarchy',
+        'nodes': len(nodes),
+        'edges': len(graph.edges()),
+        'queries': query_count,
+        'seed': seed,
+        'shortcuts': hierarchy.shortcut_count,
+        'preprocessing_seconds': preprocessing_time,
+        'dijkstra_query_seconds': dijkstra_time,
+        'bidirectional_dijkstra_query_seconds': bidirectional_time,
+        'hierarchy_query_seconds': hierarchy_time,
+        'speedup': dijkstra_time / hierarchy_time,
+        'break_even_queries': break_even_queries,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks contraction hierarchy queries against the '
+                    'Dijkstra\'s algorithm on a grid graph.')
+    parser.add_argument('--rows', type=int, default=30)
+    parser.add_argument('--columns', type=int, default=30)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    arguments = parser.parse_args()
+
+    result = benchmark(arguments.rows,
+                       arguments.columns,
+                       arguments.queries,
+                       arguments.seed)
+
+    print(json.dumps(result, indent=4))
@@ -0,0 +1,461 @@
+#!/usr/bin/python3
+
+import argparse
+import array
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir,
+                                'practice',
+                                'graph'))
+
+import graph_util
+
+# the edge weights are random integers from 1 to MAXIMUM_WEIGHT
+MAXIMUM_WEIGHT = 100
+
+# the average number of edges per node of the sparse random graphs
+AVERAGE_DEGREE = 4
+
+# the number of clusters the clustering benchmark asks the dendrogram for
+CLUSTER_COUNT = 4
+
+def random_weights(edge_count, generator):
+    return array.array('l', [generator.randint(1, MAXIMUM_WEIGHT)
+                             for i in range(edge_count)])
+
+def random_pairs(node_count, edge_count, generator, ordered=True):
+    """
+    Draws the given number of distinct (u, v) pairs of different nodes
+    0, ..., n - 1 and returns them as two parallel arrays. Unordered pairs
+    always have u < v.
+    """
+
+    if ordered:
+        edge_count = min(edge_count, node_count * (node_count - 1))
+    else:
+        edge_count = min(edge_count, node_count * (node_count - 1) // 2)
+
+    pairs = set()
+    while len(pairs) < edge_count:
+        u = generator.randrange(node_count)
+        v = generator.randrange(node_count)
+        if not ordered and u > v:
+            u, v = v, u
+        if u != v:
+            pairs.add(u * node_count + v)
+
+    sources = array.array('l')
+    targets = array.array('l')
+    for pair in pairs:
+        sources.append(pair // node_count)
+        targets.append(pair % node_count)
+
+    return sources, targets
+
+def erdos_renyi_graph(edge_count, generator):
+    """
+    Generates a directed G(n, m) random graph: m distinct edges drawn
+    uniformly among the n(n - 1) possible ones.
+    """
+
+    node_count = max(2, edge_count // AVERAGE_DEGREE)
+    sources, targets = random_pairs(node_count, edge_count, generator)
+
+    return (node_count,
+            sources,
+            targets,
+            random_weights(len(sources), generator),
+            True,
+            0)
+
+def grid_graph(edge_count, generator):
+    """
+    Generates a road-like graph: a square grid with undirected edges
+    between adjacent nodes, which has about 2 edges per node and a large
+    diameter.
+    """
+
+    side = max(2, math.ceil(math.sqrt(edge_count / 2)))
+
+    sources = array.array('l')
+    targets = array.array('l')
+    for row in range(side):
+        for column in range(side):
+            node = row * side + column
+            if row + 1 < side:
+                sources.append(node)
+                targets.append(node + side)
+            if column + 1 < side:
+                sources.append(node)
+                targets.append(node + 1)
+
+    return (side * side,
+            sources,
+            targets,
+            random_weights(len(sources), generator),
+            False,
+            0)
+
+def barabasi_albert_graph(edge_count, generator):
+    """
+    Generates an undirected power-law graph by preferential attachment:
+    every new node is connected to AVERAGE_DEGREE distinct older nodes
+    chosen with probabilities proportional to their degrees.
+    """
+
+    attached_count = AVERAGE_DEGREE
+    node_count = max(attached_count + 1,
+                     edge_count // attached_count + attached_count)
+
+    sources = array.array('l')
+    targets = array.array('l')
+    # every node appears in the list once per incident edge
+    repeated_nodes = []
+    attached_nodes = [x for x in range(attached_count)]
+    for node in range(attached_count, node_count):
+        for attached_node in attached_nodes:
+            sources.append(node)
+            targets.append(attached_node)
+        repeated_nodes.extend(attached_nodes)
+        repeated_nodes.extend([node] * attached_count)
+
+        chosen_nodes = set()
+        while len(chosen_nodes) < attached_count:
+            chosen_nodes.add(generator.choice(repeated_nodes))
+        attached_nodes = [x for x in chosen_nodes]
+
+    return (node_count,
+            sources,
+            targets,
+            random_weights(len(sources), generator),
+            False,
+            0)
+
+def dag_graph(edge_count, generator):
+    """
+    Generates a random directed acyclic graph: distinct edges from an
+    earlier to a later position of a random order of the nodes, so the
+    node numbers do not give the topological order away.
+    """
+
+    node_count = max(2, edge_count // AVERAGE_DEGREE)
+    sources, targets = random_pairs(node_count,
+                                    edge_count,
+                                    generator,
+                                    ordered=False)
+
+    order = [x for x in range(node_count)]
+    generator.shuffle(order)
+    for i in range(len(sources)):
+        sources[i] = order[sources[i]]
+        targets[i] = order[targets[i]]
+
+    # the first node of the order has no incoming edges
+    return (node_count,
+            sources,
+            targets,
+            random_weights(len(sources), generator),
+            True,
+            order[0])
+
+def complete_graph(edge_count, generator):
+    """
+    Generates an undirected complete graph with about the given number of
+    edges, that is, n(n - 1)/2 of them.
+    """
+
+    node_count = max(2, round((1 + math.sqrt(1 + 8 * edge_count)) / 2))
+
+    sources = array.array('l')
+    targets = array.array('l')
+    for u in range(node_count):
+        for v in range(u + 1, node_count):
+            sources.append(u)
+            targets.append(v)
+
+    return (node_count,
+            sources,
+            targets,
+            random_weights(len(sources), generator),
+            False,
+            0)
+
+GENERATORS = {
+    'erdos_renyi': erdos_renyi_graph,
+    'grid': grid_graph,
+    'barabasi_albert': barabasi_albert_graph,
+    'dag': dag_graph,
+    'complete': complete_graph,
+}
+
+def clustering(util, graph, source):
+    dendrogram = util.single_linkage_clustering(graph)
+    k = max(dendrogram.minimum_cluster_count,
+            min(CLUSTER_COUNT, len(dendrogram.nodes)))
+
+    return dendrogram.clusters(k)
+
+# every algorithm runs on the graphs it is defined for (all, 'directed',
+# 'undirected' or 'dag' ones) and has a rough estimate of its number of
+# steps from the number of nodes and edges, so the quadratic ones can be
+# skipped on large graphs
+ALGORITHMS = {
+    'explore': (lambda util, graph, source: util.explore(graph, source),
+                None,
+                lambda n, m: n + m),
+    'bfs': (lambda util, graph, source:
+                util.breadth_first_search(graph, [ source ]),
+            None,
+            lambda n, m: n + m),
+    'scc': (lambda util, graph, source:
+                util.strongly_connected_components(graph),
+            'directed',
+            lambda n, m: n + m),
+    'toposort': (lambda util, graph, source: util.topological_sort(graph),
+                 'dag',
+                 lambda n, m: n + m),
+    'dijkstra': (lambda util, graph, source:
+                     util.dijkstra_shortest_paths(graph, source),
+                 None,
+                 lambda n, m: n + m),
+    'bellman_ford': (lambda util, graph, source:
+                         util.bellman_ford_shortest_paths(graph, source),
+                     None,
+                     lambda n, m: n * m),
+    'kruskal': (lambda util, graph, source: util.kruskal(graph),
+                'undirected',
+                lambda n, m: n + m),
+    'boruvka': (lambda util, graph, source: util.boruvka_edges(graph),
+                'undirected',
+                lambda n, m: n + m),
+    'prim': (lambda util, graph, source: util.prim(graph),
+             'undirected',
+             lambda n, m: n + m),
+    'clustering': (clustering,
+                   'undirected',
+                   lambda n, m: n + m),
+}
+
+def applies(kind, generator_name, directed):
+    if kind is None:
+        return True
+    if kind == 'dag':
+        return generator_name == 'dag'
+    if kind == 'directed':
+        return directed
+
+    return not directed
+
+def peak_memory(function):
+    """
+    Returns the peak number of bytes the function allocates on top of what
+    was already allocated when it was called.
+    """
+
+    tracemalloc.start()
+    try:
+        function()
+
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure(function, repeat_count, memory):
+    times = []
+    for i in range(repeat_count):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+
+    result = {
+        'seconds': min(times),
+        'mean_seconds': sum(times) / len(times),
+    }
+    # tracemalloc slows the function down, so it gets a run of its own
+    if memory:
+        result['peak_bytes'] = peak_memory(function)
+
+    return result
+
+def benchmark_graph(generator_name,
+                    size,
+                    algorithm_names,
+                    repeat_count,
+                    work_limit,
+                    memory,
+                    stats,
+                    seed):
+    generator = random.Random(seed)
+    node_count, sources, targets, weights, directed, source = \
+        GENERATORS[generator_name](size, generator)
+
+    def build():
+        return graph_util.Graph.from_edge_arrays(node_count,
+                                                 sources,
+                                                 targets,
+                                                 weights,
+                                                 directed,
+                                                 first_node=0)
+
+    start_time = time.perf_counter()
+    graph = build()
+    build_time = time.perf_counter() - start_time
+
+    run = {
+        'generator': generator_name,
+        'size': size,
+        'nodes': node_count,
+        'edges': len(sources),
+        'directed': directed,
+        'build_seconds': build_time,
+    }
+    if memory:
+        run['graph_bytes'] = peak_memory(build)
+
+    util = graph_util.GraphUtil()
+    instrumented_util = graph_util.InstrumentedGraphUtil()
+    edge_count = len(graph.edges())
+    results = {}
+    for name in algorithm_names:
+        function, kind, work = ALGORITHMS[name]
+        if not applies(kind, generator_name, directed):
+            continue
+
+        estimate = work(node_count, edge_count)
+        if estimate > work_limit:
+            results[name] = {
+                'skipped': 'about {:.0e} steps exceed the work limit'.format(
+                                                                    estimate),
+            }
+            continue
+
+        results[name] = measure(lambda: function(util, graph, source),
+                                repeat_count,
+                                memory)
+        # the instrumented run is not timed either
+        if stats:
+            function(instrumented_util, graph, source)
+            results[name]['stats'] = instrumented_util.stats.as_dict()
+
+    run['algorithms'] = results
+
+    return run
+
+def compare(runs, baseline):
+    """
+    Adds the times of the same generator, size and algorithm in the
+    baseline result and the ratios of the new times to them.
+    """
+
+    baseline_times = {}
+    for run in baseline['runs']:
+        for name, result in run['algorithms'].items():
+            if 'seconds' in result:
+                baseline_times[(run['generator'],
+                                run['size'],
+                                name)] = result['seconds']
+
+    for run in runs:
+        for name, result in run['algorithms'].items():
+            key = (run['generator'], run['size'], name)
+            if 'seconds' in result and key in baseline_times:
+                result['baseline_seconds'] = baseline_times[key]
+                if baseline_times[key] > 0:
+                    result['ratio'] = result['seconds'] / baseline_times[key]
+
+def benchmark(generator_names,
+              algorithm_names,
+              sizes,
+              repeat_count,
+              work_limit,
+              memory,
+              stats,
+              seed,
+              baseline=None):
+    """
+    Reports the best and mean times and the peak memory of every algorithm
+    on the graphs of every generator and size (the number of generated
+    edges), optionally with the stats of an instrumented run (see
+    graph_util.AlgorithmStats) and compared with the result of an earlier
+    run.
+    """
+
+    runs = []
+    for size in sizes:
+        for generator_name in generator_names:
+            runs.append(benchmark_graph(generator_name,
+                                        size,
+                                        algorithm_names,
+                                        repeat_count,
+                                        work_limit,
+                                        memory,
+                                        stats,
+                                        seed))
+
+    if baseline is not None:
+        compare(runs, baseline)
+
+    return {
+        'benchmark': 'graph_algorithms',
+        'python': platform.python_version(),
+        'numpy': graph_util.numpy is not None,
+        'repeat': repeat_count,
+        'seed': seed,
+        'work_limit': work_limit,
+        'runs': runs,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the time and peak memory of the graph '
+                    'algorithms on seeded synthetic graphs of growing '
+                    'sizes.')
+    parser.add_argument('--generators',
+                        nargs='+',
+                        choices=[x for x in GENERATORS],
+                        default=[x for x in GENERATORS])
+    parser.add_argument('--algorithms',
+                        nargs='+',
+                        choices=[x for x in ALGORITHMS],
+                        default=[x for x in ALGORITHMS])
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[ 1000, 10000, 100000 ])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--work-limit', type=int, default=10 ** 7)
+    parser.add_argument('--no-memory', action='store_true')
+    parser.add_argument('--stats',
+                        action='store_true',
+                        help='adds the operation counters of an '
+                             'instrumented run')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline',
+                        help='the JSON output of an earlier run to compare '
+                             'the times with')
+    arguments = parser.parse_args()
+
+    baseline = None
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as f:
+            baseline = json.load(f)
+
+    result = benchmark(arguments.generators,
+                       arguments.algorithms,
+                       arguments.sizes,
+                       arguments.repeat,
+                       arguments.work_limit,
+                       not arguments.no_memory,
+                       arguments.stats,
+                       arguments.seed,
+                       baseline)
+
+    print(json.dumps(result, indent=4))
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir,
+                                'practice',
+                                'graph'))
+
+import graph_util
+
+def grid_graph(rows, columns, maximum_weight, seed):
+    """
+    Generates a road-like graph: a grid of rows x columns nodes with
+    undirected edges of random integer weights from 1 to the maximum weight
+    between adjacent nodes.
+    """
+
+    generator = random.Random(seed)
+
+    graph = graph_util.Graph()
+    for row in range(rows):
+        for column in range(columns):
+            graph.add_node((row, column))
+    for row in range(rows):
+        for column in range(columns):
+            if row + 1 < rows:
+                graph.add_undirected_edge((row, column),
+                                          (row + 1, column),
+                                          generator.randint(1, maximum_weight))
+            if column + 1 < columns:
+                graph.add_undirected_edge((row, column),
+                                          (row, column + 1),
+                                          generator.randint(1, maximum_weight))
+
+    return graph
+
+def mean_time(function, repeat_count):
+    start_time = time.perf_counter()
+    for i in range(repeat_count):
+        function()
+
+    return (time.perf_counter() - start_time) / repeat_count
+
+def crossover(runs, algorithm, queue):
+    """
+    Returns the smallest maximum weight from which the binary heap beats the
+    given queue or None if it never does.
+    """
+
+    for run in runs:
+        times = run[algorithm]
+        if queue in times and times['binary'] < times[queue]:
+            return run['maximum_weight']
+
+    return None
+
+def benchmark(rows, columns, maximum_weights, repeat_count, seed):
+    """
+    Reports the mean times of the Dijkstra's and Prim's algorithms with every
+    priority queue on grid graphs with growing maximum edge weights, and the
+    maximum weights from which the binary heap wins.
+    """
+
+    util = graph_util.GraphUtil()
+
+    runs = []
+    for maximum_weight in maximum_weights:
+        graph = grid_graph(rows, columns, maximum_weight, seed)
+        source = (0, 0)
+        # interns the graph outside of the measurements
+        graph.interned()
+
+        distance_maps = []
+        dijkstra_times = {}
+        for queue in [ 'binary', 'bucket', 'radix' ]:
+            distance_map, predecessor_map = \
+                util.dijkstra_shortest_paths(graph, source, queue)
+            distance_maps.append(distance_map)
+            dijkstra_times[queue] = mean_time(
+                lambda: util.dijkstra_shortest_paths(graph, source, queue),
+                repeat_count)
+
+        if any(x != distance_maps[0] for x in distance_maps):
+            raise AssertionError('The queues disagree on the distances.')
+
+        # the radix heap requires monotone priorities, which Prim lacks
+        prim_times = {}
+        for queue in [ 'binary', 'bucket' ]:
+            prim_times[queue] = mean_time(lambda: util.prim(graph, queue),
+                                          repeat_count)
+
+        runs.append({
+            'maximum_weight': maximum_weight,
+            'dijkstra_seconds': dijkstra_times,
+            'prim_seconds': prim_times,
+        })
+
+    return {
+        'benchmark': 'priority_queue',
+        'nodes': rows * columns,
+        'repeat': repeat_count,
+        'seed': seed,
+        'bucket_queue_weight_limit': util.BUCKET_QUEUE_WEIGHT_LIMIT,
+        'runs': runs,
+        'dijkstra_bucket_crossover_weight':
+            crossover(runs, 'dijkstra_seconds', 'bucket'),
+        'dijkstra_radix_crossover_weight':
+            crossover(runs, 'dijkstra_seconds', 'radix'),
+        'prim_bucket_crossover_weight':
+            crossover(runs, 'prim_seconds', 'bucket'),
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the priority queues of the Dijkstra\'s and '
+                    'Prim\'s algorithms on grid graphs with growing integer '
+                    'edge weights.')
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--columns', type=int, default=100)
+    parser.add_argument('--maximum-weights',
+                        type=int,
+                        nargs='+',
+                        default=[ 1, 10, 100, 1000, 10000, 100000 ])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    arguments = parser.parse_args()
+
+    result = benchmark(arguments.rows,
+                       arguments.columns,
+                       arguments.maximum_weights,
+                       arguments.repeat,
+                       arguments.seed)
+
+    print(json.dumps(result, indent=4))
@@ -0,0 +1,351 @@
+import array
+import concurrent.futures
+import math
+
+import graph_util
+import heap
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the graph a worker process of Johnson's algorithm runs the Dijkstra's
+# algorithm on, set once per process by _initialize_worker
+_worker_state = None
+
+def _initialize_worker(index_neighbors, index_weights, potentials):
+    global _worker_state
+
+    _worker_state = (index_neighbors,
+                     index_weights,
+                     potentials,
+                     graph_util.GraphUtil._maximum_integer_weight(
+                                                               index_weights))
+
+def _worker_distance_row(source):
+    return _distance_row(_worker_state, source)
+
+def _distance_row(state, source):
+    """
+    Runs the Dijkstra's algorithm from the source over the reweighted edges
+    and returns the original distances from the source to every node index.
+    """
+
+    index_neighbors, index_weights, potentials, maximum_weight = state
+
+    if maximum_weight is None:
+        priority_queue = heap.IndexedBinHeap(heap.HeapMode.min)
+    elif maximum_weight <= graph_util.GraphUtil.BUCKET_QUEUE_WEIGHT_LIMIT:
+        priority_queue = heap.BucketQueue(maximum_weight)
+    else:
+        priority_queue = heap.RadixHeap()
+
+    distances = [math.inf] * len(index_neighbors)
+    distances[source] = 0
+    priority_queue.insert(heap.HeapItem(0, source))
+
+    while priority_queue.size > 0:
+        min_item = priority_queue.extract()
+        u = min_item.datum
+        for v, weight in zip(index_neighbors[u], index_weights[u]):
+            distance = min_item.priority + weight
+            if distances[v] > distance:
+                distances[v] = distance
+                if priority_queue.contains(v):
+                    priority_queue.decrease_key(v, distance)
+                else:
+                    priority_queue.insert(heap.HeapItem(distance, v))
+
+    source_potential = potentials[source]
+    for v, distance in enumerate(distances):
+        if distance != math.inf:
+            distances[v] = distance - source_potential + potentials[v]
+
+    return array.array('d', distances)
+
+class DistanceMatrix:
+    """
+    Represents the weights of the shortest paths between all pairs of nodes
+    of a graph as one flat row-major buffer of n * n doubles, where the
+    unreachable pairs hold infinity.
+
+    The matrix is computed either with the Floyd-Warshall algorithm, which
+    relaxes the whole matrix through every pivot node (with one NumPy
+    broadcast per pivot when NumPy is installed), or with Johnson's
+    algorithm, which reweights the edges to non-negative ones with a single
+    Bellman-Ford pass and then runs the Dijkstra's algorithm from every
+    node, optionally in a pool of worker processes.
+    """
+
+    # the largest graph the Floyd-Warshall algorithm is picked for
+    FLOYD_WARSHALL_NODE_LIMIT = 3000
+
+    # Floyd-Warshall is picked when the graph has at least 1/DENSITY of all
+    # possible edges: a vectorized pivot costs about as much as relaxing a
+    # thousandth of its n^2 entries one by one in Python, while the pure
+    # Python Floyd-Warshall only beats Johnson's algorithm on graphs with
+    # about half of all possible edges
+    FLOYD_WARSHALL_DENSITY = 1000
+    PURE_PYTHON_FLOYD_WARSHALL_DENSITY = 2
+
+    def __init__(self, nodes, distances):
+        """
+        Initializes a matrix from the computed distances.
+
+        @type  nodes: list
+        @param nodes: The node identifiers ordered by their indices.
+        @type  distances: array
+        @param distances: The n * n distances, row by row.
+        """
+
+        if len(distances) != len(nodes) * len(nodes):
+            raise ValueError('Expected {} distances, got {}.'.format(
+                                                       len(nodes) * len(nodes),
+                                                       len(distances)))
+
+        self._nodes = nodes
+        self._node_index = {}
+        for i, node in enumerate(nodes):
+            self._node_index[node] = i
+        self._distances = distances
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def node_count(self):
+        return len(self._nodes)
+
+    @property
+    def distances(self):
+        """
+        Returns the flat buffer of the distances, which NumPy can wrap as an
+        n x n matrix without copying it.
+        """
+
+        return self._distances
+
+    def _index(self, node):
+        if node not in self._node_index:
+            raise ValueError('Node %s not in the graph.' % node)
+
+        return self._node_index[node]
+
+    def distance(self, source, target):
+        """
+        Returns the weight of a shortest path from the source to the target
+        or infinity if the target is unreachable.
+        """
+
+        return self._distances[self._index(source) * self.node_count +
+                               self._index(target)]
+
+    def row(self, source):
+        """
+        Returns the distances from the source to all nodes ordered by their
+        indices.
+
+        @rtype: array
+        """
+
+        start = self._index(source) * self.node_count
+
+        return self._distances[start:start + self.node_count]
+
+    def distance_map(self, source):
+        """
+        Returns the distances from the source as a map keyed by the nodes, in
+        the format of GraphUtil.dijkstra_shortest_paths.
+        """
+
+        return dict(zip(self._nodes, self.row(source)))
+
+    @classmethod
+    def _check_negative_cycle(cls, has_negative_cycle):
+        if has_negative_cycle:
+            raise ValueError('The graph has a negative cycle.')
+
+    @classmethod
+    def _floyd_warshall_vectorized(cls, index_neighbors, index_weights):
+        node_count = len(index_neighbors)
+        distances = numpy.full((node_count, node_count), numpy.inf)
+        for u in range(node_count):
+            for v, weight in zip(index_neighbors[u], index_weights[u]):
+                if weight < distances[u, v]:
+                    distances[u, v] = weight
+        numpy.fill_diagonal(distances,
+                            numpy.minimum(distances.diagonal(), 0))
+
+        for k in range(node_count):
+            numpy.minimum(distances,
+                          distances[:, k, numpy.newaxis] + distances[k],
+                          out=distances)
+
+        cls._check_negative_cycle(bool((distances.diagonal() < 0).any()))
+
+        result = array.array('d')
+        result.frombytes(distances.tobytes())
+
+        return result
+
+    @classmethod
+    def _floyd_warshall_rows(cls, index_neighbors, index_weights):
+        node_count = len(index_neighbors)
+        rows = [[math.inf] * node_count for i in range(node_count)]
+        for u in range(node_count):
+            row = rows[u]
+            for v, weight in zip(index_neighbors[u], index_weights[u]):
+                if weight < row[v]:
+                    row[v] = weight
+            if row[u] > 0:
+                row[u] = 0
+
+        for k in range(node_count):
+            pivot_row = rows[k]
+            for i in range(node_count):
+                pivot_distance = rows[i][k]
+                if pivot_distance == math.inf:
+                    continue
+
+                rows[i] = list(map(min,
+                                   rows[i],
+                                   [pivot_distance + x for x in pivot_row]))
+
+        cls._check_negative_cycle(
+                        any(rows[i][i] < 0 for i in range(node_count)))
+
+        result = array.array('d')
+        for row in rows:
+            result.extend(row)
+
+        return result
+
+    @classmethod
+    def floyd_warshall(cls, graph):
+        """
+        Computes the matrix of the given graph with the Floyd-Warshall
+        algorithm in O(n^3) time. The graph may have negative edge weights
+        but no negative cycle.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @rtype: DistanceMatrix
+        """
+
+        nodes, index_neighbors, index_weights = graph.interned()
+
+        if numpy is not None:
+            distances = cls._floyd_warshall_vectorized(index_neighbors,
+                                                       index_weights)
+        else:
+            distances = cls._floyd_warshall_rows(index_neighbors,
+                                                 index_weights)
+
+        return cls([x for x in nodes], distances)
+
+    @classmethod
+    def _potentials(cls, index_neighbors, index_weights):
+        """
+        Runs the Bellman-Ford algorithm from a virtual node with zero-weight
+        edges to all nodes, so that w(u, v) + p(u) - p(v) is non-negative
+        for every edge (u, v).
+        """
+
+        node_count = len(index_neighbors)
+        potentials = [0] * node_count
+        for i in range(node_count + 1):
+            changed = False
+            for u in range(node_count):
+                potential = potentials[u]
+                for v, weight in zip(index_neighbors[u], index_weights[u]):
+                    if potential + weight < potentials[v]:
+                        potentials[v] = potential + weight
+                        changed = True
+
+            if not changed:
+                return potentials
+
+        cls._check_negative_cycle(True)
+
+    @classmethod
+    def johnson(cls, graph, workers=None):
+        """
+        Computes the matrix of the given graph with Johnson's algorithm in
+        O(nm log n) time. The graph may have negative edge weights but no
+        negative cycle.
+
+        With more than one worker, the Dijkstra's searches run in a pool of
+        that many processes, each of which receives the reweighted graph
+        once.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @type  workers: number
+        @param workers: The number of worker processes or None.
+        @rtype: DistanceMatrix
+        """
+
+        nodes, index_neighbors, index_weights = graph.interned()
+        node_count = len(nodes)
+
+        potentials = cls._potentials(index_neighbors, index_weights)
+        reweighted_weights = [
+            [weight + potentials[u] - potentials[v]
+             for v, weight in zip(index_neighbors[u], index_weights[u])]
+            for u in range(node_count)]
+
+        distances = array.array('d')
+        if workers is None or workers <= 1:
+            state = (index_neighbors,
+                     reweighted_weights,
+                     potentials,
+                     graph_util.GraphUtil._maximum_integer_weight(
+                                                          reweighted_weights))
+            for source in range(node_count):
+                distances.extend(_distance_row(state, source))
+        else:
+            chunk_size = max(1, node_count // (4 * workers))
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_initialize_worker,
+                    initargs=(index_neighbors,
+                              reweighted_weights,
+                              potentials)) as executor:
+                for row in executor.map(_worker_distance_row,
+                                        range(node_count),
+                                        chunksize=chunk_size):
+                    distances.extend(row)
+
+        return cls([x for x in nodes], distances)
+
+    @classmethod
+    def build(cls, graph, workers=None):
+        """
+        Computes the matrix of the given graph with the Floyd-Warshall
+        algorithm when the graph is small and dense enough and with Johnson's
+        algorithm otherwise.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @type  workers: number
+        @param workers: The number of worker processes of Johnson's
+                        algorithm or None.
+        @rtype: DistanceMatrix
+        """
+
+        nodes, index_neighbors, index_weights = graph.interned()
+        node_count = len(nodes)
+        edge_count = sum(len(x) for x in index_neighbors)
+
+        if numpy is not None:
+            density = cls.FLOYD_WARSHALL_DENSITY
+        else:
+            density = cls.PURE_PYTHON_FLOYD_WARSHALL_DENSITY
+
+        if (node_count <= cls.FLOYD_WARSHALL_NODE_LIMIT and
+            edge_count * density >= node_count * node_count):
+            return cls.floyd_warshall(graph)
+
+        return cls.johnson(graph, workers)
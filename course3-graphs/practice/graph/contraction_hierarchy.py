@@ -0,0 +1,383 @@
+import math
+import pickle
+
+import heap
+
+class ContractionHierarchy:
+    """
+    Represents a contraction hierarchy of a graph with non-negative edge
+    weights, which answers repeated point-to-point shortest path queries
+    much faster than running the Dijkstra's algorithm from scratch.
+
+    Preprocessing contracts the nodes one by one in the order of their
+    importance. When a node v is contracted, every path u -> v -> w between
+    two not yet contracted nodes is replaced with a shortcut edge u -> w,
+    unless a witness path from u to w that avoids v is at most as short.
+
+    A query runs a bidirectional Dijkstra's search that only follows edges
+    leading to more important nodes: the forward search from the source
+    over the upward edges and the backward search from the target over the
+    reversed downward edges.
+    """
+
+    # the number of nodes a witness search may settle before giving up
+    # (giving up only adds a superfluous shortcut)
+    WITNESS_SETTLED_LIMIT = 64
+
+    def __init__(self,
+                 nodes,
+                 ranks,
+                 upward_edges,
+                 downward_edges,
+                 shortcut_middles):
+        """
+        Initializes a hierarchy from the preprocessed data.
+
+        @type  nodes: list
+        @param nodes: The node identifiers ordered by their indices.
+        @type  ranks: list
+        @param ranks: The contraction rank of every node index.
+        @type  upward_edges: list
+        @param upward_edges: The (target, weight) lists of the edges leading
+                             from every node index to more important nodes.
+        @type  downward_edges: list
+        @param downward_edges: The (source, weight) lists of the edges
+                               leading from more important nodes to every
+                               node index.
+        @type  shortcut_middles: dict
+        @param shortcut_middles: The node index every shortcut (u, w) skips.
+        """
+
+        self._nodes = nodes
+        self._node_index = {}
+        for i, node in enumerate(nodes):
+            self._node_index[node] = i
+        self._ranks = ranks
+        self._upward_edges = upward_edges
+        self._downward_edges = downward_edges
+        self._shortcut_middles = shortcut_middles
+
+    @property
+    def shortcut_count(self):
+        return len(self._shortcut_middles)
+
+    def rank(self, node):
+        """
+        Returns the contraction rank of the given node (0 is contracted
+        first, so it is the least important node).
+        """
+
+        return self._ranks[self._node_index[node]]
+
+    @classmethod
+    def _witness_search(cls,
+                        out_edges,
+                        source,
+                        excluded,
+                        targets,
+                        maximum_distance):
+        distance_map = { source: 0 }
+
+        priority_queue = heap.IndexedBinHeap(heap.HeapMode.min)
+        priority_queue.insert(heap.HeapItem(0, source))
+
+        settled_count = 0
+        remaining_targets = len(targets)
+        while (priority_queue.size > 0 and
+               settled_count < cls.WITNESS_SETTLED_LIMIT and
+               remaining_targets > 0):
+            item = priority_queue.extract()
+            if item.priority > maximum_distance:
+                break
+
+            node = item.datum
+            settled_count += 1
+            if node in targets:
+                remaining_targets -= 1
+
+            for neighbor, weight in out_edges[node].items():
+                if neighbor == excluded:
+                    continue
+
+                distance = item.priority + weight
+                if (neighbor not in distance_map or
+                    distance_map[neighbor] > distance):
+                    distance_map[neighbor] = distance
+                    if priority_queue.contains(neighbor):
+                        priority_queue.decrease_key(neighbor, distance)
+                    else:
+                        priority_queue.insert(heap.HeapItem(distance,
+                                                            neighbor))
+
+        return distance_map
+
+    @classmethod
+    def _shortcuts(cls, out_edges, in_edges, v):
+        """
+        Returns the (u, w, weight) shortcuts that contracting the node v
+        requires.
+        """
+
+        shortcuts = []
+        if len(out_edges[v]) == 0:
+            return shortcuts
+
+        maximum_out_weight = max(out_edges[v].values())
+        for u, in_weight in in_edges[v].items():
+            targets = set(out_edges[v])
+            targets.discard(u)
+            if len(targets) == 0:
+                continue
+
+            distance_map = cls._witness_search(out_edges,
+                                               u,
+                                               v,
+                                               targets,
+                                               in_weight + maximum_out_weight)
+            for w in targets:
+                weight = in_weight + out_edges[v][w]
+                if w not in distance_map or distance_map[w] > weight:
+                    shortcuts.append((u, w, weight))
+
+        return shortcuts
+
+    @classmethod
+    def _priority(cls, out_edges, in_edges, deleted_neighbors, v):
+        """
+        Estimates the importance of the node v as its edge difference (the
+        number of shortcuts minus the number of removed edges) plus the
+        number of its already contracted neighbors.
+        """
+
+        shortcut_count = len(cls._shortcuts(out_edges, in_edges, v))
+
+        return (shortcut_count - len(out_edges[v]) - len(in_edges[v]) +
+                deleted_neighbors[v])
+
+    @classmethod
+    def build(cls, graph):
+        """
+        Contracts all nodes of the given graph, which must have non-negative
+        edge weights, and returns the resulting hierarchy.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @rtype: ContractionHierarchy
+        """
+
+        nodes = [x for x in graph.nodes()]
+        node_index = {}
+        for i, node in enumerate(nodes):
+            node_index[node] = i
+
+        node_count = len(nodes)
+        out_edges = [{} for i in range(node_count)]
+        in_edges = [{} for i in range(node_count)]
+        for u in range(node_count):
+            for neighbor in graph.neighbors(nodes[u]):
+                v = node_index[neighbor]
+                if u == v:
+                    continue
+
+                weight = graph.weight((nodes[u], neighbor))
+                if weight < 0:
+                    message = 'Edge ({}, {}) has a negative weight.'
+                    raise ValueError(message.format(nodes[u], neighbor))
+                if v not in out_edges[u] or out_edges[u][v] > weight:
+                    out_edges[u][v] = weight
+                    in_edges[v][u] = weight
+
+        deleted_neighbors = [0] * node_count
+        priority_queue = heap.IndexedBinHeap(heap.HeapMode.min)
+        for v in range(node_count):
+            priority = cls._priority(out_edges, in_edges, deleted_neighbors, v)
+            priority_queue.insert(heap.HeapItem(priority, v))
+
+        ranks = [0] * node_count
+        upward_edges = [None] * node_count
+        downward_edges = [None] * node_count
+        shortcut_middles = {}
+        rank = 0
+        while priority_queue.size > 0:
+            v = priority_queue.extract().datum
+
+            # lazy update: postpones the node if it became less important
+            priority = cls._priority(out_edges, in_edges, deleted_neighbors, v)
+            if (priority_queue.size > 0 and
+                priority > priority_queue.elements[0].priority):
+                priority_queue.insert(heap.HeapItem(priority, v))
+                continue
+
+            for u, w, weight in cls._shortcuts(out_edges, in_edges, v):
+                if w not in out_edges[u] or out_edges[u][w] > weight:
+                    out_edges[u][w] = weight
+                    in_edges[w][u] = weight
+                    shortcut_middles[(u, w)] = v
+
+            ranks[v] = rank
+            rank += 1
+            upward_edges[v] = [x for x in out_edges[v].items()]
+            downward_edges[v] = [x for x in in_edges[v].items()]
+
+            for w in out_edges[v]:
+                del in_edges[w][v]
+                deleted_neighbors[w] += 1
+            for u in in_edges[v]:
+                del out_edges[u][v]
+                deleted_neighbors[u] += 1
+            out_edges[v] = {}
+            in_edges[v] = {}
+
+        return cls(nodes,
+                   ranks,
+                   upward_edges,
+                   downward_edges,
+                   shortcut_middles)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a hierarchy saved with save().
+        """
+
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+
+        return cls(data['nodes'],
+                   data['ranks'],
+                   data['upward_edges'],
+                   data['downward_edges'],
+                   data['shortcut_middles'])
+
+    def save(self, path):
+        """
+        Saves the hierarchy to the given file, usually next to the file of
+        the graph it was built from.
+        """
+
+        data = {
+            'nodes': self._nodes,
+            'ranks': self._ranks,
+            'upward_edges': self._upward_edges,
+            'downward_edges': self._downward_edges,
+            'shortcut_middles': self._shortcut_middles,
+        }
+        with open(path, 'wb') as f:
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+
+    def _search(self, source, target):
+        searches = [ (self._upward_edges, { source: 0 }, { source: None }),
+                     (self._downward_edges, { target: 0 }, { target: None }) ]
+        priority_queues = [ heap.IndexedBinHeap(heap.HeapMode.min),
+                            heap.IndexedBinHeap(heap.HeapMode.min) ]
+        priority_queues[0].insert(heap.HeapItem(0, source))
+        priority_queues[1].insert(heap.HeapItem(0, target))
+        finished = [ False, False ]
+
+        best_distance = math.inf
+        meeting_node = None
+        side = 1
+        while not (finished[0] and finished[1]):
+            # alternates the sides while both are not finished
+            if not finished[1 - side]:
+                side = 1 - side
+
+            edges, distance_map, predecessor_map = searches[side]
+            priority_queue = priority_queues[side]
+
+            # unlike in the plain bidirectional search, the frontiers may
+            # meet before the shortest path is found, so every side runs
+            # until it cannot improve the distance any more
+            if (priority_queue.size == 0 or
+                priority_queue.elements[0].priority >= best_distance):
+                finished[side] = True
+                continue
+
+            item = priority_queue.extract()
+            node = item.datum
+            other_distance_map = searches[1 - side][1]
+            if node in other_distance_map:
+                distance = item.priority + other_distance_map[node]
+                if distance < best_distance:
+                    best_distance = distance
+                    meeting_node = node
+
+            for neighbor, weight in edges[node]:
+                distance = item.priority + weight
+                if (neighbor not in distance_map or
+                    distance_map[neighbor] > distance):
+                    distance_map[neighbor] = distance
+                    predecessor_map[neighbor] = node
+                    if priority_queue.contains(neighbor):
+                        priority_queue.decrease_key(neighbor, distance)
+                    else:
+                        priority_queue.insert(heap.HeapItem(distance,
+                                                            neighbor))
+
+        return best_distance, meeting_node, searches[0][2], searches[1][2]
+
+    def _unpack(self, u, w, path):
+        stack = [ (u, w) ]
+        while stack:
+            u, w = stack.pop()
+            if (u, w) in self._shortcut_middles:
+                v = self._shortcut_middles[(u, w)]
+                stack.append((v, w))
+                stack.append((u, v))
+            else:
+                path.append(w)
+
+    def distance(self, source, target):
+        """
+        Returns the weight of a shortest path from the source to the target
+        or infinity if the target is unreachable.
+        """
+
+        source_index = self._node_index[source]
+        target_index = self._node_index[target]
+
+        if source_index == target_index:
+            return 0
+
+        best_distance, meeting_node, forward_map, backward_map = \
+                                   self._search(source_index, target_index)
+
+        return best_distance
+
+    def shortest_path(self, source, target):
+        """
+        Returns the weight of a shortest path from the source to the target
+        and the path in the format of GraphUtil.reconstruct_shortest_path
+        (without the source), with all shortcuts unpacked into the edges of
+        the original graph.
+        """
+
+        source_index = self._node_index[source]
+        target_index = self._node_index[target]
+
+        if source_index == target_index:
+            return 0, []
+
+        best_distance, meeting_node, forward_map, backward_map = \
+                                   self._search(source_index, target_index)
+
+        if meeting_node is None:
+            return math.inf, []
+
+        upward_path = []
+        node = meeting_node
+        while node is not None:
+            upward_path.append(node)
+            node = forward_map[node]
+        upward_path.reverse()
+
+        node = backward_map[meeting_node]
+        while node is not None:
+            upward_path.append(node)
+            node = backward_map[node]
+
+        path = []
+        for i in range(len(upward_path) - 1):
+            self._unpack(upward_path[i], upward_path[i + 1], path)
+
+        return best_distance, [self._nodes[x] for x in path]
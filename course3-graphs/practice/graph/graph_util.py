@@ -1,13 +1,110 @@
+import array
 import collections
+import concurrent.futures
+import contextlib
 import itertools
 import math
+import mmap
+import multiprocessing.shared_memory
+import struct
+import sys
+import time
 
 import heap
 import union_find
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _attach_shared_buffers(buffers):
+    """
+    Attaches to the shared memory blocks of the (name, typecode, length)
+    buffers made by GraphUtil._share_buffers and returns the blocks and the
+    typed memoryviews of the buffers.
+    """
+
+    blocks = []
+    views = []
+    for name, typecode, length in buffers:
+        block = multiprocessing.shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        size = length * array.array(typecode).itemsize
+        views.append(block.buf[:size].cast(typecode))
+
+    return blocks, views
+
+# the source of the graph versions, which are unique across all graphs, so a
+# version identifies both a graph and its state
+_graph_versions = itertools.count(1)
+
+# the graph and the algorithm of a GraphUtil.multi_source worker process,
+# set once per process by _initialize_multi_source_worker
+_multi_source_state = None
+
+def _initialize_multi_source_worker(algorithm, nodes, buffers):
+    """
+    Attaches the worker process to the shared memory blocks of the CSR
+    buffers of the graph, so the graph is never pickled.
+    """
+
+    global _multi_source_state
+
+    blocks, views = _attach_shared_buffers(buffers)
+
+    graph = CSRGraph(nodes, views[0], views[1], views[2])
+    method = getattr(GraphUtil(), algorithm)
+    # the blocks have to stay open as long as the graph views them
+    _multi_source_state = (blocks, graph, method)
+
+def _multi_source_task(source):
+    blocks, graph, method = _multi_source_state
+
+    return method(graph, source)
+
+# the shared edge arrays and component labels of a GraphUtil.boruvka worker
+# process, set once per process by _initialize_boruvka_worker
+_boruvka_state = None
+
+def _initialize_boruvka_worker(buffers):
+    global _boruvka_state
+
+    # the blocks have to stay open as long as the views exist
+    _boruvka_state = _attach_shared_buffers(buffers)
+
+def _boruvka_task(start, end):
+    """
+    Returns the position of the cheapest edge leaving every component among
+    the edges at the given positions, which are sorted by weight, so the
+    first edge found for a component is its cheapest one.
+    """
+
+    blocks, (sources, targets, labels) = _boruvka_state
+
+    cheapest = {}
+    for position in range(start, end):
+        u_label = labels[sources[position]]
+        v_label = labels[targets[position]]
+        if u_label != v_label:
+            if u_label not in cheapest:
+                cheapest[u_label] = position
+            if v_label not in cheapest:
+                cheapest[v_label] = position
+
+    return cheapest
+
 class Graph:
     """
     Represents the graph data structure.
+
+    Every node is also interned as a dense integer index (0, 1, ..., n - 1 in
+    the order the nodes are added), and the edges are mirrored in per-index
+    lists of neighbor indices and weights, so the algorithms can run on
+    lists indexed by int instead of dictionaries keyed by node identifiers.
+
+    Every change of the graph gives it a new version (see the version
+    property).
     """
 
     def __init__(self):
@@ -15,9 +112,18 @@ class Graph:
         Initializes a graph.
         """
 
+        self._version = next(_graph_versions)
+
         self._node_neighbors = {}
         self._edge_weights = {}
 
+        self._nodes = []
+        self._node_index = {}
+        self._index_neighbors = []
+        self._index_weights = []
+
+        self._connectivity = None
+
     def __repr__(self):
         """
         Returns a string representation of the graph.
@@ -45,6 +151,17 @@ class Graph:
 
         return ' '.join(texts)
 
+    @property
+    def version(self):
+        """
+        Returns the version of the graph, which every added node or edge
+        changes to a number no graph has had before, so the results computed
+        for one version (see ShortestPathTreeCache) are never mistaken for
+        those of another graph or of a later state of this graph.
+        """
+
+        return self._version
+
     def nodes(self):
         """
         Returns a dictionary view of all nodes in the graph.
@@ -65,6 +182,19 @@ class Graph:
 
         return self._node_neighbors[node]
 
+    def weighted_neighbors(self, node):
+        """
+        Returns an iterator of the (neighbor, weight) pairs of the edges
+        leaving the given node, in the order of neighbors().
+
+        @type  node: node
+        @param node: The node identifier.
+        @rtype: iterator
+        """
+
+        return zip(self._node_neighbors[node],
+                   self._index_weights[self._node_index[node]])
+
     def edges(self):
         """
         Returns a dictionary view of all edges in the graph.
@@ -74,6 +204,74 @@ class Graph:
 
         return self._edge_weights.keys()
 
+    def weighted_edges(self):
+        """
+        Returns an iterator of the (u, v, weight) triples of all edges in
+        the order of edges().
+
+        @rtype: iterator
+        """
+
+        return ((u, v, weight)
+                for (u, v), weight in self._edge_weights.items())
+
+    def index(self, node):
+        """
+        Returns the dense integer index of the given node.
+
+        @type  node: node
+        @param node: The node identifier.
+        @rtype: int
+        """
+
+        return self._node_index[node]
+
+    def node(self, index):
+        """
+        Returns the node identifier with the given index.
+
+        @type  index: int
+        @param index: The node index.
+        @rtype: node
+        """
+
+        return self._nodes[index]
+
+    def interned(self):
+        """
+        Returns the list of nodes ordered by their indices and the lists of
+        neighbor indices and edge weights of every node index.
+
+        @attention: The lists are shared with the graph and must not be
+                    modified.
+
+        @rtype: tuple
+        """
+
+        return self._nodes, self._index_neighbors, self._index_weights
+
+    @property
+    def connectivity(self):
+        """
+        Returns the ConnectivityTracker attached to the graph or None.
+        """
+
+        return self._connectivity
+
+    def track_connectivity(self):
+        """
+        Attaches a ConnectivityTracker to the undirected graph (unless one is
+        attached already) and returns it. The graph keeps it up to date
+        while undirected edges are added.
+
+        @rtype: ConnectivityTracker
+        """
+
+        if self._connectivity is None:
+            self._connectivity = ConnectivityTracker(self)
+
+        return self._connectivity
+
     def weight(self, edge):
         """
         Returns the weight associated with the edge (which is a tuple of two
@@ -111,9 +309,131 @@ class Graph:
 
         if not node in self._node_neighbors:
             self._node_neighbors[node] = []
+
+            self._node_index[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._index_neighbors.append([])
+            self._index_weights.append([])
+
+            if self._connectivity is not None:
+                self._connectivity._add_node()
+
+            self._version = next(_graph_versions)
         else:
             raise ValueError('Node %s already in the graph.' % node)
 
+    @staticmethod
+    def parse_integers(data):
+        """
+        Parses all whitespace-separated integers of the given text (such as
+        the whole input of an assignment) in one pass, with NumPy when it is
+        installed.
+
+        @type  data: bytes or string
+        @param data: The text.
+        @rtype: sequence
+        """
+
+        if numpy is not None:
+            return numpy.array(data.split(), dtype=numpy.int64)
+
+        return [int(x) for x in data.split()]
+
+    @staticmethod
+    def _as_list(values):
+        if hasattr(values, 'tolist'):
+            return values.tolist()
+
+        return [x for x in values]
+
+    @classmethod
+    def from_edge_arrays(cls,
+                         node_count,
+                         sources,
+                         targets,
+                         weights=None,
+                         directed=True,
+                         check_duplicates=False,
+                         first_node=1):
+        """
+        Builds a graph with the nodes first_node, ..., first_node + n - 1
+        (1, ..., n as in the assignments) and the edges given as parallel
+        sequences (lists, arrays or NumPy arrays) of their sources, targets
+        and weights in one batch, without validating every edge on its own.
+
+        The edges must be distinct unless the duplicates are checked, which
+        is done in one pass over all of them.
+
+        @type  node_count: number
+        @param node_count: The number of nodes.
+        @type  sources: sequence
+        @param sources: The source nodes of the edges.
+        @type  targets: sequence
+        @param targets: The target nodes of the edges.
+        @type  weights: sequence
+        @param weights: The edge weights or None for the weight 0.
+        @type  directed: boolean
+        @param directed: Whether the edges are directed.
+        @type  check_duplicates: boolean
+        @param check_duplicates: Whether to raise ValueError on a duplicate
+                                 edge.
+        @type  first_node: number
+        @param first_node: The first node.
+        @rtype: Graph
+        """
+
+        sources = cls._as_list(sources)
+        targets = cls._as_list(targets)
+        if weights is None:
+            weights = [0] * len(sources)
+        else:
+            weights = cls._as_list(weights)
+        if len(targets) != len(sources) or len(weights) != len(sources):
+            raise ValueError('Expected {} targets and weights.'.format(
+                                                                len(sources)))
+
+        last_node = first_node + node_count - 1
+        for nodes in [ sources, targets ]:
+            if (len(nodes) > 0 and
+                (min(nodes) < first_node or max(nodes) > last_node)):
+                for node in nodes:
+                    if node < first_node or node > last_node:
+                        raise ValueError('Node %s not in the graph.' % node)
+
+        if not directed:
+            sources, targets = sources + targets, targets + sources
+            weights = weights + weights
+
+        graph = cls()
+        for node in range(first_node, last_node + 1):
+            graph.add_node(node)
+
+        edge_weights = graph._edge_weights
+        edge_weights.update(zip(zip(sources, targets), weights))
+        if check_duplicates and len(edge_weights) != len(sources):
+            edges = set()
+            for edge in zip(sources, targets):
+                if edge in edges:
+                    raise ValueError('Edge (%s, %s) already in graph.' % edge)
+                edges.add(edge)
+
+        node_neighbors = graph._node_neighbors
+        index_neighbors = graph._index_neighbors
+        index_weights = graph._index_weights
+        for u, v, weight in zip(sources, targets, weights):
+            node_neighbors[u].append(v)
+            i = u - first_node
+            index_neighbors[i].append(v - first_node)
+            index_weights[i].append(weight)
+        graph._version = next(_graph_versions)
+
+        return graph
+
+    def _add_index_edge(self, u, v, weight):
+        i = self._node_index[u]
+        self._index_neighbors[i].append(self._node_index[v])
+        self._index_weights[i].append(weight)
+
     def add_directed_edge(self, u, v, weight=0):
         """
         Add a directed edge connecting two given nodes to the graph.
@@ -135,6 +455,12 @@ class Graph:
         if edge not in self._edge_weights:
             self._node_neighbors[u].append(v)
             self._edge_weights[edge] = weight
+            self._add_index_edge(u, v, weight)
+
+            # the components of a directed graph depend on the direction
+            self._connectivity = None
+
+            self._version = next(_graph_versions)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge)
 
@@ -160,107 +486,2103 @@ class Graph:
         if edge1 not in self._edge_weights:
             self._node_neighbors[u].append(v)
             self._edge_weights[edge1] = weight
+            self._add_index_edge(u, v, weight)
+            self._version = next(_graph_versions)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge1)
 
         if edge2 not in self._edge_weights:
             self._node_neighbors[v].append(u)
             self._edge_weights[edge2] = weight
+            self._add_index_edge(v, u, weight)
+            self._version = next(_graph_versions)
         else:
             raise ValueError('Edge (%s, %s) already in graph.' % edge2)
 
-class GraphUtil:
+        if self._connectivity is not None:
+            self._connectivity._add_edge(u, v)
+
+class ConnectivityTracker:
+    """
+    Keeps the connected components of an undirected graph in a union-find
+    over the node indices, which the graph updates whenever a node or an
+    undirected edge is added, so the components never need a traversal.
+
+    Adding a directed edge detaches the tracker from the graph, since the
+    components of a directed graph depend on the direction of the edges.
+    """
+
+    def __init__(self, graph):
+        """
+        Initializes a tracker from the current nodes and edges of the graph.
+
+        @type  graph: Graph
+        @param graph: The undirected graph.
+        """
+
+        nodes, index_neighbors, index_weights = graph.interned()
+
+        self._graph = graph
+        self._set = union_find.ArrayUnionFind(len(nodes))
+        for u, neighbors in enumerate(index_neighbors):
+            for v in neighbors:
+                if (graph.node(v), graph.node(u)) not in graph.edges():
+                    message = 'Edge ({}, {}) is directed.'
+                    raise ValueError(message.format(graph.node(u),
+                                                    graph.node(v)))
+                self._set.union(u, v)
+
+    @property
+    def component_count(self):
+        return self._set.component_count
+
+    def _add_node(self):
+        self._set.add()
+
+    def _add_edge(self, u, v):
+        self._set.union(self._graph.index(u), self._graph.index(v))
+
+    def connected(self, x, y):
+        """
+        Returns whether the two given nodes are in the same component.
+        """
+
+        return (self._set.find(self._graph.index(x)) ==
+                self._set.find(self._graph.index(y)))
+
+    def component_size(self, node):
+        """
+        Returns the number of nodes in the component of the given node.
+        """
+
+        return self._set.component_size(self._graph.index(node))
+
+    def component(self, node):
+        """
+        Returns the list of nodes in the component of the given node in the
+        order they were added.
+        """
+
+        nodes = self._graph.interned()[0]
+        roots = self._set.find_many(range(len(nodes)))
+        root = roots[self._graph.index(node)]
+
+        return [nodes[i] for i in range(len(nodes)) if roots[i] == root]
+
+    def component_numbers(self):
+        """
+        Returns a dictionary that maps every node to the number of its
+        component (1, 2, ..., k, numbered in the order the nodes were added).
+        """
+
+        nodes = self._graph.interned()[0]
+        roots = self._set.find_many(range(len(nodes)))
+
+        root_numbers = {}
+        component_numbers = {}
+        for node, root in zip(nodes, roots):
+            if root not in root_numbers:
+                root_numbers[root] = len(root_numbers) + 1
+            component_numbers[node] = root_numbers[root]
+
+        return component_numbers
+
+class DirectedAcyclicGraph(Graph):
+    """
+    Represents a directed graph that stays acyclic and maintains one of its
+    topological orderings while the edges are inserted.
+
+    An edge (u, v) that agrees with the current order changes nothing.
+    Otherwise, the Pearce-Kelly algorithm searches forward from v and
+    backward from u, but only among the nodes between v and u in the order,
+    and reorders just these nodes: the ones that reach u move before the
+    ones v reaches, within the same positions. If the forward search finds
+    u, the edge would close a cycle and is rejected before the graph
+    changes.
+    """
 
     def __init__(self):
-        self.visit_number = None
-        self.preorder = collections.OrderedDict()
-        self.postorder = collections.OrderedDict()
-        self.component_id = {}
+        """
+        Initializes a graph.
+        """
 
-    def _previsit_number(self, node):
-        self.preorder[node] = self.visit_number
-        self.visit_number += 1
+        super().__init__()
 
-    def _postvisit_number(self, node):
-        self.postorder[node] = self.visit_number
-        self.visit_number += 1
+        self._order = []
+        self._positions = {}
+        self._predecessors = {}
 
-    def _previsit_component_number(self, node):
-        self.component_id[node] = self.component_number
+    def topological_order(self):
+        """
+        Returns the current topological ordering of the nodes.
 
-    def _postvisit_toposort(self, node):
-        self.order.insert(0, node)
+        @attention: The list is shared with the graph and must not be
+                    modified.
 
-    def _reverse(self, graph):
-        reverse_graph = Graph()
-        for node in graph.nodes():
-            reverse_graph.add_node(node)
-        for node in graph.nodes():
-            for neighbor in graph.neighbors(node):
-                reverse_graph.add_directed_edge(neighbor, node)
+        @rtype: list
+        """
 
-        return reverse_graph
+        return self._order
 
-    def _explore(self,
-                 graph,
-                 node,
-                 visited,
-                 previsit=None,
-                 postvisit=None,
-                 excluded=None):
-        visited.add(node)
+    def position(self, node):
+        """
+        Returns the position of the given node in the topological ordering.
 
-        if previsit is not None:
-            previsit(node)
+        @type  node: node
+        @param node: The node identifier.
+        @rtype: int
+        """
 
-        if node in graph.nodes():
-            for neighbor in graph.neighbors(node):
-                if neighbor not in visited:
-                    if excluded is not None and neighbor in excluded:
-                        continue
-                    self._explore(graph,
-                                  neighbor,
-                                  visited,
-                                  previsit,
-                                  postvisit,
-                                  excluded)
+        return self._positions[node]
 
-        if postvisit is not None:
-            postvisit(node)
+    def add_node(self, node):
+        """
+        Adds the given node to the graph at the end of the ordering.
 
-    def _create_distance_and_previous_maps(self, graph):
-        distance_map = {}
-        predecessor_map = {}
-        for node in graph.nodes():
-            distance_map[node] = math.inf
-            predecessor_map[node] = None
+        @type  node: node
+        @param node: The node identifier.
+        """
 
-        return distance_map, predecessor_map
+        super().add_node(node)
+
+        self._positions[node] = len(self._order)
+        self._order.append(node)
+        self._predecessors[node] = []
+
+    @classmethod
+    def from_edge_arrays(cls,
+                         node_count,
+                         sources,
+                         targets,
+                         weights=None,
+                         directed=True,
+                         check_duplicates=False,
+                         first_node=1):
+        """
+        Builds a graph from the edge arrays like Graph.from_edge_arrays and
+        computes its topological ordering with Kahn's algorithm in one pass
+        over all edges instead of updating it edge by edge.
 
-    def _relax(self, graph, distance_map, predecessor_map, u, v):
-        edge_distance = distance_map[u] + graph.weight((u, v))
-        if distance_map[v] > edge_distance:
-            distance_map[v] = edge_distance
-            predecessor_map[v] = u
+        Raises ValueError if the edges close a cycle, which every undirected
+        edge does.
+        """
+
+        graph = super().from_edge_arrays(node_count,
+                                         sources,
+                                         targets,
+                                         weights,
+                                         directed,
+                                         check_duplicates,
+                                         first_node)
+
+        nodes, index_neighbors, index_weights = graph.interned()
+
+        in_degrees = [0] * len(nodes)
+        for neighbors in index_neighbors:
+            for j in neighbors:
+                in_degrees[j] += 1
+
+        order = [i for i in range(len(nodes)) if in_degrees[i] == 0]
+        # the list grows while it is traversed
+        for i in order:
+            for j in index_neighbors[i]:
+                in_degrees[j] -= 1
+                if in_degrees[j] == 0:
+                    order.append(j)
+
+        if len(order) < len(nodes):
+            raise ValueError('The edges close a cycle.')
+
+        graph._order = [nodes[i] for i in order]
+        for position, node in enumerate(graph._order):
+            graph._positions[node] = position
+        for u, neighbors in graph._node_neighbors.items():
+            for v in neighbors:
+                graph._predecessors[v].append(u)
+
+        return graph
+
+    def _affected_nodes(self, start, edges, lower, upper, stop=None):
+        """
+        Returns the nodes reachable from the start over the given edges
+        through the nodes at the positions between lower and upper, or None
+        if the stop node is among them.
+        """
+
+        visited = { start }
+        stack = [ start ]
+        while stack:
+            node = stack.pop()
+            for neighbor in edges[node]:
+                if neighbor == stop:
+                    return None
+
+                if (neighbor not in visited and
+                    lower < self._positions[neighbor] < upper):
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+
+        return visited
+
+    def add_directed_edge(self, u, v, weight=0):
+        """
+        Add a directed edge connecting two given nodes to the graph and
+        updates the topological ordering.
+
+        Raises ValueError if the edge would close a cycle.
+
+        @type  u: node
+        @param u: The first node identifier.
+        @type  v: node
+        @param v: The second node identifier.
+        @type  weight: number
+        @param weight: The edge's weight.
+        """
+
+        if (u in self._positions and v in self._positions and
+            (u, v) not in self._edge_weights):
+            if u == v:
+                raise ValueError('Edge (%s, %s) would close a cycle.' % (u, v))
+
+            lower = self._positions[v]
+            upper = self._positions[u]
+            if lower < upper:
+                forward = self._affected_nodes(v,
+                                               self._node_neighbors,
+                                               lower,
+                                               upper,
+                                               u)
+                if forward is None:
+                    raise ValueError('Edge (%s, %s) would close a cycle.' %
+                                     (u, v))
+
+                backward = self._affected_nodes(u,
+                                                self._predecessors,
+                                                lower,
+                                                upper)
+
+                self._reorder(backward, forward)
+
+        super().add_directed_edge(u, v, weight)
+
+        self._predecessors[v].append(u)
+
+    def _reorder(self, backward, forward):
+        """
+        Moves the backward nodes before the forward nodes, keeping the
+        relative order within both sets and reusing their positions.
+        """
+
+        by_position = lambda x: self._positions[x]
+        nodes = sorted(backward, key=by_position)
+        nodes.extend(sorted(forward, key=by_position))
+
+        positions = sorted(self._positions[x] for x in nodes)
+        for position, node in zip(positions, nodes):
+            self._positions[node] = position
+            self._order[position] = node
+
+    def add_undirected_edge(self, u, v, weight=0):
+        """
+        Rejects the edge, since an undirected edge is a cycle of length two.
+        """
+
+        raise ValueError('Edge (%s, %s) would close a cycle.' % (u, v))
+
+class CSRGraph:
+    """
+    Represents a frozen graph in the compressed sparse row (CSR) format.
+
+    The nodes are numbered 0, 1, ..., n - 1 in the order they are given. The
+    neighbors of the node with the index i are the targets between
+    offsets[i] and offsets[i + 1] and the weights of the corresponding edges
+    are held at the same positions of the weights array. All three buffers
+    are flat arrays of machine numbers (or memoryviews of such buffers in
+    shared memory or in a memory-mapped file), so the graph needs neither
+    per-edge tuples nor per-node lists.
+
+    The graph offers the same read-only interface as Graph, so every
+    GraphUtil algorithm runs against it unchanged.
+    """
+
+    # the header of a graph file: the magic, the format version, the type
+    # code of the weights, the node count, the edge count and the first
+    # node of the node range, followed by the offsets, the targets and the
+    # weights, each aligned to 8 bytes
+    FILE_HEADER = struct.Struct('<4sHcxqqq')
+    FILE_MAGIC = b'CSRG'
+    FILE_VERSION = 1
+
+    def __init__(self, nodes, offsets, targets, weights):
+        """
+        Initializes a graph from the already built CSR buffers.
+
+        @type  nodes: sequence
+        @param nodes: The node identifiers ordered by their indices.
+        @type  offsets: array
+        @param offsets: The n + 1 offsets into the targets and weights.
+        @type  targets: array
+        @param targets: The indices of the edge targets.
+        @type  weights: array
+        @param weights: The edge weights.
+        """
+
+        if len(offsets) != len(nodes) + 1:
+            raise ValueError('Expected {} offsets, got {}.'.format(
+                                                              len(nodes) + 1,
+                                                              len(offsets)))
+        if len(targets) != offsets[-1] or len(weights) != offsets[-1]:
+            raise ValueError('Expected {} targets and weights.'.format(
+                                                                  offsets[-1]))
+
+        self._nodes = nodes
+        if isinstance(nodes, range):
+            self._node_index = None
+        else:
+            self._node_index = {}
+            for i, node in enumerate(nodes):
+                if node in self._node_index:
+                    raise ValueError('Node %s already in the graph.' % node)
+                self._node_index[node] = i
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+        self._version = next(_graph_versions)
+
+    def __repr__(self):
+        """
+        Returns a string representation of the graph.
+
+        @rtype: string
+        """
+
+        texts = []
+
+        nodes = [x for x in self.nodes()]
+        nodes.sort()
+        text = ', '.join(nodes)
+        texts.append('[nodes: {}]'.format(text))
+
+        edges = []
+        for node, neighbor, weight in self.weighted_edges():
+            item = '({}, {}) {}'.format(node, neighbor, weight)
+            edges.append(item)
+        edges.sort()
+        text = ', '.join(edges)
+        texts.append('[edges: {}]'.format(text))
+
+        return ' '.join(texts)
+
+    @staticmethod
+    def _weight_array(weights):
+        """
+        Stores the weights as 64-bit integers when all of them are integral
+        and as doubles otherwise.
+        """
+
+        try:
+            return array.array('q', weights)
+        except (TypeError, OverflowError):
+            return array.array('d', weights)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Builds a CSR graph from the given graph. The neighbors of every node
+        keep their order.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @rtype: CSRGraph
+        """
+
+        nodes = [x for x in graph.nodes()]
+        node_index = {}
+        for i, node in enumerate(nodes):
+            node_index[node] = i
+
+        offsets = array.array('q', [0])
+        targets = array.array('i')
+        weights = []
+        for node in nodes:
+            for neighbor, weight in graph.weighted_neighbors(node):
+                targets.append(node_index[neighbor])
+                weights.append(weight)
+            offsets.append(len(targets))
+
+        return cls(nodes, offsets, targets, cls._weight_array(weights))
+
+    @classmethod
+    def from_edges(cls, nodes, edges, directed=True):
+        """
+        Builds a CSR graph from the given nodes and the list of (u, v, weight)
+        edges. An undirected edge is stored in both directions. The edges of
+        every node keep their order.
+
+        @type  nodes: sequence
+        @param nodes: The node identifiers.
+        @type  edges: list
+        @param edges: The (u, v, weight) triples.
+        @type  directed: boolean
+        @param directed: Whether the edges are directed.
+        @rtype: CSRGraph
+        """
+
+        if not isinstance(nodes, range):
+            nodes = [x for x in nodes]
+        node_index = {}
+        for i, node in enumerate(nodes):
+            node_index[node] = i
+
+        degrees = array.array('q', bytes(8 * (len(nodes) + 1)))
+        for u, v, weight in edges:
+            if u not in node_index:
+                raise ValueError('Node %s not in the graph.' % u)
+            if v not in node_index:
+                raise ValueError('Node %s not in the graph.' % v)
+            degrees[node_index[u] + 1] += 1
+            if not directed:
+                degrees[node_index[v] + 1] += 1
+
+        offsets = degrees
+        for i in range(1, len(offsets)):
+            offsets[i] += offsets[i - 1]
+
+        edge_count = offsets[-1]
+        next_position = array.array('q', offsets[:-1])
+        targets = array.array('i', bytes(4 * edge_count))
+        weights = [0] * edge_count
+        for u, v, weight in edges:
+            i = node_index[u]
+            j = node_index[v]
+            position = next_position[i]
+            targets[position] = j
+            weights[position] = weight
+            next_position[i] = position + 1
+            if not directed:
+                position = next_position[j]
+                targets[position] = i
+                weights[position] = weight
+                next_position[j] = position + 1
+
+        return cls(nodes, offsets, targets, cls._weight_array(weights))
+
+    @classmethod
+    def from_edge_list(cls, lines, directed=True):
+        """
+        Builds a CSR graph from the lines of the edge list format of the
+        assignments: the node count n and the edge count m, followed by m
+        lines of an edge u v (and its weight, 0 if missing) with the nodes
+        numbered from 1 to n. The lines after the edges are ignored.
+
+        @type  lines: iterable
+        @param lines: The text lines.
+        @type  directed: boolean
+        @param directed: Whether the edges are directed.
+        @rtype: CSRGraph
+        """
+
+        lines = iter(lines)
+        node_count, edge_count = map(int, next(lines).split())
+
+        edges = []
+        for i in range(edge_count):
+            fields = next(lines).split()
+            if len(fields) > 2:
+                try:
+                    weight = int(fields[2])
+                except ValueError:
+                    weight = float(fields[2])
+            else:
+                weight = 0
+            edges.append((int(fields[0]), int(fields[1]), weight))
+
+        return cls.from_edges(range(1, node_count + 1), edges, directed)
+
+    @classmethod
+    def _check_byte_order(cls):
+        if sys.byteorder != 'little':
+            raise ValueError('Graph files need a little-endian machine.')
+
+    @staticmethod
+    def _padding(size):
+        return -size % 8
+
+    def save(self, path):
+        """
+        Saves the graph to the given file in the binary format that load()
+        maps into memory. Only a graph whose nodes are a range of integers
+        with the step 1, such as the nodes of the assignments, can be saved.
+        """
+
+        self._check_byte_order()
+
+        nodes = self._nodes
+        if not isinstance(nodes, range) or nodes.step != 1:
+            raise ValueError('The nodes must be a range with the step 1.')
+
+        weight_typecode = memoryview(self._weights).format
+        if weight_typecode not in [ 'q', 'd' ]:
+            weight_typecode = 'q'
+
+        header = self.FILE_HEADER.pack(self.FILE_MAGIC,
+                                       self.FILE_VERSION,
+                                       weight_typecode.encode('ascii'),
+                                       len(nodes),
+                                       len(self._targets),
+                                       nodes.start)
+
+        targets = array.array('i', self._targets)
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.write(array.array('q', self._offsets).tobytes())
+            f.write(targets.tobytes())
+            f.write(bytes(self._padding(len(targets) * targets.itemsize)))
+            f.write(array.array(weight_typecode, self._weights).tobytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Maps a graph saved with save() into memory read-only in O(1) time:
+        the buffers of the returned graph are views of the mapped file, so
+        the pages are only read when touched and the processes mapping the
+        same file share them.
+
+        @type  path: string
+        @param path: The path of the graph file.
+        @rtype: CSRGraph
+        """
+
+        cls._check_byte_order()
+
+        with open(path, 'rb') as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError('Not a graph file: {}.'.format(path))
+
+        buffer = memoryview(mapping)
+        header_size = cls.FILE_HEADER.size
+        if len(buffer) < header_size:
+            raise ValueError('Not a graph file: {}.'.format(path))
+
+        (magic,
+         version,
+         weight_typecode,
+         node_count,
+         edge_count,
+         first_node) = cls.FILE_HEADER.unpack(buffer[:header_size])
+        if magic != cls.FILE_MAGIC:
+            raise ValueError('Not a graph file: {}.'.format(path))
+        if version != cls.FILE_VERSION:
+            raise ValueError(
+                'Unsupported graph file version: {}.'.format(version))
+
+        offsets_start = header_size
+        targets_start = offsets_start + 8 * (node_count + 1)
+        weights_start = targets_start + 4 * edge_count
+        weights_start += cls._padding(weights_start)
+        weights_end = weights_start + 8 * edge_count
+        if len(buffer) != weights_end:
+            raise ValueError('Truncated graph file: {}.'.format(path))
+
+        return cls(range(first_node, first_node + node_count),
+                   buffer[offsets_start:targets_start].cast('q'),
+                   buffer[targets_start:targets_start +
+                          4 * edge_count].cast('i'),
+                   buffer[weights_start:weights_end].cast(
+                                            weight_typecode.decode('ascii')))
+
+    @classmethod
+    def convert(cls, text_path, path, directed=True):
+        """
+        Converts a graph file in the edge list format of the assignments
+        (see from_edge_list) to the binary format of save().
+        """
+
+        with open(text_path, 'r') as f:
+            graph = cls.from_edge_list(f, directed)
+
+        graph.save(path)
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def targets(self):
+        return self._targets
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @property
+    def node_count(self):
+        return len(self._nodes)
+
+    @property
+    def connectivity(self):
+        """
+        Returns None, since a frozen graph does not track its connectivity.
+        """
+
+        return None
+
+    @property
+    def version(self):
+        """
+        Returns the version of the graph (see Graph.version), which never
+        changes, since the graph is frozen.
+        """
+
+        return self._version
+
+    @property
+    def edge_count(self):
+        return len(self._targets)
+
+    def index(self, node):
+        """
+        Returns the index of the given node.
+
+        @type  node: node
+        @param node: The node identifier.
+        @rtype: int
+        """
+
+        if self._node_index is None:
+            if node not in self._nodes:
+                raise KeyError(node)
+
+            return self._nodes.index(node)
+
+        return self._node_index[node]
+
+    def node(self, index):
+        """
+        Returns the node identifier with the given index.
+
+        @type  index: int
+        @param index: The node index.
+        @rtype: node
+        """
+
+        return self._nodes[index]
+
+    def nodes(self):
+        """
+        Returns a view of all nodes in the graph.
+
+        @rtype: dict_keys or range
+        """
+
+        if self._node_index is None:
+            return self._nodes
+
+        return self._node_index.keys()
+
+    def neighbors(self, node):
+        """
+        Returns a list of nodes directly accessible from the given node.
+
+        @type  node: node
+        @param node: The node identifier.
+        @rtype: list
+        """
+
+        i = self.index(node)
+        nodes = self._nodes
+
+        return [nodes[j] for j in
+                self._targets[self._offsets[i]:self._offsets[i + 1]]]
+
+    def weighted_neighbors(self, node):
+        """
+        Returns an iterator of the (neighbor, weight) pairs of the edges
+        leaving the given node, read from its offset range.
+
+        @type  node: node
+        @param node: The node identifier.
+        @rtype: iterator
+        """
+
+        i = self.index(node)
+        start = self._offsets[i]
+        end = self._offsets[i + 1]
+
+        return zip(map(self._nodes.__getitem__, self._targets[start:end]),
+                   self._weights[start:end])
+
+    def interned(self):
+        """
+        Returns the node identifiers ordered by their indices and the rows
+        of neighbor indices and edge weights of every node index, in the
+        same format as Graph.interned(). The rows are views (see
+        CSRRowsView) that slice a row of the buffers whenever it is
+        accessed, so the buffers stay the only copy of the edges.
+
+        @rtype: tuple
+        """
+
+        return (self._nodes,
+                CSRRowsView(self._offsets, self._targets),
+                CSRRowsView(self._offsets, self._weights))
+
+    def edges(self):
+        """
+        Returns a view of all edges in the graph.
+
+        @rtype: CSREdgesView
+        """
+
+        return CSREdgesView(self)
+
+    def weighted_edges(self):
+        """
+        Returns an iterator of the (u, v, weight) triples of all edges in
+        the order of edges().
+
+        @rtype: iterator
+        """
+
+        nodes = self._nodes
+        offsets = self._offsets
+        sources = itertools.chain.from_iterable(
+                        itertools.repeat(nodes[i], offsets[i + 1] - offsets[i])
+                        for i in range(len(nodes)))
+
+        return zip(sources,
+                   map(nodes.__getitem__, self._targets),
+                   self._weights)
+
+    def weight(self, edge):
+        """
+        Returns the weight associated with the edge (which is a tuple of two
+        nodes (u, v)).
+
+        @type  edge: tuple
+        @param edge: The tuple of two nodes (u, v)
+        @rtype: number
+        """
+
+        u, v = edge
+        i = self.index(u)
+        j = self.index(v)
+        start = self._offsets[i]
+        end = self._offsets[i + 1]
+        try:
+            if isinstance(self._targets, memoryview):
+                # a view of a shared or mapped buffer has no index()
+                position = start + self._targets[start:end].tolist().index(j)
+            else:
+                position = self._targets.index(j, start, end)
+        except ValueError:
+            raise KeyError(edge)
+
+        return self._weights[position]
+
+    def has_node(self, node):
+        """
+        Returns whether the requested node exists.
+
+        @type  node: node
+        @param node: The node identifier.
+        @rtype: boolean
+        """
+
+        if self._node_index is None:
+            return node in self._nodes
+
+        return node in self._node_index
+
+class CSRRowsView:
+    """
+    Represents a lazy read-only sequence of the rows of a CSR buffer (the
+    targets or the weights), where the row i is the slice between
+    offsets[i] and offsets[i + 1]. The slices are made on every access and
+    never kept, and the slices of a memoryview do not copy the buffer.
+    """
+
+    def __init__(self, offsets, values):
+        self._offsets = offsets
+        self._values = values
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if not (0 <= i < len(self._offsets) - 1):
+            raise IndexError(i)
+
+        return self._values[self._offsets[i]:self._offsets[i + 1]]
+
+    def __iter__(self):
+        offsets = self._offsets
+        values = self._values
+        for i in range(len(offsets) - 1):
+            yield values[offsets[i]:offsets[i + 1]]
+
+class CSREdgesView:
+    """
+    Represents a lazy view of the (u, v) edges of a CSR graph.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __len__(self):
+        return self._graph.edge_count
+
+    def __iter__(self):
+        graph = self._graph
+        offsets = graph.offsets
+        targets = graph.targets
+        for i in range(graph.node_count):
+            node = graph.node(i)
+            for position in range(offsets[i], offsets[i + 1]):
+                yield (node, graph.node(targets[position]))
+
+    def __contains__(self, edge):
+        try:
+            self._graph.weight(edge)
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        return True
+
+class Dendrogram:
+    """
+    Represents the single-linkage dendrogram of a graph: the sequence of
+    merges Kruskal's algorithm makes while it joins the clusters (connected
+    components) by the next lightest edge, starting with every node in a
+    cluster of its own.
+
+    After the first n - k merges, there are k clusters, and the weight of the
+    next merge is their spacing, that is, the smallest weight of an edge
+    between two different clusters. Thus, the clusters and the spacing for
+    every k are available from the same precomputed merges.
+    """
+
+    def __init__(self, nodes, merges):
+        """
+        Initializes a dendrogram.
+
+        @type  nodes: list
+        @param nodes: The nodes of the graph.
+        @type  merges: list
+        @param merges: The (weight, u, v) edges accepted by Kruskal's
+                       algorithm in their order.
+        """
+
+        self._nodes = nodes
+        self._merges = merges
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def merges(self):
+        return self._merges
+
+    @property
+    def minimum_cluster_count(self):
+        """
+        Returns the number of clusters left after all merges, which is the
+        number of connected components of the graph.
+        """
+
+        return len(self._nodes) - len(self._merges)
+
+    def _check_cluster_count(self, k):
+        if not (1 <= k <= len(self._nodes)):
+            raise ValueError('Must be 1 <= k <= |V|.')
+
+        if k < self.minimum_cluster_count:
+            message = 'Could not form k clusters. Got {} clusters.'
+            raise ValueError(message.format(self.minimum_cluster_count))
+
+    def _union_find(self, merge_count):
+        node_index = {}
+        for i, node in enumerate(self._nodes):
+            node_index[node] = i
+
+        set = union_find.ArrayUnionFind(len(self._nodes))
+        set.union_many((node_index[u], node_index[v])
+                       for weight, u, v in self._merges[:merge_count])
+
+        return set, node_index
+
+    def linkage(self):
+        """
+        Returns the merges as (left, right, weight, size) tuples, where the
+        nodes are the clusters 0, 1, ..., n - 1 (in the order of the nodes),
+        the i-th merge creates the cluster n + i, left and right are the
+        merged clusters and size is the number of nodes in the new cluster.
+        """
+
+        set, node_index = self._union_find(0)
+
+        # the cluster id of every root
+        cluster_ids = [x for x in range(len(self._nodes))]
+
+        result = []
+        for i, (weight, u, v) in enumerate(self._merges):
+            u_root = set.find(node_index[u])
+            v_root = set.find(node_index[v])
+            size = set.component_size(u_root) + set.component_size(v_root)
+            result.append((cluster_ids[u_root],
+                           cluster_ids[v_root],
+                           weight,
+                           size))
+
+            set.union(u_root, v_root)
+            cluster_ids[set.find(u_root)] = len(self._nodes) + i
+
+        return result
+
+    def spacing(self, k):
+        """
+        Returns the spacing of k clusters, that is, the smallest weight of an
+        edge between two different clusters, or None if there is no such
+        edge.
+        """
+
+        self._check_cluster_count(k)
+
+        merge_count = len(self._nodes) - k
+        if merge_count < len(self._merges):
+            return self._merges[merge_count][0]
+
+        return None
+
+    def labels(self, k):
+        """
+        Returns a dictionary that maps every node to the number of its
+        cluster (0, 1, ..., k - 1, numbered in the order of the nodes) when
+        there are k clusters.
+        """
+
+        self._check_cluster_count(k)
+
+        set, node_index = self._union_find(len(self._nodes) - k)
+
+        root_labels = {}
+        labels = {}
+        roots = set.find_many(range(len(self._nodes)))
+        for node, root in zip(self._nodes, roots):
+            if root not in root_labels:
+                root_labels[root] = len(root_labels)
+            labels[node] = root_labels[root]
+
+        return labels
+
+    def clusters(self, k):
+        """
+        Returns the list of the k clusters, every one a list of nodes.
+        """
+
+        clusters = [[] for i in range(k)]
+        for node, label in self.labels(k).items():
+            clusters[label].append(node)
+
+        return clusters
+
+class ShortestPathTreeCache:
+    """
+    Represents a bounded least recently used cache of shortest path trees,
+    that is, of the (distance_map, predecessor_map) results of the
+    single-source algorithms of GraphUtil, keyed by the version of the
+    graph, the source and the algorithm.
+
+    Since every change of a graph gives it a version no graph has had before
+    (see Graph.version), the trees of the earlier versions are never found
+    again and simply age out, so one cache can serve several graphs.
+
+    The cache evicts the least recently used trees while it holds more than
+    maximum_size trees or their estimated size exceeds the memory budget.
+    """
+
+    # the default memory budget in bytes
+    DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET, maximum_size=None):
+        """
+        Initializes an empty cache.
+
+        @type  memory_budget: number
+        @param memory_budget: The largest estimated size of the cached trees
+                              in bytes.
+        @type  maximum_size: number
+        @param maximum_size: The largest number of cached trees or None.
+        """
+
+        if memory_budget < 0:
+            raise ValueError('Must be memory_budget >= 0.')
+        if maximum_size is not None and maximum_size < 0:
+            raise ValueError('Must be maximum_size >= 0.')
+
+        self._memory_budget = memory_budget
+        self._maximum_size = maximum_size
+        # the (result, size) pairs from the least to the most recently used
+        self._trees = collections.OrderedDict()
+        self._memory_size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __repr__(self):
+        return ('[size=' + str(self.size) + ', memory_size=' +
+                str(self.memory_size) + ', hits=' + str(self.hits) +
+                ', misses=' + str(self.misses) + ']')
+
+    @property
+    def memory_budget(self):
+        return self._memory_budget
+
+    @property
+    def maximum_size(self):
+        return self._maximum_size
+
+    @property
+    def size(self):
+        return len(self._trees)
+
+    @property
+    def memory_size(self):
+        """
+        Returns the estimated size of the cached trees in bytes.
+        """
+
+        return self._memory_size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @staticmethod
+    def _size(result):
+        """
+        Estimates the size of the given tree in bytes: its maps and the
+        distances, which are mostly numbers of their own, but not the nodes
+        the maps share with the graph.
+        """
+
+        distance_map, predecessor_map = result
+
+        return (sys.getsizeof(distance_map) +
+                sys.getsizeof(predecessor_map) +
+                sum(sys.getsizeof(x) for x in distance_map.values()))
+
+    def contains(self, version, source, algorithm):
+        return (version, source, algorithm) in self._trees
+
+    def get(self, version, source, algorithm):
+        """
+        Returns the cached tree or None.
+
+        @attention: The cached maps are shared by all callers, so they must
+                    not be modified.
+        """
+
+        key = (version, source, algorithm)
+        if key not in self._trees:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._trees.move_to_end(key)
+
+        return self._trees[key][0]
+
+    def put(self, version, source, algorithm, result):
+        """
+        Caches the given tree as the most recently used one unless the tree
+        alone exceeds the memory budget.
+        """
+
+        key = (version, source, algorithm)
+        if key in self._trees:
+            self._memory_size -= self._trees.pop(key)[1]
+
+        size = self._size(result)
+        if size > self._memory_budget:
+            return
+
+        self._trees[key] = (result, size)
+        self._memory_size += size
+
+        while (self._memory_size > self._memory_budget or
+               (self._maximum_size is not None and
+                len(self._trees) > self._maximum_size)):
+            self._memory_size -= self._trees.popitem(last=False)[1][1]
+
+    def clear(self):
+        self._trees.clear()
+        self._memory_size = 0
+
+class AlgorithmStats:
+    """
+    Represents the work one call of an algorithm of InstrumentedGraphUtil
+    did: the counters of its hot-path operations and the wall-clock seconds
+    of its phases.
+
+    The counters are settled (nodes taken out of the frontier or the
+    priority queue for good), relaxed (edges relaxed), successful_relaxations
+    (relaxations that improved a distance), the heap_* counters of the
+    instrumented priority queues (see heap._InstrumentedQueue), dfs_pushes
+    (nodes pushed on the Depth First stack) and the finds, find_depth and
+    maximum_find_depth of the instrumented union-find. An algorithm only has
+    the counters of the operations it performs.
+
+    The phase 'total' covers the whole call. The other phases (such as
+    'queue_selection', 'sort', 'reverse' and 'maps') cover parts of it.
+    """
+
+    def __init__(self, algorithm):
+        self._algorithm = algorithm
+        self._counters = collections.Counter()
+        self._phase_seconds = {}
+
+    def __repr__(self):
+        return ('[algorithm=' + str(self.algorithm) + ', counters=' +
+                str(dict(self.counters)) + ', phase_seconds=' +
+                str(self.phase_seconds) + ']')
+
+    @property
+    def algorithm(self):
+        return self._algorithm
+
+    @property
+    def counters(self):
+        return self._counters
+
+    @property
+    def phase_seconds(self):
+        return self._phase_seconds
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Adds the wall-clock time of the enclosed block to the given phase.
+        """
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phase_seconds[name] = (self._phase_seconds.get(name, 0) +
+                                         time.perf_counter() - start_time)
+
+    def as_dict(self):
+        """
+        Returns the stats as a JSON-serializable dictionary, for example for
+        the benchmarks or a log.
+        """
+
+        return {
+            'algorithm': self.algorithm,
+            'counters': dict(self.counters),
+            'phase_seconds': dict(self.phase_seconds),
+        }
+
+class GraphUtil:
+
+    # the thresholds of the direction-optimizing Breadth First Search: it
+    # goes bottom-up when the frontier has more than 1/ALPHA of the
+    # unexplored edges and back top-down when the frontier has less than
+    # 1/BETA of the nodes
+    BOTTOM_UP_ALPHA = 14
+    BOTTOM_UP_BETA = 24
+
+    # the largest maximum edge weight for which the Dijkstra's and Prim's
+    # algorithms pick the Dial's bucket queue automatically (its extract
+    # scans up to that many empty buckets)
+    BUCKET_QUEUE_WEIGHT_LIMIT = 1000
+
+    # the single-source algorithms multi_source runs, all of which are
+    # called as method(graph, source)
+    MULTI_SOURCE_ALGORITHMS = [ 'component',
+                                'shortest_path_tree',
+                                'dijkstra_shortest_paths',
+                                'bellman_ford_shortest_paths',
+                                'spfa_shortest_paths' ]
+
+    def __init__(self, shortest_path_cache=None):
+        """
+        Initializes a GraphUtil.
+
+        @type  shortest_path_cache: ShortestPathTreeCache
+        @param shortest_path_cache: The cache of the trees of
+                                    dijkstra_shortest_paths and
+                                    shortest_path_tree or None.
+        """
+
+        self.visit_number = None
+        self.preorder = collections.OrderedDict()
+        self.postorder = collections.OrderedDict()
+        self.component_id = {}
+        self.shortest_path_cache = shortest_path_cache
+        # the (version, reversed graph) of the last graph shortest_path
+        # reversed
+        self._reverse_graph = None
+
+    def _previsit_number(self, node):
+        self.preorder[node] = self.visit_number
+        self.visit_number += 1
+
+    def _postvisit_number(self, node):
+        self.postorder[node] = self.visit_number
+        self.visit_number += 1
+
+    def _previsit_component_number(self, node):
+        self.component_id[node] = self.component_number
+
+    def _postvisit_toposort(self, node):
+        self.order.append(node)
+
+    def _reverse(self, graph):
+        reverse_graph = Graph()
+        for node in graph.nodes():
+            reverse_graph.add_node(node)
+        for node in graph.nodes():
+            for neighbor, weight in graph.weighted_neighbors(node):
+                reverse_graph.add_directed_edge(neighbor, node, weight)
+
+        return reverse_graph
+
+    def _cached_reverse(self, graph):
+        """
+        Returns the reversed graph, which is only rebuilt when the version
+        of the graph differs from that of the last reversed graph.
+        """
+
+        if (self._reverse_graph is None or
+            self._reverse_graph[0] != graph.version):
+            self._reverse_graph = (graph.version, self._reverse(graph))
+
+        return self._reverse_graph[1]
+
+    def _explore(self,
+                 graph,
+                 node,
+                 visited,
+                 previsit=None,
+                 postvisit=None,
+                 excluded=None):
+        """
+        Explores the graph in the Depth First order with an explicit stack
+        of (node, neighbor iterator) frames instead of recursion, so that
+        the depth of the search is not limited by the interpreter's stack.
+
+        The previsit and postvisit hooks are fired in the same order as in
+        the recursive formulation.
+        """
+
+        nodes = graph.nodes()
+
+        visited.add(node)
+
+        if previsit is not None:
+            previsit(node)
+
+        if node in nodes:
+            stack = [ (node, iter(graph.neighbors(node))) ]
+        else:
+            stack = [ (node, iter(())) ]
+
+        while stack:
+            current, neighbors = stack[-1]
+
+            for neighbor in neighbors:
+                if neighbor not in visited:
+                    if excluded is not None and neighbor in excluded:
+                        continue
+
+                    visited.add(neighbor)
+
+                    if previsit is not None:
+                        previsit(neighbor)
+
+                    if neighbor in nodes:
+                        stack.append((neighbor,
+                                      iter(graph.neighbors(neighbor))))
+                    else:
+                        stack.append((neighbor, iter(())))
+                    break
+            else:
+                stack.pop()
+
+                if postvisit is not None:
+                    postvisit(current)
+
+    def _tarjan(self, graph):
+        """
+        Labels every node with the number of its strongly connected
+        component in one iterative pass of Tarjan's algorithm.
+
+        The components are numbered in the order they are completed, which
+        is a reverse topological order of the condensation.
+
+        Returns the list of nodes, the array of component numbers indexed
+        like the list of nodes and the number of components.
+        """
+
+        nodes = [x for x in graph.nodes()]
+        node_index = {}
+        for i, node in enumerate(nodes):
+            node_index[node] = i
+
+        node_count = len(nodes)
+        discovery = array.array('l', [-1]) * node_count
+        lowlink = array.array('l', [0]) * node_count
+        component = array.array('l', [-1]) * node_count
+        on_stack = bytearray(node_count)
+        stack = []
+        clock = 0
+        component_count = 0
+
+        for root in range(node_count):
+            if discovery[root] != -1:
+                continue
+
+            discovery[root] = lowlink[root] = clock
+            clock += 1
+            stack.append(root)
+            on_stack[root] = 1
+            call_stack = [ (root, iter(graph.neighbors(nodes[root]))) ]
+
+            while call_stack:
+                v, neighbors = call_stack[-1]
+
+                for neighbor in neighbors:
+                    w = node_index[neighbor]
+                    if discovery[w] == -1:
+                        discovery[w] = lowlink[w] = clock
+                        clock += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        call_stack.append((w, iter(graph.neighbors(neighbor))))
+                        break
+                    elif on_stack[w] and discovery[w] < lowlink[v]:
+                        lowlink[v] = discovery[w]
+                else:
+                    call_stack.pop()
+
+                    if call_stack:
+                        u = call_stack[-1][0]
+                        if lowlink[v] < lowlink[u]:
+                            lowlink[u] = lowlink[v]
+
+                    if lowlink[v] == discovery[v]:
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = 0
+                            component[w] = component_count
+                            if w == v:
+                                break
+                        component_count += 1
+
+        return nodes, component, component_count
+
+    def _reverse_index_neighbors(self, index_neighbors):
+        index_predecessors = [[] for x in index_neighbors]
+        for u, neighbors in enumerate(index_neighbors):
+            for v in neighbors:
+                index_predecessors[v].append(u)
+
+        return index_predecessors
+
+    def _frontier_bfs(self,
+                      index_neighbors,
+                      sources,
+                      levels,
+                      parents,
+                      visited,
+                      index_predecessors=None):
+        """
+        Explores the interned graph in the Breadth First order one frontier
+        (one level) at a time from all given source indices at once, so the
+        level of every reached node is its distance to the nearest source.
+
+        Writes into the given buffers: the levels and the parents (-1 for
+        the sources) of the reached nodes and their flags in the visited
+        bytearray. Already visited nodes are neither sources nor reached
+        again, so the buffers can be shared by several searches.
+
+        With the reversed adjacency lists, switches between the top-down
+        steps (the frontier scans its out-edges) and the bottom-up steps
+        (every unvisited node scans its in-edges for a frontier node), which
+        pay off while the frontier covers a large part of the graph.
+        """
+
+        node_count = len(index_neighbors)
+
+        frontier = []
+        for s in sources:
+            if not visited[s]:
+                visited[s] = 1
+                levels[s] = 0
+                frontier.append(s)
+
+        unexplored_edge_count = 0
+        if index_predecessors is not None:
+            for neighbors in index_neighbors:
+                unexplored_edge_count += len(neighbors)
+
+        top_down = True
+        level = 0
+        while frontier:
+            level += 1
+
+            if index_predecessors is not None:
+                frontier_edge_count = 0
+                for u in frontier:
+                    frontier_edge_count += len(index_neighbors[u])
+
+                if (top_down and frontier_edge_count >
+                    unexplored_edge_count / self.BOTTOM_UP_ALPHA):
+                    top_down = False
+                elif (not top_down and
+                      len(frontier) < node_count / self.BOTTOM_UP_BETA):
+                    top_down = True
+
+                unexplored_edge_count -= frontier_edge_count
+
+            next_frontier = []
+            if top_down:
+                for u in frontier:
+                    for v in index_neighbors[u]:
+                        if not visited[v]:
+                            visited[v] = 1
+                            levels[v] = level
+                            parents[v] = u
+                            next_frontier.append(v)
+            else:
+                # a visited predecessor of an unvisited node was visited by
+                # this search (any earlier search would have reached the
+                # node), so its level tells if it is in the frontier
+                for v in range(node_count):
+                    if not visited[v]:
+                        for u in index_predecessors[v]:
+                            if levels[u] == level - 1:
+                                visited[v] = 1
+                                levels[v] = level
+                                parents[v] = u
+                                next_frontier.append(v)
+                                break
+
+            frontier = next_frontier
+
+    def _create_distance_and_previous_maps(self, graph):
+        distance_map = {}
+        predecessor_map = {}
+        for node in graph.nodes():
+            distance_map[node] = math.inf
+            predecessor_map[node] = None
+
+        return distance_map, predecessor_map
+
+    def _relax(self, distance_map, predecessor_map, u, v, weight):
+        edge_distance = distance_map[u] + weight
+        if distance_map[v] > edge_distance:
+            distance_map[v] = edge_distance
+            predecessor_map[v] = u
+
+            return True
+
+        return False
+
+    def _index_maps(self, nodes, distances, predecessors):
+        """
+        Translates the distances and the predecessor indices computed on the
+        interned graph back into the maps keyed by node identifiers.
+        """
+
+        distance_map = {}
+        predecessor_map = {}
+        for i, node in enumerate(nodes):
+            distance_map[node] = distances[i]
+            if predecessors[i] == -1:
+                predecessor_map[node] = None
+            else:
+                predecessor_map[node] = nodes[predecessors[i]]
+
+        return distance_map, predecessor_map
+
+    def _cached_tree(self, graph, start, algorithm, compute):
+        """
+        Returns the tree of the given algorithm from the start node, taken
+        from the shortest path cache if possible and computed with compute()
+        (and cached) otherwise.
+        """
+
+        cache = self.shortest_path_cache
+        if cache is None:
+            return compute()
+
+        result = cache.get(graph.version, start, algorithm)
+        if result is None:
+            result = compute()
+            cache.put(graph.version, start, algorithm, result)
+
+        return result
+
+    def _shortest_path_tree(self, graph, start):
+        nodes = graph.interned()[0]
+
+        levels, parents = self.breadth_first_search(graph, [ start ])
+
+        distances = [math.inf if x == -1 else x for x in levels]
+
+        return self._index_maps(nodes, distances, parents)
+
+    def _dijkstra_shortest_paths(self, graph, start, queue):
+        nodes, index_neighbors, index_weights = graph.interned()
+
+        distances = [math.inf] * len(nodes)
+        predecessors = [-1] * len(nodes)
+
+        source = graph.index(start)
+        distances[source] = 0
+
+        priority_queue = self._priority_queue(index_weights,
+                                              queue,
+                                              monotone=True)
+        priority_queue.insert(heap.HeapItem(0, source))
+
+        while priority_queue.size > 0:
+            min_item = priority_queue.extract()
+            u = min_item.datum
+            for v, weight in zip(index_neighbors[u], index_weights[u]):
+                distance = min_item.priority + weight
+                if distances[v] > distance:
+                    distances[v] = distance
+                    predecessors[v] = u
+                    if priority_queue.contains(v):
+                        priority_queue.decrease_key(v, distance)
+                    else:
+                        priority_queue.insert(heap.HeapItem(distance, v))
+
+        return self._index_maps(nodes, distances, predecessors)
+
+    @staticmethod
+    def _maximum_integer_weight(index_weights):
+        """
+        Returns the largest edge weight when all weights are non-negative
+        integers and None otherwise.
+        """
+
+        maximum_weight = 0
+        for weights in index_weights:
+            for weight in weights:
+                if not isinstance(weight, int) or weight < 0:
+                    return None
+                if weight > maximum_weight:
+                    maximum_weight = weight
+
+        return maximum_weight
+
+    def _priority_queue(self, index_weights, queue, monotone):
+        """
+        Creates the min priority queue of node indices for a search over
+        edges with the given weights.
+
+        The queue is 'binary' (the indexed binary heap, which supports any
+        weights), 'bucket' (the Dial's bucket queue for integer weights) or
+        'radix' (the radix heap for integer weights, which requires monotone
+        priorities, as in the Dijkstra's algorithm but unlike in the Prim's
+        one). None picks the bucket queue for small integer weights, the
+        radix heap for large ones when the priorities are monotone and the
+        binary heap otherwise.
+        """
+
+        if queue not in [ None, 'binary', 'bucket', 'radix' ]:
+            raise ValueError('Unknown queue: {}.'.format(queue))
+
+        if queue == 'binary':
+            return self._create_queue('binary')
+
+        if queue == 'radix' and not monotone:
+            raise ValueError('The radix heap requires monotone priorities.')
+
+        maximum_weight = self._maximum_integer_weight(index_weights)
+        if maximum_weight is None:
+            if queue is not None:
+                message = 'The {} queue requires non-negative integer weights.'
+                raise ValueError(message.format(queue))
+
+            return self._create_queue('binary')
+
+        if queue is None:
+            if maximum_weight <= self.BUCKET_QUEUE_WEIGHT_LIMIT:
+                queue = 'bucket'
+            elif monotone:
+                queue = 'radix'
+            else:
+                return self._create_queue('binary')
+
+        return self._create_queue(queue, maximum_weight)
+
+    def _create_queue(self, queue, maximum_weight=None):
+        if queue == 'binary':
+            return heap.IndexedBinHeap(heap.HeapMode.min)
+        elif queue == 'bucket':
+            return heap.BucketQueue(maximum_weight)
+
+        return heap.RadixHeap()
+
+    def _create_union_find(self, n):
+        return union_find.ArrayUnionFind(n)
+
+    def _bidirectional_dijkstra(self, graph, reverse_graph, source, target):
+        graphs = [ graph, reverse_graph ]
+        distance_maps = [ { source: 0 }, { target: 0 } ]
+        predecessor_maps = [ { source: None }, { target: None } ]
+        priority_queues = [ heap.IndexedBinHeap(heap.HeapMode.min),
+                            heap.IndexedBinHeap(heap.HeapMode.min) ]
+        priority_queues[0].insert(heap.HeapItem(0, source))
+        priority_queues[1].insert(heap.HeapItem(0, target))
+
+        best_distance = math.inf
+        meeting_node = None
+        while priority_queues[0].size > 0 and priority_queues[1].size > 0:
+            # no path through the unsettled nodes can be shorter
+            if (priority_queues[0].elements[0].priority +
+                priority_queues[1].elements[0].priority >= best_distance):
+                break
+
+            # expands the smaller frontier
+            if priority_queues[0].size <= priority_queues[1].size:
+                side = 0
+            else:
+                side = 1
+            search_graph = graphs[side]
+            distance_map = distance_maps[side]
+            predecessor_map = predecessor_maps[side]
+            other_distance_map = distance_maps[1 - side]
+            priority_queue = priority_queues[side]
+
+            node = priority_queue.extract().datum
+            for neighbor, weight in search_graph.weighted_neighbors(node):
+                edge_distance = distance_map[node] + weight
+                if (neighbor not in distance_map or
+                    distance_map[neighbor] > edge_distance):
+                    distance_map[neighbor] = edge_distance
+                    predecessor_map[neighbor] = node
+                    if priority_queue.contains(neighbor):
+                        priority_queue.decrease_key(neighbor, edge_distance)
+                    else:
+                        priority_queue.insert(heap.HeapItem(edge_distance,
+                                                            neighbor))
+
+                if neighbor in other_distance_map:
+                    distance = (distance_map[neighbor] +
+                                other_distance_map[neighbor])
+                    if distance < best_distance:
+                        best_distance = distance
+                        meeting_node = neighbor
+
+        if meeting_node is None:
+            return math.inf, []
+
+        path = self.reconstruct_shortest_path(source,
+                                              meeting_node,
+                                              predecessor_maps[0])
+        node = predecessor_maps[1][meeting_node]
+        while node is not None:
+            path.append(node)
+            node = predecessor_maps[1][node]
+
+        return best_distance, path
+
+    def _a_star(self, graph, source, target, heuristic):
+        distance_map = { source: 0 }
+        predecessor_map = { source: None }
+
+        priority_queue = heap.IndexedBinHeap(heap.HeapMode.min)
+        priority_queue.insert(heap.HeapItem(heuristic(source, target), source))
+
+        while priority_queue.size > 0:
+            node = priority_queue.extract().datum
+            if node == target:
+                return (distance_map[target],
+                        self.reconstruct_shortest_path(source,
+                                                       target,
+                                                       predecessor_map))
+
+            for neighbor, weight in graph.weighted_neighbors(node):
+                edge_distance = distance_map[node] + weight
+                if (neighbor not in distance_map or
+                    distance_map[neighbor] > edge_distance):
+                    distance_map[neighbor] = edge_distance
+                    predecessor_map[neighbor] = node
+                    estimate = edge_distance + heuristic(neighbor, target)
+                    if priority_queue.contains(neighbor):
+                        priority_queue.decrease_key(neighbor, estimate)
+                    else:
+                        # an inadmissible heuristic may reopen a node
+                        priority_queue.insert(heap.HeapItem(estimate,
+                                                            neighbor))
+
+        return math.inf, []
+
+    def _predecessor_cycle(self, predecessor_map, nodes, excluded):
+        """
+        Walks the predecessor map from every given node and returns the
+        first cycle met, in the order of its edges, or an empty list.
+
+        Nodes visited by an earlier walk end a walk, so the whole check takes
+        time linear in the number of walked nodes.
+        """
+
+        walk_ids = {}
+        for walk_id, node in enumerate(nodes):
+            while (node is not None and
+                   node not in walk_ids and
+                   node not in excluded):
+                walk_ids[node] = walk_id
+                node = predecessor_map[node]
+
+            if node is not None and walk_ids.get(node) == walk_id:
+                cycle = [ node ]
+                predecessor = predecessor_map[node]
+                while predecessor != node:
+                    cycle.append(predecessor)
+                    predecessor = predecessor_map[predecessor]
+                cycle.reverse()
+
+                return cycle
+
+        return []
+
+    def _dense_prim(self, points):
+        xs = [x for x, y in points]
+        ys = [y for x, y in points]
+        best_distances = [math.inf] * len(points)
+        parents = [-1] * len(points)
+
+        edges = []
+        current = 0
+        remaining = [x for x in range(1, len(points))]
+        while len(remaining) > 0:
+            current_x = xs[current]
+            current_y = ys[current]
+            closest_position = -1
+            closest_distance = math.inf
+            for position, i in enumerate(remaining):
+                dx = xs[i] - current_x
+                dy = ys[i] - current_y
+                distance = math.sqrt(dx * dx + dy * dy)
+                if distance < best_distances[i]:
+                    best_distances[i] = distance
+                    parents[i] = current
+                if best_distances[i] < closest_distance:
+                    closest_distance = best_distances[i]
+                    closest_position = position
+
+            current = remaining[closest_position]
+            remaining[closest_position] = remaining[-1]
+            remaining.pop()
+            edges.append((parents[current], current, closest_distance))
+
+        return edges
+
+    def _dense_prim_vectorized(self, points):
+        coordinates = numpy.asarray(points, dtype=float)
+        xs = coordinates[:, 0]
+        ys = coordinates[:, 1]
+        best_distances = numpy.full(len(points), numpy.inf)
+        parents = numpy.full(len(points), -1)
+        in_tree = numpy.zeros(len(points), dtype=bool)
+
+        edges = []
+        current = 0
+        in_tree[current] = True
+        for k in range(len(points) - 1):
+            dx = xs - xs[current]
+            dy = ys - ys[current]
+            distances = numpy.sqrt(dx * dx + dy * dy)
+            closer = (distances < best_distances) & ~in_tree
+            best_distances[closer] = distances[closer]
+            parents[closer] = current
+
+            current = int(numpy.where(in_tree,
+                                      numpy.inf,
+                                      best_distances).argmin())
+            in_tree[current] = True
+            edges.append((int(parents[current]),
+                          current,
+                          float(best_distances[current])))
+
+        return edges
+
+    def _sorted_edge_order(self, weights):
+        """
+        Returns the positions of the given edge weights in the stable
+        ascending order of the weights.
+        """
+
+        if numpy is not None and len(weights) > 0:
+            return numpy.argsort(numpy.asarray(weights),
+                                 kind='stable').tolist()
+
+        return sorted(range(len(weights)), key=weights.__getitem__)
+
+    def _edge_arrays(self, graph):
+        """
+        Returns the node indices of the sources and the targets and the
+        weights of all edges of the interned graph as parallel sequences.
+        """
+
+        nodes, index_neighbors, index_weights = graph.interned()
+
+        sources = array.array('i')
+        targets = array.array('i')
+        weights = []
+        for u in range(len(nodes)):
+            sources.extend([u] * len(index_neighbors[u]))
+            targets.extend(index_neighbors[u])
+            weights.extend(index_weights[u])
+
+        return sources, targets, weights
+
+    def _kruskal_indices(self, graph):
+        """
+        Runs Kruskal's algorithm over the edge array of the interned graph
+        sorted once by weight and stops as soon as |V| - 1 edges (a spanning
+        tree) have been accepted.
+
+        Returns the node indices and the weights of the accepted edges as
+        parallel sequences in the order they were accepted.
+        """
+
+        nodes = graph.interned()[0]
+        sources, targets, weights = self._edge_arrays(graph)
+
+        tree_sources = array.array('i')
+        tree_targets = array.array('i')
+        tree_weights = []
+
+        set = self._create_union_find(len(nodes))
+
+        # a spanning forest has at most |V| - 1 edges
+        maximum_edge_count = len(nodes) - 1
+        for position in self._sorted_edge_order(weights):
+            if len(tree_weights) >= maximum_edge_count:
+                break
+
+            u = sources[position]
+            v = targets[position]
+            if set.union(u, v):
+                tree_sources.append(u)
+                tree_targets.append(v)
+                tree_weights.append(weights[position])
+
+        return tree_sources, tree_targets, tree_weights
+
+    def _kruskal_merges(self, graph):
+        """
+        Runs Kruskal's algorithm and returns the (weight, u, v) edges it
+        accepts in their order.
+        """
+
+        nodes = graph.interned()[0]
+        sources, targets, weights = self._kruskal_indices(graph)
+
+        return [(weights[i], nodes[sources[i]], nodes[targets[i]])
+                for i in range(len(weights))]
+
+    def _boruvka_phases(self, sources, targets, components):
+        """
+        Yields the positions of the cheapest edges leaving the components of
+        every phase of Borůvka's algorithm. The edges are sorted by weight,
+        so the first edge found for a component is its cheapest one, and
+        the edges inside a component are dropped after every sweep.
+        """
+
+        positions = range(len(sources))
+        while True:
+            labels = components.find_many(range(len(components)))
+
+            cheapest = {}
+            outgoing_positions = []
+            for position in positions:
+                u_label = labels[sources[position]]
+                v_label = labels[targets[position]]
+                if u_label != v_label:
+                    outgoing_positions.append(position)
+                    if u_label not in cheapest:
+                        cheapest[u_label] = position
+                    if v_label not in cheapest:
+                        cheapest[v_label] = position
+
+            if len(cheapest) == 0:
+                return
+
+            positions = outgoing_positions
+            yield sorted(set(cheapest.values()))
+
+    def _boruvka_phases_vectorized(self, sources, targets, components):
+        """
+        Works like _boruvka_phases with one NumPy sweep per phase.
+        """
+
+        node_count = len(components)
+        positions = numpy.arange(len(sources))
+        sources = numpy.asarray(sources, dtype=numpy.int64)
+        targets = numpy.asarray(targets, dtype=numpy.int64)
+        while True:
+            labels = numpy.asarray(
+                            components.find_many(range(node_count)),
+                            dtype=numpy.int64)
+            u_labels = labels[sources]
+            v_labels = labels[targets]
+
+            outgoing = u_labels != v_labels
+            positions = positions[outgoing]
+            sources = sources[outgoing]
+            targets = targets[outgoing]
+            if len(positions) == 0:
+                return
+
+            # the first outgoing edge of every component on either side
+            cheapest = numpy.full(node_count, len(positions))
+            for edge_labels in [ v_labels[outgoing], u_labels[outgoing] ]:
+                edge_labels, first = numpy.unique(edge_labels,
+                                                  return_index=True)
+                cheapest[edge_labels] = numpy.minimum(cheapest[edge_labels],
+                                                      first)
+
+            cheapest = numpy.unique(cheapest[cheapest < len(positions)])
+            yield positions[cheapest].tolist()
+
+    def _boruvka_phases_parallel(self, sources, targets, components, workers):
+        """
+        Works like _boruvka_phases with every sweep split among a pool of
+        worker processes, which view the edge arrays and the component
+        labels in shared memory. The edges inside the components are not
+        dropped, since that would take a sequential pass.
+        """
 
-            return True
+        node_count = len(components)
+        edge_count = len(sources)
+        chunk_size = max(1, -(-edge_count // (4 * workers)))
+        starts = [x for x in range(0, edge_count, chunk_size)]
+        ends = [min(edge_count, x + chunk_size) for x in starts]
+
+        blocks = []
+        labels = None
+        executor = None
+        try:
+            buffers = self._share_buffers(
+                                [ sources,
+                                  targets,
+                                  array.array('i', range(node_count)) ],
+                                blocks)
+            labels = blocks[2].buf[:node_count * sources.itemsize].cast('i')
+
+            executor = concurrent.futures.ProcessPoolExecutor(
+                                        max_workers=workers,
+                                        initializer=_initialize_boruvka_worker,
+                                        initargs=(buffers,))
+
+            while True:
+                labels[:] = array.array(
+                              'i',
+                              components.find_many(range(node_count)))
+
+                cheapest = {}
+                for chunk_cheapest in executor.map(_boruvka_task,
+                                                   starts,
+                                                   ends):
+                    for label, position in chunk_cheapest.items():
+                        if label not in cheapest or position < cheapest[label]:
+                            cheapest[label] = position
+
+                if len(cheapest) == 0:
+                    return
+
+                yield sorted(set(cheapest.values()))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            # the blocks cannot be closed while they are viewed
+            if labels is not None:
+                labels.release()
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def _boruvka_indices(self, graph, workers):
+        """
+        Runs Borůvka's algorithm over the edge array of the interned graph
+        sorted once by weight. Every phase finds the cheapest edge leaving
+        every component in one sweep and contracts the components along
+        these edges with an array union-find, which at least halves the
+        number of components that have outgoing edges, so there are
+        O(log |V|) phases.
+
+        The edges are compared by their positions in the stable order of
+        the weights, which breaks ties the same way in every component (so
+        the cheapest edges never close a cycle) and the same way as
+        Kruskal's algorithm.
+
+        Returns the node indices and the weights of the accepted edges as
+        parallel sequences in the order they were accepted.
+        """
 
-        return False
+        nodes = graph.interned()[0]
+        sources, targets, weights = self._edge_arrays(graph)
+
+        order = self._sorted_edge_order(weights)
+        sources = array.array('i', [sources[x] for x in order])
+        targets = array.array('i', [targets[x] for x in order])
+        weights = [weights[x] for x in order]
+
+        tree_sources = array.array('i')
+        tree_targets = array.array('i')
+        tree_weights = []
+
+        components = self._create_union_find(len(nodes))
+
+        if numpy is not None:
+            phases = self._boruvka_phases_vectorized(sources,
+                                                     targets,
+                                                     components)
+        elif workers is not None and workers > 1:
+            phases = self._boruvka_phases_parallel(sources,
+                                                   targets,
+                                                   components,
+                                                   workers)
+        else:
+            phases = self._boruvka_phases(sources, targets, components)
 
-    def _index_in_priority_queue(self, priority_queue, key):
-        index = None
-        for i, value in enumerate(priority_queue.elements):
-            if value.datum == key:
-                index = i
-                break
+        for positions in phases:
+            for position in positions:
+                u = sources[position]
+                v = targets[position]
+                # two components may pick the same edge
+                if components.union(u, v):
+                    tree_sources.append(u)
+                    tree_targets.append(v)
+                    tree_weights.append(weights[position])
 
-        return index
+        return tree_sources, tree_targets, tree_weights
 
     def component(self, graph, start):
         """
-        Explores every edge leaving every node we have found.
+        Explores every edge leaving every node we have found, unless the
+        graph tracks its connectivity.
         """
 
+        if graph.connectivity is not None and graph.has_node(start):
+            return graph.connectivity.component(start)
+
         discovered = [ start ]
         visited = set()
 
@@ -300,8 +2622,17 @@ class GraphUtil:
         """
         Given a graph and two distinct nodes u and v, checks if
         there is a path between u and v.
+
+        Explores the graph for every query, so many queries against the same
+        graph are better answered by reachability_index.ReachabilityIndex.
+        An undirected graph that tracks its connectivity answers without
+        exploring.
         """
 
+        if (graph.connectivity is not None and
+            graph.has_node(x) and graph.has_node(y)):
+            return graph.connectivity.connected(x, y)
+
         visited = set()
 
         self._explore(graph, x, visited)
@@ -314,6 +2645,9 @@ class GraphUtil:
         connected components in it.
         """
 
+        if graph.connectivity is not None:
+            return graph.connectivity.component_count
+
         component_count = 0
         visited = set()
 
@@ -352,9 +2686,16 @@ class GraphUtil:
         Finds all nodes of G, not just those reachable from some v.
         Numbers nodes by component numbers.
 
-        Performs the search in the Depth First order.
+        Performs the search in the Depth First order, unless the graph
+        tracks its connectivity.
         """
 
+        if graph.connectivity is not None:
+            self.component_id = graph.connectivity.component_numbers()
+
+            return (set(self.component_id),
+                    graph.connectivity.component_count)
+
         self.component_number = 1
 
         visited = set()
@@ -378,6 +2719,9 @@ class GraphUtil:
         If G is a DAG, then, with an edge u to v, post(u) > post(v).
         """
 
+        if isinstance(graph, DirectedAcyclicGraph):
+            return False
+
         self.depth_first_search(graph)
 
         for from_node in graph.nodes():
@@ -401,9 +2745,15 @@ class GraphUtil:
         algorithms are known for constructing a topological ordering of any
         DAG in linear time.
 
-        Performs the search in the Depth First order.
+        Performs the search in the Depth First order, unless the graph is a
+        DirectedAcyclicGraph, which already maintains an ordering.
         """
 
+        if isinstance(graph, DirectedAcyclicGraph):
+            self.order = [x for x in graph.topological_order()]
+
+            return self.order
+
         visited = set()
         self.order = []
 
@@ -414,9 +2764,11 @@ class GraphUtil:
                               visited,
                               postvisit=self._postvisit_toposort)
 
+        self.order.reverse()
+
         return self.order
 
-    def strongly_connected_components(self, graph):
+    def strongly_connected_components(self, graph, algorithm='kosaraju'):
         """
         Definition of Strongly Connected Components:
 
@@ -428,15 +2780,22 @@ class GraphUtil:
         A directed graph can be partitioned into strongly connected components
         where two nodes are connected if and only if they are in the same
         component.
+
+        The algorithm is either 'kosaraju' (two Depth First passes over the
+        graph and its reversed copy) or 'tarjan' (one Depth First pass, see
+        tarjan_strongly_connected_components).
         """
 
+        if algorithm == 'tarjan':
+            return self.tarjan_strongly_connected_components(graph)
+        elif algorithm != 'kosaraju':
+            raise ValueError('Unknown algorithm: {}.'.format(algorithm))
+
         reverse_graph = self._reverse(graph)
 
         self.depth_first_search(reverse_graph)
 
-        nodes_ordered_by_postorder = []
-        for k, v in enumerate(self.postorder):
-            nodes_ordered_by_postorder.insert(0, v)
+        nodes_ordered_by_postorder = [x for x in reversed(self.postorder)]
 
         strongly_connected_components = []
 
@@ -455,33 +2814,171 @@ class GraphUtil:
 
         return strongly_connected_components
 
+    def tarjan_strongly_connected_components(self, graph):
+        """
+        Finds the strongly connected components with Tarjan's algorithm.
+
+        Unlike the Kosaraju-style strongly_connected_components, it makes a
+        single Depth First pass over the graph and keeps integer lowlink
+        arrays instead of materializing the reversed graph.
+
+        The components are returned in a reverse topological order of the
+        condensation, that is, sink components come first.
+        """
+
+        nodes, component, component_count = self._tarjan(graph)
+
+        strongly_connected_components = [[] for i in range(component_count)]
+        for i, node in enumerate(nodes):
+            strongly_connected_components[component[i]].append(node)
+
+        return strongly_connected_components
+
+    def condensation(self, graph):
+        """
+        Builds the condensation of a directed graph: the DAG that has a node
+        for every strongly connected component and an edge between two
+        components whenever an edge of the graph connects their nodes.
+
+        The components are numbered 0, 1, ..., k - 1 in a topological order
+        of the DAG.
+
+        Returns the DAG and the list of components, where the component
+        with the number i is components[i].
+        """
+
+        nodes, component, component_count = self._tarjan(graph)
+
+        # Tarjan's algorithm completes sink components first
+        last = component_count - 1
+
+        strongly_connected_components = [[] for i in range(component_count)]
+        for i, node in enumerate(nodes):
+            strongly_connected_components[last - component[i]].append(node)
+
+        dag = Graph()
+        for i in range(component_count):
+            dag.add_node(i)
+
+        node_index = {}
+        for i, node in enumerate(nodes):
+            node_index[node] = i
+
+        edges = set()
+        for i, node in enumerate(nodes):
+            u = last - component[i]
+            for neighbor in graph.neighbors(node):
+                v = last - component[node_index[neighbor]]
+                if u != v and (u, v) not in edges:
+                    edges.add((u, v))
+                    dag.add_directed_edge(u, v)
+
+        return dag, strongly_connected_components
+
+    def breadth_first_search(self,
+                             graph,
+                             sources,
+                             direction_optimizing=False):
+        """
+        Computes the levels (the number of edges on a shortest path from the
+        nearest source) and the parents in a shortest path tree of all
+        nodes at once, exploring the graph one frontier at a time.
+
+        Returns two arrays indexed by the node indices (see Graph.index()):
+        the levels and the parents, both -1 for the unreachable nodes (and
+        the parents for the sources as well).
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @type  sources: iterable
+        @param sources: The source nodes.
+        @type  direction_optimizing: boolean
+        @param direction_optimizing: Whether to switch to the bottom-up steps
+                                     on large frontiers, which pays off on
+                                     large graphs with a small diameter.
+        @rtype: tuple
+        """
+
+        nodes, index_neighbors, index_weights = graph.interned()
+
+        levels = array.array('l', [-1]) * len(nodes)
+        parents = array.array('l', [-1]) * len(nodes)
+        visited = bytearray(len(nodes))
+
+        index_predecessors = None
+        if direction_optimizing:
+            index_predecessors = self._reverse_index_neighbors(index_neighbors)
+
+        self._frontier_bfs(index_neighbors,
+                           [graph.index(x) for x in sources],
+                           levels,
+                           parents,
+                           visited,
+                           index_predecessors)
+
+        return levels, parents
+
     def shortest_path_tree(self, graph, start):
         """
         Constructs a distance layer tree of the shortest paths from the
         start node.
 
-        Performs the search in the Breadth First order.
+        Performs the search in the Breadth First order. With a shortest path
+        cache, the tree is cached like those of dijkstra_shortest_paths.
         """
 
-        distance_map, predecessor_map = \
-                                  self._create_distance_and_previous_maps(graph)
+        return self._cached_tree(graph,
+                                 start,
+                                 'shortest_path_tree',
+                                 lambda: self._shortest_path_tree(graph,
+                                                                  start))
 
-        distance_map[start] = 0
+    def unweighted_shortest_path(self, graph, source, target):
+        """
+        Returns the number of edges on a shortest path from the source to
+        the target and the path in the format of reconstruct_shortest_path
+        (without the source), or infinity and an empty list if the target is
+        unreachable.
+        """
 
-        queue = []
-        queue.append(start)
+        nodes = graph.interned()[0]
+        target_index = graph.index(target)
 
-        while len(queue) > 0:
-            node = queue.pop(0)
-            for neighbor in graph.neighbors(node):
-                if distance_map[neighbor] == math.inf:
-                    queue.append(neighbor)
-                    distance_map[neighbor] = distance_map[node] + 1
-                    predecessor_map[neighbor] = node
+        levels, parents = self.breadth_first_search(graph, [ source ])
 
-        return distance_map, predecessor_map
+        if levels[target_index] == -1:
+            return math.inf, []
+
+        path = []
+        i = target_index
+        while parents[i] != -1:
+            path.append(nodes[i])
+            i = parents[i]
+        path.reverse()
+
+        return levels[target_index], path
+
+    def reconstruct_shortest_path(self,
+                                  start,
+                                  end,
+                                  predecessor_map=None,
+                                  graph=None):
+        """
+        Returns the path from the start node to the end node (without the
+        start node) along the given predecessor map, or an empty list if the
+        end node is unreachable.
+
+        Without a predecessor map, follows the tree of
+        dijkstra_shortest_paths from the start node in the given graph,
+        which is taken from the shortest path cache if it has one.
+        """
+
+        if predecessor_map is None:
+            if graph is None:
+                raise ValueError('Expected a predecessor map or a graph.')
+
+            predecessor_map = self.dijkstra_shortest_paths(graph, start)[1]
 
-    def reconstruct_shortest_path(self, start, end, predecessor_map):
         result = []
 
         node = end
@@ -506,63 +3003,144 @@ class GraphUtil:
         Performs the traversal in the Breadth First order.
         """
 
-        if len(graph.nodes()) == 0:
-            return True
+        return self.two_coloring(graph) is not None
 
-        start = next(iter(graph.nodes()))
+    def two_coloring(self, graph):
+        """
+        Returns a dictionary that maps every node to its color (0 or 1), so
+        that no edge connects two nodes of the same color, or None if the
+        graph is not bipartite.
 
-        color = {}
-        for node in graph.nodes():
-            color[node] = None
+        Colors every component by the parity of the Breadth First Search
+        levels from its first node.
+        """
 
-        color[start] = 0
+        nodes, index_neighbors, index_weights = graph.interned()
 
-        queue = []
-        queue.append(start)
+        levels = array.array('l', [-1]) * len(nodes)
+        parents = array.array('l', [-1]) * len(nodes)
+        visited = bytearray(len(nodes))
 
-        while len(queue) > 0:
-            node = queue.pop(0)
-            for neighbor in graph.neighbors(node):
-                if color[neighbor] is None:
-                    queue.append(neighbor)
-                    color[neighbor] = 1 - color[node]
-                elif color[neighbor] == color[node]:
-                    return False
+        for i in range(len(nodes)):
+            if not visited[i]:
+                self._frontier_bfs(index_neighbors,
+                                   [ i ],
+                                   levels,
+                                   parents,
+                                   visited)
 
-        return True
+        for u, neighbors in enumerate(index_neighbors):
+            for v in neighbors:
+                if (levels[u] - levels[v]) % 2 == 0:
+                    return None
 
-    def dijkstra_shortest_paths(self, graph, start):
+        coloring = {}
+        for i, node in enumerate(nodes):
+            coloring[node] = levels[i] % 2
+
+        return coloring
+
+    def dijkstra_shortest_paths(self, graph, start, queue=None):
         """
         Finds the shortest paths between nodes in a graph, which may
         represent, for example, road networks. It was conceived by computer
         scientist Edsger W. Dijkstra in 1956 and published three years later.
+
+        The priority queue is picked from the edge weights unless the queue
+        is given (see _priority_queue).
+
+        With a shortest path cache, the tree is taken from the cache if it
+        holds the tree of the current version of the graph (see
+        ShortestPathTreeCache), in which case the returned maps are shared
+        and must not be modified.
         """
 
-        distance_map, predecessor_map = \
-                                  self._create_distance_and_previous_maps(graph)
+        if queue is None:
+            algorithm = 'dijkstra_shortest_paths'
+        else:
+            algorithm = 'dijkstra_shortest_paths(' + queue + ')'
 
-        distance_map[start] = 0
+        return self._cached_tree(graph,
+                                 start,
+                                 algorithm,
+                                 lambda: self._dijkstra_shortest_paths(graph,
+                                                                       start,
+                                                                       queue))
 
-        priority_queue = heap.BinHeap(heap.HeapMode.min)
-        for node, value in distance_map.items():
-            priority_queue.insert(heap.HeapItem(value, node))
+    @staticmethod
+    def euclidean_distance(u, v):
+        """
+        Returns the Euclidean distance between two nodes that are (x, y)
+        points. Serves as an A* heuristic for graphs whose edge weights are
+        the lengths of segments between points, as in the connecting points
+        and clustering problems.
+        """
 
-        while priority_queue.size > 0:
-            min_item = priority_queue.extract()
-            node = min_item.datum
-            for neighbor in graph.neighbors(node):
-                if self._relax(graph,
-                               distance_map,
-                               predecessor_map,
-                               node,
-                               neighbor):
-                    index = self._index_in_priority_queue(priority_queue,
-                                                          neighbor)
-                    edge_distance = (distance_map[node] +
-                                     graph.weight((node, neighbor)))
-                    priority_queue.change_priority(index, edge_distance)
+        x1, y1 = u
+        x2, y2 = v
 
-        return distance_map, predecessor_map
+        return math.sqrt(math.pow(x1 - x2, 2) + math.pow(y1 - y2, 2))
+
+    def shortest_path(self,
+                      graph,
+                      source,
+                      target,
+                      heuristic=None,
+                      reverse_graph=None):
+        """
+        Finds a shortest path between two nodes of a graph with non-negative
+        edge weights without computing the whole shortest path tree.
+
+        Without a heuristic, runs the bidirectional Dijkstra's algorithm: a
+        forward search from the source over the graph and a backward search
+        from the target over the reversed graph, which stop as soon as the
+        two frontiers meet. Unless the reversed graph is given, it is built
+        once per version of the graph (see Graph.version) and reused by the
+        later queries; for an undirected graph, the graph itself can be
+        given.
+
+        If the shortest path cache holds the tree of dijkstra_shortest_paths
+        from the source, reads the path from that tree instead.
+
+        With a heuristic(node, target) that never overestimates the
+        remaining distance (for example, euclidean_distance), runs the A*
+        search from the source.
+
+        Returns the distance and the path in the format of
+        reconstruct_shortest_path. If the target is unreachable, returns
+        infinity and an empty path.
+        """
+
+        for node in (source, target):
+            if not graph.has_node(node):
+                raise KeyError(node)
+
+        if source == target:
+            return 0, []
+
+        if heuristic is not None:
+            return self._a_star(graph, source, target, heuristic)
+
+        cache = self.shortest_path_cache
+        if (cache is not None and
+            cache.contains(graph.version, source, 'dijkstra_shortest_paths')):
+            distance_map, predecessor_map = cache.get(
+                                                    graph.version,
+                                                    source,
+                                                    'dijkstra_shortest_paths')
+
+            return (distance_map[target],
+                    self.reconstruct_shortest_path(source,
+                                                   target,
+                                                   predecessor_map))
+
+        if reverse_graph is None:
+            reverse_graph = self._cached_reverse(graph)
+
+        return self._bidirectional_dijkstra(graph,
+                                            reverse_graph,
+                                            source,
+                                            target)
 
     def bellman_ford_shortest_paths(self, graph, start):
         """
@@ -589,21 +3167,183 @@ class GraphUtil:
         distance_map[start] = 0
 
         for i in range(len(graph.nodes()) - 1):
-            for u, v in graph.edges():
-                self._relax(graph,
-                            distance_map,
-                            predecessor_map,
-                            u,
-                            v)
+            for u, v, weight in graph.weighted_edges():
+                self._relax(distance_map, predecessor_map, u, v, weight)
 
         negative_cycle_nodes = set()
-        for u, v in graph.edges():
-            edge_distance = distance_map[u] + graph.weight((u, v))
+        for u, v, weight in graph.weighted_edges():
+            edge_distance = distance_map[u] + weight
             if distance_map[v] > edge_distance:
                 negative_cycle_nodes.add(v)
 
         return distance_map, predecessor_map, negative_cycle_nodes
 
+    def spfa_shortest_paths(self, graph, start):
+        """
+        Finds the shortest paths between nodes in a graph, which may have
+        negative weights, with the queue-based Bellman-Ford algorithm
+        (Shortest Path Faster Algorithm).
+
+        Instead of relaxing every edge |V| - 1 times, every round only
+        relaxes the edges leaving the nodes whose distances changed in the
+        previous round, and the search stops as soon as a round changes
+        nothing, which takes few rounds on most graphs.
+
+        After every round, the predecessor walks from the changed nodes are
+        checked for a cycle; such a cycle always has a negative weight. All
+        nodes reachable from a negative cycle have arbitrarily short paths
+        from the start node, so they get a distance of minus infinity and
+        are excluded from further rounds, which go on until the distances of
+        the remaining nodes stabilize.
+
+        Returns the distance map, the predecessor map, the first negative
+        cycle found (a list of nodes where every node has an edge to the
+        next one and the last one has an edge to the first one, or an empty
+        list) and the set of nodes with arbitrarily short paths.
+        """
+
+        distance_map, predecessor_map = \
+                                  self._create_distance_and_previous_maps(graph)
+
+        distance_map[start] = 0
+
+        negative_cycle = []
+        unbounded_nodes = set()
+
+        queue = [ start ]
+        while len(queue) > 0:
+            next_queue = []
+            queued = set()
+            for node in queue:
+                if node in unbounded_nodes:
+                    continue
+
+                for neighbor, weight in graph.weighted_neighbors(node):
+                    if neighbor in unbounded_nodes:
+                        continue
+
+                    if (self._relax(distance_map,
+                                    predecessor_map,
+                                    node,
+                                    neighbor,
+                                    weight) and
+                        neighbor not in queued):
+                        queued.add(neighbor)
+                        next_queue.append(neighbor)
+
+            queue = next_queue
+
+            cycle = self._predecessor_cycle(predecessor_map,
+                                            queue,
+                                            unbounded_nodes)
+            if len(cycle) > 0:
+                if len(negative_cycle) == 0:
+                    negative_cycle = cycle
+
+                for node in cycle:
+                    if node not in unbounded_nodes:
+                        unbounded_nodes.update(self.explore(graph, node))
+                queue = [x for x in queue if x not in unbounded_nodes]
+
+        for node in unbounded_nodes:
+            distance_map[node] = -math.inf
+
+        return distance_map, predecessor_map, negative_cycle, unbounded_nodes
+
+    def _share_buffers(self, buffers, blocks):
+        """
+        Copies every buffer into a new shared memory block, appends the
+        blocks to the given list (so the caller closes and unlinks them even
+        if a later copy fails) and returns the (name, typecode, length)
+        triples of the buffers for _attach_shared_buffers.
+        """
+
+        shared_buffers = []
+        for buffer in buffers:
+            view = memoryview(buffer)
+            data = view.cast('B')
+            block = multiprocessing.shared_memory.SharedMemory(
+                                                    create=True,
+                                                    size=max(1, len(data)))
+            blocks.append(block)
+            block.buf[:len(data)] = data
+            shared_buffers.append((block.name, view.format, len(view)))
+
+        return shared_buffers
+
+    def _multi_source_results(self, algorithm, graph, sources, workers):
+        if workers is None or workers <= 1:
+            method = getattr(self, algorithm)
+            for source in sources:
+                yield source, method(graph, source)
+            return
+
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_graph(graph)
+
+        blocks = []
+        executor = None
+        try:
+            buffers = self._share_buffers(
+                              [ graph.offsets, graph.targets, graph.weights ],
+                              blocks)
+
+            executor = concurrent.futures.ProcessPoolExecutor(
+                                   max_workers=workers,
+                                   initializer=_initialize_multi_source_worker,
+                                   initargs=(algorithm, graph._nodes, buffers))
+
+            future_sources = {}
+            for source in sources:
+                future = executor.submit(_multi_source_task, source)
+                future_sources[future] = source
+
+            for future in concurrent.futures.as_completed(future_sources):
+                yield future_sources[future], future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def multi_source(self, algorithm, graph, sources, workers=None):
+        """
+        Runs the given single-source algorithm (one of
+        MULTI_SOURCE_ALGORITHMS) from every source on a graph that does not
+        change meanwhile, and returns an iterator of the (source, result)
+        pairs.
+
+        With more than one worker, the searches run in a pool of that many
+        processes, and the pairs come in the order the searches finish. The
+        graph is frozen into a CSRGraph whose buffers are copied into shared
+        memory once, so the workers view the same buffers and only the
+        sources and the results are pickled (thus, the results are those of
+        the algorithm on CSRGraph.from_graph(graph), which may break ties
+        differently). The shared memory is released when the iterator is
+        exhausted or closed.
+
+        @type  algorithm: string
+        @param algorithm: The name of the GraphUtil method.
+        @type  graph: Graph
+        @param graph: The graph.
+        @type  sources: iterable
+        @param sources: The source nodes.
+        @type  workers: number
+        @param workers: The number of worker processes or None.
+        @rtype: iterator
+        """
+
+        if algorithm not in self.MULTI_SOURCE_ALGORITHMS:
+            raise ValueError('Unknown algorithm: {}.'.format(algorithm))
+
+        sources = [x for x in sources]
+        for source in sources:
+            if not graph.has_node(source):
+                raise ValueError('Node %s not in the graph.' % source)
+
+        return self._multi_source_results(algorithm, graph, sources, workers)
+
     def kruskal(self, graph):
         """
         Given a connected undirected graph G = (V, E) with positive edge
@@ -618,35 +3358,101 @@ class GraphUtil:
         """
 
         minimum_spanning_tree = Graph()
-
-        set = union_find.UnionFind()
-
-        node_to_wrapper_node_map = {}
-        priority_queue = heap.BinHeap(heap.HeapMode.min)
         for node in graph.nodes():
             minimum_spanning_tree.add_node(node)
 
-            wrapper_node = union_find.Node(node)
-            node_to_wrapper_node_map[node] = wrapper_node
-            set.make_set(wrapper_node)
+        for weight, u, v in self._kruskal_merges(graph):
+            minimum_spanning_tree.add_undirected_edge(u, v, weight)
 
-        for u, v in graph.edges():
-            edge = (node_to_wrapper_node_map[u], node_to_wrapper_node_map[v])
-            priority_queue.insert(heap.HeapItem(graph.weight((u, v)),
-                                                edge))
+        return minimum_spanning_tree
 
-        while priority_queue.size > 0:
-            min_item = priority_queue.extract()
-            u_node, v_node = min_item.datum
-            if set.find(u_node) != set.find(v_node):
-                minimum_spanning_tree.add_undirected_edge(u_node.value,
-                                                          v_node.value,
-                                                          min_item.priority)
-                set.union(u_node, v_node)
+    def kruskal_edges(self, graph):
+        """
+        Computes the same minimum spanning tree (or forest) as kruskal(),
+        but returns its edges as three parallel arrays instead of building
+        a Graph: the indices of the first nodes, the indices of the second
+        nodes (see Graph.index() and Graph.node()) and the weights, in the
+        order of the weights.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @rtype: tuple
+        """
+
+        sources, targets, weights = self._kruskal_indices(graph)
+
+        return sources, targets, CSRGraph._weight_array(weights)
+
+    def single_linkage_clustering(self, graph):
+        """
+        Given an undirected graph G = (V, E), computes its single-linkage
+        dendrogram with one pass of Kruskal's algorithm.
+
+        The clusters of every k, their labels and their spacing (the largest
+        possible value of d such that the weight of every edge between two
+        different clusters is at least d) can then be queried from the
+        dendrogram without rebuilding the minimum spanning tree.
+        """
+
+        return Dendrogram([x for x in graph.nodes()],
+                          self._kruskal_merges(graph))
+
+    def boruvka(self, graph, workers=None):
+        """
+        Given a connected undirected graph G = (V, E) with positive edge
+        weights, computes a minimum spanning tree that consists of a subset
+        of edges E′ ⊆ E of minimum total weight such that the graph (V, E′)
+        is connected.
+
+        Greedy Strategy: In every phase, attaches every component (a tree
+        of the current forest) to its neighbor by the lightest edge leaving
+        it, which at least halves the number of components.
+
+        Every phase is one sweep over the edge arrays, which is vectorized
+        with NumPy when it is installed and otherwise split among the given
+        number of worker processes (see _boruvka_indices). The tree is the
+        same as the one of kruskal(), including the choice among edges of
+        equal weights, and a disconnected graph gives a spanning forest.
+
+        Note: The graph does not have to be undirected.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @type  workers: number
+        @param workers: The number of worker processes or None.
+        @rtype: Graph
+        """
+
+        minimum_spanning_tree = Graph()
+        nodes = graph.interned()[0]
+        for node in nodes:
+            minimum_spanning_tree.add_node(node)
+
+        for u, v, weight in zip(*self._boruvka_indices(graph, workers)):
+            minimum_spanning_tree.add_undirected_edge(nodes[u],
+                                                      nodes[v],
+                                                      weight)
 
         return minimum_spanning_tree
 
-    def prim(self, graph):
+    def boruvka_edges(self, graph, workers=None):
+        """
+        Computes the same minimum spanning tree (or forest) as boruvka(),
+        but returns its edges as three parallel arrays in the format of
+        kruskal_edges(), in the order the phases accepted them.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @type  workers: number
+        @param workers: The number of worker processes or None.
+        @rtype: tuple
+        """
+
+        sources, targets, weights = self._boruvka_indices(graph, workers)
+
+        return sources, targets, CSRGraph._weight_array(weights)
+
+    def prim(self, graph, queue=None):
         """
         Given a connected undirected graph G = (V, E) with positive edge
         weights, computes a minimum spanning tree that consists of a subset
@@ -657,49 +3463,332 @@ class GraphUtil:
         the next lightest edge.
 
         Note: The graph must be really connected undirected.
+
+        The priority queue is picked from the edge weights unless the queue
+        is given (see _priority_queue).
+        """
+
+        minimum_spanning_tree = Graph()
+
+        nodes, index_neighbors, index_weights = graph.interned()
+        for node in nodes:
+            minimum_spanning_tree.add_node(node)
+
+        if (len(nodes) == 0):
+            return minimum_spanning_tree
+
+        distances = [math.inf] * len(nodes)
+        predecessors = [-1] * len(nodes)
+        in_tree = bytearray(len(nodes))
+
+        # the nodes enter the queue once reached, so that it only holds
+        # finite priorities (a disconnected graph gives a spanning forest)
+        priority_queue = self._priority_queue(index_weights,
+                                              queue,
+                                              monotone=False)
+        for root in range(len(nodes)):
+            if in_tree[root]:
+                continue
+
+            distances[root] = 0
+            priority_queue.insert(heap.HeapItem(0, root))
+
+            while priority_queue.size > 0:
+                u = priority_queue.extract().datum
+                in_tree[u] = 1
+                for v, weight in zip(index_neighbors[u], index_weights[u]):
+                    if not in_tree[v] and distances[v] > weight:
+                        distances[v] = weight
+                        predecessors[v] = u
+                        if priority_queue.contains(v):
+                            priority_queue.decrease_key(v, weight)
+                        else:
+                            priority_queue.insert(heap.HeapItem(weight, v))
+
+        for v in range(len(nodes)):
+            if predecessors[v] != -1:
+                u = predecessors[v]
+                minimum_spanning_tree.add_undirected_edge(nodes[u],
+                                                          nodes[v],
+                                                          distances[v])
+
+        return minimum_spanning_tree
+
+    def euclidean_minimum_spanning_tree(self, points):
+        """
+        Given n pairwise different points on a plane, computes a minimum
+        spanning tree of the complete graph whose edge weights are the
+        Euclidean distances between the points, without materializing the
+        n(n - 1)/2 edges of that graph.
+
+        Runs the dense Prim's algorithm: keeps the distance from every point
+        outside the tree to the tree in a flat buffer and updates it with the
+        distances from the point just attached, which takes O(n^2) time and
+        only O(n) memory. The distance updates are vectorized with NumPy when
+        it is installed.
         """
 
         minimum_spanning_tree = Graph()
+        for point in points:
+            minimum_spanning_tree.add_node(point)
 
-        if (len(graph.nodes()) == 0):
+        if len(points) < 2:
             return minimum_spanning_tree
 
+        if numpy is not None:
+            edges = self._dense_prim_vectorized(points)
+        else:
+            edges = self._dense_prim(points)
+
+        for u, v, distance in edges:
+            minimum_spanning_tree.add_undirected_edge(points[u],
+                                                      points[v],
+                                                      distance)
+
+        return minimum_spanning_tree
+
+class InstrumentedGraphUtil(GraphUtil):
+    """
+    Represents a GraphUtil that counts the work of its algorithms (see
+    AlgorithmStats). After every call of explore, depth_first_search,
+    topological_sort, strongly_connected_components,
+    tarjan_strongly_connected_components, breadth_first_search,
+    dijkstra_shortest_paths, bellman_ford_shortest_paths,
+    spfa_shortest_paths, prim, kruskal, kruskal_edges,
+    single_linkage_clustering, boruvka or boruvka_edges, the stats property
+    holds the stats of that call, including the work of the algorithms it
+    called in turn.
+
+    The counters come from the instrumented priority queues and union-find
+    and from the overridden helpers, or they are derived from the results,
+    so GraphUtil itself runs none of this code and costs nothing extra.
+    A tree taken from the shortest path cache counts no work.
+    """
+
+    def __init__(self, shortest_path_cache=None):
+        super().__init__(shortest_path_cache)
+        self._stats = None
+        # the stats of the outermost call in progress
+        self._running_stats = None
+
+    @property
+    def stats(self):
+        return self._stats
+
+    @contextlib.contextmanager
+    def _instrument(self, algorithm):
+        """
+        Yields the stats the enclosed call adds its work to: new ones for an
+        outermost call, which become the stats of the GraphUtil once it
+        returns, and those of the outermost call otherwise.
+        """
+
+        if self._running_stats is not None:
+            yield self._running_stats
+            return
+
+        stats = AlgorithmStats(algorithm)
+        self._running_stats = stats
+        try:
+            with stats.phase('total'):
+                yield stats
+        finally:
+            self._running_stats = None
+
+        self._stats = stats
+
+    def _create_queue(self, queue, maximum_weight=None):
+        if self._running_stats is None:
+            return super()._create_queue(queue, maximum_weight)
+
+        counters = self._running_stats.counters
+        if queue == 'binary':
+            return heap.InstrumentedIndexedBinHeap(heap.HeapMode.min,
+                                                   counters)
+        elif queue == 'bucket':
+            return heap.InstrumentedBucketQueue(maximum_weight, counters)
+
+        return heap.InstrumentedRadixHeap(counters)
+
+    def _create_union_find(self, n):
+        if self._running_stats is None:
+            return super()._create_union_find(n)
+
+        return union_find.InstrumentedArrayUnionFind(
+                                               n,
+                                               self._running_stats.counters)
+
+    def _phase(self, name):
+        if self._running_stats is None:
+            return contextlib.nullcontext()
+
+        return self._running_stats.phase(name)
+
+    def _priority_queue(self, index_weights, queue, monotone):
+        with self._phase('queue_selection'):
+            return super()._priority_queue(index_weights, queue, monotone)
+
+    def _sorted_edge_order(self, weights):
+        with self._phase('sort'):
+            return super()._sorted_edge_order(weights)
+
+    def _reverse(self, graph):
+        with self._phase('reverse'):
+            return super()._reverse(graph)
+
+    def _index_maps(self, nodes, distances, predecessors):
+        with self._phase('maps'):
+            return super()._index_maps(nodes, distances, predecessors)
+
+    def _relax(self, distance_map, predecessor_map, u, v, weight):
+        relaxed = super()._relax(distance_map, predecessor_map, u, v, weight)
+
+        if self._running_stats is not None:
+            counters = self._running_stats.counters
+            counters['relaxed'] += 1
+            if relaxed:
+                counters['successful_relaxations'] += 1
+
+        return relaxed
+
+    def _explore(self,
+                 graph,
+                 node,
+                 visited,
+                 previsit=None,
+                 postvisit=None,
+                 excluded=None):
+        # every node is pushed on the stack once, when it is visited
+        visited_count = len(visited)
+
+        super()._explore(graph, node, visited, previsit, postvisit, excluded)
+
+        if self._running_stats is not None:
+            self._running_stats.counters['dfs_pushes'] += (len(visited) -
+                                                           visited_count)
+
+    def _count_search(self, stats, graph, settled, root_count):
+        """
+        Counts the work of a search with a priority queue, which settled the
+        given node indices once each and relaxed all their edges, inserting
+        the roots and every node a relaxation improved.
+        """
+
+        index_neighbors = graph.interned()[1]
+
+        counters = stats.counters
+        counters['settled'] += len(settled)
+        for u in settled:
+            counters['relaxed'] += len(index_neighbors[u])
+        counters['successful_relaxations'] += (counters['heap_inserts'] +
+                                               counters['heap_decrease_keys'] -
+                                               root_count)
+
+    def explore(self,
+                graph,
+                start,
+                previsit=None,
+                postvisit=None,
+                excluded=None):
+        with self._instrument('explore'):
+            return super().explore(graph,
+                                   start,
+                                   previsit,
+                                   postvisit,
+                                   excluded)
+
+    def depth_first_search(self, graph):
+        with self._instrument('depth_first_search'):
+            return super().depth_first_search(graph)
+
+    def topological_sort(self, graph):
+        with self._instrument('topological_sort'):
+            return super().topological_sort(graph)
+
+    def strongly_connected_components(self, graph, algorithm='kosaraju'):
+        with self._instrument('strongly_connected_components'):
+            return super().strongly_connected_components(graph, algorithm)
+
+    def tarjan_strongly_connected_components(self, graph):
+        algorithm = 'tarjan_strongly_connected_components'
+        with self._instrument(algorithm) as stats:
+            components = super().tarjan_strongly_connected_components(graph)
+
+            # the single pass pushes every node once
+            stats.counters['dfs_pushes'] += len(graph.nodes())
+
+            return components
+
+    def breadth_first_search(self,
+                             graph,
+                             sources,
+                             direction_optimizing=False):
+        with self._instrument('breadth_first_search') as stats:
+            levels, parents = super().breadth_first_search(
+                                                        graph,
+                                                        sources,
+                                                        direction_optimizing)
+
+            stats.counters['settled'] += len(levels) - levels.count(-1)
+
+            return levels, parents
+
+    def _dijkstra_shortest_paths(self, graph, start, queue):
+        # only runs when the tree is not cached
         distance_map, predecessor_map = \
-                                  self._create_distance_and_previous_maps(graph)
+            super()._dijkstra_shortest_paths(graph, start, queue)
 
-        # pick any initial node (the graph must be connected)
-        start = next(iter(graph.nodes()))
-        distance_map[start] = 0
+        if self._running_stats is not None:
+            # all reached nodes are settled
+            settled = [graph.index(x) for x, distance in distance_map.items()
+                       if distance != math.inf]
+            self._count_search(self._running_stats, graph, settled, 1)
 
-        priority_queue = heap.BinHeap(heap.HeapMode.min)
-        for node, value in distance_map.items():
-            minimum_spanning_tree.add_node(node)
+        return distance_map, predecessor_map
 
-            priority_queue.insert(heap.HeapItem(value, node))
+    def dijkstra_shortest_paths(self, graph, start, queue=None):
+        with self._instrument('dijkstra_shortest_paths'):
+            return super().dijkstra_shortest_paths(graph, start, queue)
 
-        while priority_queue.size > 0:
-            min_item = priority_queue.extract()
-            node = min_item.datum
-            for neighbor in graph.neighbors(node):
-                edge = (node, neighbor)
-                edge_distance = graph.weight(edge)
-                neighbor_index = self._index_in_priority_queue(priority_queue,
-                                                               neighbor)
-                if (neighbor_index != None and
-                    distance_map[neighbor] > edge_distance):
-                    distance_map[neighbor] = edge_distance
+    def bellman_ford_shortest_paths(self, graph, start):
+        with self._instrument('bellman_ford_shortest_paths'):
+            return super().bellman_ford_shortest_paths(graph, start)
+
+    def spfa_shortest_paths(self, graph, start):
+        with self._instrument('spfa_shortest_paths'):
+            return super().spfa_shortest_paths(graph, start)
+
+    def prim(self, graph, queue=None):
+        with self._instrument('prim') as stats:
+            minimum_spanning_tree = super().prim(graph, queue)
+
+            # every node is settled, and every tree of the spanning forest
+            # has a root
+            node_count = len(graph.interned()[0])
+            root_count = node_count - len(minimum_spanning_tree.edges()) // 2
+            self._count_search(stats,
+                               graph,
+                               range(node_count),
+                               root_count)
 
-                    priority_queue.change_priority(neighbor_index,
-                                                   edge_distance)
+            return minimum_spanning_tree
 
-                    predecessor_map[neighbor] = node
+    def kruskal(self, graph):
+        with self._instrument('kruskal'):
+            return super().kruskal(graph)
 
-        for node, value in predecessor_map.items():
-            if value != None:
-                edge = (value, node)
-                edge_distance = graph.weight(edge)
-                minimum_spanning_tree.add_undirected_edge(value,
-                                                          node,
-                                                          edge_distance)
+    def kruskal_edges(self, graph):
+        with self._instrument('kruskal_edges'):
+            return super().kruskal_edges(graph)
 
-        return minimum_spanning_tree
+    def single_linkage_clustering(self, graph):
+        with self._instrument('single_linkage_clustering'):
+            return super().single_linkage_clustering(graph)
+
+    def boruvka(self, graph, workers=None):
+        with self._instrument('boruvka'):
+            return super().boruvka(graph, workers)
+
+    def boruvka_edges(self, graph, workers=None):
+        with self._instrument('boruvka_edges'):
+            return super().boruvka_edges(graph, workers)
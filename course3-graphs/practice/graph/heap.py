@@ -1,3 +1,4 @@
+import collections
 import enum
 
 class HeapMode(enum.Enum):
@@ -179,3 +180,439 @@ class BinHeap:
             self._sift_down(0)
 
         self._size = original_size
+
+class IndexedBinHeap(BinHeap):
+    """
+    Represents a binary heap that keeps track of the position of every datum,
+    so that the priority of a datum can be changed in O(log n) without
+    scanning the heap.
+
+    Every datum must be hashable and may occur in the heap at most once.
+    """
+
+    def __init__(self, mode=HeapMode.min):
+        super().__init__(mode)
+        self._positions = {}
+
+    def _swap(self, i, j):
+        heap_list = self._heap_list
+        heap_list[i], heap_list[j] = heap_list[j], heap_list[i]
+        self._positions[heap_list[i].datum] = i
+        self._positions[heap_list[j].datum] = j
+
+    def _sift_down(self, index):
+        while self._left_child(index) < self.size:
+            priority_child = self._priority_child(index)
+
+            if not self._has_greater_priority(
+                self._heap_list[priority_child],
+                self._heap_list[index],
+                self.mode):
+                break
+
+            self._swap(index, priority_child)
+            index = priority_child
+
+    def _sift_up(self, index):
+        while index > 0:
+            parent = self._parent(index)
+
+            if not self._has_greater_priority(
+                self._heap_list[index],
+                self._heap_list[parent],
+                self.mode):
+                break
+
+            self._swap(index, parent)
+            index = parent
+
+    def contains(self, datum):
+        """
+        Returns whether the given datum is in the heap.
+        """
+
+        return datum in self._positions
+
+    def position(self, datum):
+        """
+        Returns the index of the given datum in the heap list.
+        """
+
+        if datum not in self._positions:
+            raise KeyError('{} not in the heap.'.format(datum))
+
+        return self._positions[datum]
+
+    def build(self, list):
+        self._positions = {}
+        for i, item in enumerate(list):
+            if item.datum in self._positions:
+                raise ValueError('{} already in the heap.'.format(item.datum))
+            self._positions[item.datum] = i
+
+        super().build(list)
+
+    def extract(self):
+        min_element = self._heap_list[0]
+        last_element = self._heap_list.pop()
+        self._size = self.size - 1
+        del self._positions[min_element.datum]
+
+        if self.size > 0:
+            self._heap_list[0] = last_element
+            self._positions[last_element.datum] = 0
+            self._sift_down(0)
+
+        return min_element
+
+    def insert(self, item):
+        if item.datum in self._positions:
+            raise ValueError('{} already in the heap.'.format(item.datum))
+
+        self._heap_list.append(item)
+        self._size = self.size + 1
+        self._positions[item.datum] = self.size - 1
+        self._sift_up(self.size - 1)
+
+    def change_priority(self, index, p):
+        if index < 0 or index >= self.size:
+            raise IndexError()
+
+        item = self._heap_list[index]
+        old_item = HeapItem(item.priority, item.datum)
+        item._priority = p
+        if self._has_greater_priority(item, old_item, self.mode):
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def decrease_key(self, datum, priority):
+        """
+        Moves the given datum towards the top of the heap by assigning it a
+        higher priority (a smaller one for the min mode, a larger one for the
+        max mode).
+        """
+
+        index = self.position(datum)
+        item = self._heap_list[index]
+        if self._has_greater_priority(item.priority, priority, self.mode):
+            raise ValueError(
+                'Priority {} of {} is not higher than {}.'.format(
+                    priority, datum, item.priority))
+
+        item._priority = priority
+        self._sift_up(index)
+
+    def sort_in_place(self, data):
+        super().sort_in_place(data)
+
+        self._positions = {}
+        for i, item in enumerate(self._heap_list):
+            self._positions[item.datum] = i
+
+class BucketQueue:
+    """
+    Represents a Dial's bucket queue: a min priority queue of non-negative
+    integer priorities that never differ by more than the given maximum
+    spread, such as the tentative distances of the Dijkstra's algorithm with
+    edge weights of at most the spread.
+
+    The datums are kept in a circular array of spread + 1 buckets indexed by
+    their priorities modulo the number of buckets, so insert and
+    decrease_key are O(1) and extract scans at most spread + 1 buckets.
+
+    Every datum must be hashable and may occur in the queue at most once.
+    """
+
+    def __init__(self, maximum_spread):
+        if maximum_spread < 0:
+            raise ValueError('Maximum spread must be non-negative.')
+
+        self._buckets = [{} for i in range(maximum_spread + 1)]
+        self._priorities = {}
+        # the smallest and the largest queued priorities (the smallest one
+        # may lag behind until the next extract)
+        self._minimum = 0
+        self._maximum = 0
+
+    @property
+    def mode(self):
+        return HeapMode.min
+
+    @property
+    def size(self):
+        return len(self._priorities)
+
+    def contains(self, datum):
+        """
+        Returns whether the given datum is in the queue.
+        """
+
+        return datum in self._priorities
+
+    def _check_priority(self, priority):
+        if priority < 0:
+            raise ValueError(
+                'Priority {} must be non-negative.'.format(priority))
+
+        if (self.size > 0 and
+            (priority - self._minimum >= len(self._buckets) or
+             self._maximum - priority >= len(self._buckets))):
+            raise ValueError(
+                'Priority {} exceeds the spread of the queue.'.format(
+                    priority))
+
+    def insert(self, item):
+        if item.datum in self._priorities:
+            raise ValueError('{} already in the heap.'.format(item.datum))
+
+        priority = item.priority
+        self._check_priority(priority)
+
+        if self.size == 0:
+            self._minimum = priority
+            self._maximum = priority
+        elif priority < self._minimum:
+            self._minimum = priority
+        elif priority > self._maximum:
+            self._maximum = priority
+        self._buckets[priority % len(self._buckets)][item.datum] = None
+        self._priorities[item.datum] = priority
+
+    def extract(self):
+        if self.size == 0:
+            raise IndexError()
+
+        buckets = self._buckets
+        priority = self._minimum
+        bucket = buckets[priority % len(buckets)]
+        while not bucket:
+            priority += 1
+            bucket = buckets[priority % len(buckets)]
+        self._minimum = priority
+
+        # the buckets keep their datums in the insertion order
+        datum = next(iter(bucket))
+        del bucket[datum]
+        del self._priorities[datum]
+
+        return HeapItem(priority, datum)
+
+    def decrease_key(self, datum, priority):
+        """
+        Assigns the given datum a smaller priority.
+        """
+
+        if datum not in self._priorities:
+            raise KeyError('{} not in the heap.'.format(datum))
+
+        old_priority = self._priorities[datum]
+        if priority > old_priority:
+            raise ValueError(
+                'Priority {} of {} is not higher than {}.'.format(
+                    priority, datum, old_priority))
+
+        # the spread is checked against the other datums only
+        self._remove(datum)
+        try:
+            self.insert(HeapItem(priority, datum))
+        except ValueError:
+            self.insert(HeapItem(old_priority, datum))
+            raise
+
+    def _remove(self, datum):
+        buckets = self._buckets
+        priority = self._priorities.pop(datum)
+        bucket = buckets[priority % len(buckets)]
+        del bucket[datum]
+
+        if self.size > 0 and priority == self._maximum and not bucket:
+            # the other datums lie between the minimum and the old maximum
+            priority -= 1
+            while not buckets[priority % len(buckets)]:
+                priority -= 1
+            self._maximum = priority
+
+class RadixHeap:
+    """
+    Represents a radix heap: a min priority queue of non-negative integer
+    priorities that is monotone, i.e. no priority is ever smaller than the
+    last extracted one, such as the tentative distances of the Dijkstra's
+    algorithm.
+
+    A datum with the priority p is kept in the bucket given by the bit length
+    of p XOR the last extracted priority, so the bucket 0 holds the current
+    minimum. When it is empty, extract moves the datums of the first
+    non-empty bucket into lower buckets relative to their smallest priority.
+    A datum only ever moves down, so the operations take O(log C) amortized
+    time for priorities of at most C, regardless of the number of datums.
+
+    Every datum must be hashable and may occur in the heap at most once.
+    """
+
+    def __init__(self):
+        self._buckets = [{}]
+        self._priorities = {}
+        self._last = 0
+
+    @property
+    def mode(self):
+        return HeapMode.min
+
+    @property
+    def size(self):
+        return len(self._priorities)
+
+    def contains(self, datum):
+        """
+        Returns whether the given datum is in the heap.
+        """
+
+        return datum in self._priorities
+
+    def _bucket(self, priority):
+        i = (priority ^ self._last).bit_length()
+        while len(self._buckets) <= i:
+            self._buckets.append({})
+
+        return self._buckets[i]
+
+    def insert(self, item):
+        if item.datum in self._priorities:
+            raise ValueError('{} already in the heap.'.format(item.datum))
+
+        priority = item.priority
+        if priority < self._last:
+            raise ValueError(
+                'Priority {} is lower than the last extracted {}.'.format(
+                    priority, self._last))
+
+        self._bucket(priority)[item.datum] = priority
+        self._priorities[item.datum] = priority
+
+    def extract(self):
+        buckets = self._buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+
+            bucket = buckets[i]
+            buckets[i] = {}
+            self._last = min(bucket.values())
+            for datum, priority in bucket.items():
+                self._bucket(priority)[datum] = priority
+
+        bucket = buckets[0]
+        datum = next(iter(bucket))
+        priority = bucket.pop(datum)
+        del self._priorities[datum]
+
+        return HeapItem(priority, datum)
+
+    def decrease_key(self, datum, priority):
+        """
+        Assigns the given datum a smaller priority, which must not be lower
+        than the last extracted one.
+        """
+
+        if datum not in self._priorities:
+            raise KeyError('{} not in the heap.'.format(datum))
+
+        old_priority = self._priorities[datum]
+        if priority > old_priority:
+            raise ValueError(
+                'Priority {} of {} is not higher than {}.'.format(
+                    priority, datum, old_priority))
+        if priority < self._last:
+            raise ValueError(
+                'Priority {} is lower than the last extracted {}.'.format(
+                    priority, self._last))
+
+        del self._bucket(old_priority)[datum]
+        del self._priorities[datum]
+        self.insert(HeapItem(priority, datum))
+
+class _InstrumentedQueue:
+    """
+    Counts the operations of the priority queue class it is mixed into in a
+    shared collections.Counter: heap_inserts, heap_extracts,
+    heap_decrease_keys and heap_sift_steps (the moves of datums inside the
+    queue, whatever they are for the given queue).
+
+    Only the instrumented subclasses run any of this code, so the plain
+    queues cost nothing extra.
+    """
+
+    def _initialize_counters(self, counters):
+        if counters is None:
+            counters = collections.Counter()
+
+        self.counters = counters
+
+    def insert(self, item):
+        self.counters['heap_inserts'] += 1
+        super().insert(item)
+
+    def extract(self):
+        self.counters['heap_extracts'] += 1
+
+        return super().extract()
+
+    def decrease_key(self, datum, priority):
+        insert_count = self.counters['heap_inserts']
+        super().decrease_key(datum, priority)
+
+        # the bucket queue and the radix heap re-insert the datum
+        self.counters['heap_inserts'] = insert_count
+        self.counters['heap_decrease_keys'] += 1
+
+class InstrumentedIndexedBinHeap(_InstrumentedQueue, IndexedBinHeap):
+    """
+    Represents an indexed binary heap that counts its operations. Every
+    swap of a sift-up or a sift-down is a sift step.
+    """
+
+    def __init__(self, mode=HeapMode.min, counters=None):
+        super().__init__(mode)
+        self._initialize_counters(counters)
+
+    def _swap(self, i, j):
+        self.counters['heap_sift_steps'] += 1
+        super()._swap(i, j)
+
+class InstrumentedBucketQueue(_InstrumentedQueue, BucketQueue):
+    """
+    Represents a bucket queue that counts its operations. Every empty bucket
+    an extract skips is a sift step.
+    """
+
+    def __init__(self, maximum_spread, counters=None):
+        super().__init__(maximum_spread)
+        self._initialize_counters(counters)
+
+    def extract(self):
+        minimum = self._minimum
+        item = super().extract()
+        self.counters['heap_sift_steps'] += item.priority - minimum
+
+        return item
+
+class InstrumentedRadixHeap(_InstrumentedQueue, RadixHeap):
+    """
+    Represents a radix heap that counts its operations. Every datum an
+    extract moves into a lower bucket is a sift step.
+    """
+
+    def __init__(self, counters=None):
+        super().__init__()
+        self._initialize_counters(counters)
+
+    def extract(self):
+        if self.size > 0 and not self._buckets[0]:
+            for bucket in self._buckets:
+                if bucket:
+                    self.counters['heap_sift_steps'] += len(bucket)
+                    break
+
+        return super().extract()
@@ -0,0 +1,317 @@
+import pickle
+import random
+
+import graph_util
+
+class ReachabilityIndex:
+    """
+    Represents a reachability index of a directed graph, which answers
+    repeated "does x reach y?" queries without exploring the graph.
+
+    The strongly connected components are condensed into a DAG whose nodes
+    are numbered in a topological order, so every node of a component
+    reaches every other one and a component never reaches a component with
+    a smaller number.
+
+    For small DAGs, the index stores the transitive closure of every
+    component as a bitset (a Python int with a bit per component), so a
+    query is a single bit test.
+
+    For larger DAGs, it stores GRAIL interval labels instead: a random
+    Depth First traversal of the DAG gives every component the interval
+    [the smallest post-order rank below it, its own post-order rank], and a
+    component can only reach the components whose intervals are nested in
+    its own. Several traversals refute almost all negative queries at once,
+    and the remaining queries run a Depth First Search that skips every
+    component the labels rule out.
+    """
+
+    # the largest DAG whose transitive closure is stored as bitsets
+    BITSET_COMPONENT_LIMIT = 10000
+
+    # the number of random traversals (intervals per component) of GRAIL
+    LABEL_COUNT = 3
+
+    def __init__(self,
+                 node_components,
+                 dag_neighbors,
+                 closures=None,
+                 labels=None):
+        """
+        Initializes an index from the preprocessed data.
+
+        @type  node_components: dict
+        @param node_components: The component number of every node.
+        @type  dag_neighbors: list
+        @param dag_neighbors: The lists of the successors of every component
+                              in the condensation.
+        @type  closures: list
+        @param closures: The bitsets of the components every component
+                         reaches or None.
+        @type  labels: list
+        @param labels: The LABEL_COUNT lists of (low, rank) intervals of
+                       every component or None.
+        """
+
+        self._node_components = node_components
+        self._dag_neighbors = dag_neighbors
+        self._closures = closures
+        self._labels = labels
+        self._stale = False
+
+    @property
+    def component_count(self):
+        return len(self._dag_neighbors)
+
+    @property
+    def stale(self):
+        """
+        Returns whether a change of the graph invalidated the index, so it
+        has to be rebuilt before it answers queries again.
+        """
+
+        return self._stale
+
+    def component(self, node):
+        """
+        Returns the number of the strongly connected component of the node.
+        """
+
+        return self._node_components[node]
+
+    @classmethod
+    def _transitive_closures(cls, dag_neighbors):
+        closures = [0] * len(dag_neighbors)
+        # the successors have greater numbers, so they are done first
+        for c in range(len(dag_neighbors) - 1, -1, -1):
+            closure = 1 << c
+            for d in dag_neighbors[c]:
+                closure |= closures[d]
+            closures[c] = closure
+
+        return closures
+
+    @classmethod
+    def _shuffled(cls, items, generator):
+        return iter(generator.sample(items, len(items)))
+
+    @classmethod
+    def _interval_labels(cls, dag_neighbors, generator):
+        component_count = len(dag_neighbors)
+        lows = [0] * component_count
+        ranks = [-1] * component_count
+        rank = 0
+
+        roots = [x for x in range(component_count)]
+        generator.shuffle(roots)
+        for root in roots:
+            if ranks[root] != -1:
+                continue
+
+            ranks[root] = -2
+            lows[root] = component_count
+            stack = [ (root, cls._shuffled(dag_neighbors[root], generator)) ]
+            while stack:
+                c, successors = stack[-1]
+
+                for d in successors:
+                    if ranks[d] == -1:
+                        ranks[d] = -2
+                        lows[d] = component_count
+                        stack.append((d, cls._shuffled(dag_neighbors[d],
+                                                       generator)))
+                        break
+                    elif lows[d] < lows[c]:
+                        lows[c] = lows[d]
+                else:
+                    stack.pop()
+
+                    ranks[c] = rank
+                    rank += 1
+                    if rank - 1 < lows[c]:
+                        lows[c] = rank - 1
+
+                    if stack:
+                        parent = stack[-1][0]
+                        if lows[c] < lows[parent]:
+                            lows[parent] = lows[c]
+
+        return [(lows[c], ranks[c]) for c in range(component_count)]
+
+    @classmethod
+    def build(cls, graph, seed=None):
+        """
+        Condenses the given directed graph and labels its components.
+
+        @type  graph: Graph
+        @param graph: The graph.
+        @type  seed: number
+        @param seed: The seed of the random traversals of GRAIL.
+        @rtype: ReachabilityIndex
+        """
+
+        dag, components = graph_util.GraphUtil().condensation(graph)
+
+        node_components = {}
+        for c, component in enumerate(components):
+            for node in component:
+                node_components[node] = c
+
+        dag_neighbors = [[x for x in dag.neighbors(c)]
+                         for c in range(len(components))]
+
+        if len(components) <= cls.BITSET_COMPONENT_LIMIT:
+            return cls(node_components,
+                       dag_neighbors,
+                       closures=cls._transitive_closures(dag_neighbors))
+
+        generator = random.Random(seed)
+        labels = [cls._interval_labels(dag_neighbors, generator)
+                  for i in range(cls.LABEL_COUNT)]
+
+        return cls(node_components, dag_neighbors, labels=labels)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index saved with save().
+        """
+
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+
+        return cls(data['node_components'],
+                   data['dag_neighbors'],
+                   data['closures'],
+                   data['labels'])
+
+    def save(self, path):
+        """
+        Saves the index to the given file. A stale index cannot be saved.
+        """
+
+        self._check_stale()
+
+        data = {
+            'node_components': self._node_components,
+            'dag_neighbors': self._dag_neighbors,
+            'closures': self._closures,
+            'labels': self._labels,
+        }
+        with open(path, 'wb') as f:
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+
+    def _check_stale(self):
+        if self._stale:
+            raise ValueError('The index is stale, rebuild it.')
+
+    def _contains(self, c, d):
+        """
+        Returns whether all intervals of the component d are nested in the
+        intervals of the component c.
+        """
+
+        for labels in self._labels:
+            c_low, c_rank = labels[c]
+            d_low, d_rank = labels[d]
+            if d_low < c_low or d_rank > c_rank:
+                return False
+
+        return True
+
+    def _component_reaches(self, c, d):
+        if c == d:
+            return True
+
+        if self._closures is not None:
+            return (self._closures[c] >> d) & 1 == 1
+
+        # the components are numbered in a topological order
+        if c > d or not self._contains(c, d):
+            return False
+
+        visited = { c }
+        stack = [ c ]
+        while stack:
+            e = stack.pop()
+            for f in self._dag_neighbors[e]:
+                if f == d:
+                    return True
+
+                if (f not in visited and f < d and
+                    self._contains(f, d)):
+                    visited.add(f)
+                    stack.append(f)
+
+        return False
+
+    def reaches(self, x, y):
+        """
+        Returns whether there is a path from the node x to the node y, in
+        the same sense as GraphUtil.reaches.
+        """
+
+        self._check_stale()
+
+        return self._component_reaches(self._node_components[x],
+                                       self._node_components[y])
+
+    def add_node(self, node):
+        """
+        Keeps the index valid after the given node has been added to the
+        graph without any edges.
+        """
+
+        self._check_stale()
+
+        if node in self._node_components:
+            raise ValueError('Node %s already in the index.' % node)
+
+        c = len(self._dag_neighbors)
+        self._node_components[node] = c
+        self._dag_neighbors.append([])
+        if self._closures is not None:
+            self._closures.append(1 << c)
+        else:
+            for labels in self._labels:
+                rank = len(labels)
+                labels.append((rank, rank))
+
+    def add_edge(self, u, v):
+        """
+        Keeps the index valid after the edge (u, v) has been added to the
+        graph when possible and marks it stale otherwise.
+
+        An edge between already connected nodes changes nothing. With
+        bitsets, an edge that does not close a cycle is merged into the
+        closures of all components that reach u. Any other edge (which would
+        merge components or change the interval labels) makes the index
+        stale.
+        """
+
+        self._check_stale()
+
+        c = self._node_components[u]
+        d = self._node_components[v]
+        if self._component_reaches(c, d):
+            return
+
+        if self._closures is None or self._component_reaches(d, c):
+            self.invalidate()
+            return
+
+        self._dag_neighbors[c].append(d)
+
+        closures = self._closures
+        closure = closures[d]
+        for e in range(len(closures)):
+            if (closures[e] >> c) & 1:
+                closures[e] |= closure
+
+    def invalidate(self):
+        """
+        Marks the index stale after a change of the graph it cannot follow,
+        such as a removed edge.
+        """
+
+        self._stale = True
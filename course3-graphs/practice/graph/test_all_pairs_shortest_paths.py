@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+
+import math
+import random
+import unittest
+
+import all_pairs_shortest_paths
+import graph_util
+
+class FloydWarshallTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def build(self):
+        return all_pairs_shortest_paths.DistanceMatrix.floyd_warshall(
+                                                                    self.graph)
+
+    def random_graph(self, node_count, edge_count, directed, negative, seed):
+        generator = random.Random(seed)
+        # the weights w + p(v) - p(u) are negative now and then, but every
+        # cycle keeps the non-negative weight of its w
+        potentials = [generator.randint(0, 10) if negative else 0
+                      for i in range(node_count)]
+        for node in range(node_count):
+            self.graph.add_node(node)
+        edges = set()
+        while len(edges) < edge_count:
+            u = generator.randrange(node_count)
+            v = generator.randrange(node_count)
+            if u == v or (u, v) in edges or (v, u) in edges:
+                continue
+            edges.add((u, v))
+            weight = generator.randint(0, 20)
+            if directed:
+                self.graph.add_directed_edge(u,
+                                             v,
+                                             weight + potentials[v] -
+                                             potentials[u])
+            else:
+                self.graph.add_undirected_edge(u, v, weight)
+
+    def assert_matrix(self, matrix):
+        self.assertEqual(len(self.graph.nodes()), matrix.node_count)
+        for source in self.graph.nodes():
+            distance_map, predecessor_map, negative_cycle_nodes = \
+                    self.util.bellman_ford_shortest_paths(self.graph, source)
+
+            self.assertEqual(distance_map, matrix.distance_map(source))
+
+    def test_empty_graph(self):
+        matrix = self.build()
+
+        self.assertEqual(0, matrix.node_count)
+        self.assertEqual(0, len(matrix.distances))
+
+    def test_directed_chain(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 1)
+        self.graph.add_directed_edge('B', 'C', -2)
+        self.graph.add_directed_edge('C', 'D', 3)
+        self.graph.add_directed_edge('A', 'D', 7)
+
+        matrix = self.build()
+
+        self.assertEqual(2, matrix.distance('A', 'D'))
+        self.assertEqual(-1, matrix.distance('A', 'C'))
+        self.assertEqual(0, matrix.distance('D', 'D'))
+        self.assertEqual(math.inf, matrix.distance('D', 'A'))
+        self.assertEqual([ 0, 1, -1, 2 ], list(matrix.row('A')))
+
+    def test_nonexisting_node(self):
+        self.graph.add_node('A')
+
+        matrix = self.build()
+
+        with self.assertRaisesRegex(ValueError, 'Node B not in the graph.'):
+            matrix.distance('A', 'B')
+
+    def test_negative_cycle(self):
+        for node in [ 'A', 'B', 'C' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 1)
+        self.graph.add_directed_edge('B', 'C', -3)
+        self.graph.add_directed_edge('C', 'A', 1)
+
+        with self.assertRaisesRegex(ValueError,
+                                    'The graph has a negative cycle.'):
+            self.build()
+
+    def test_random_directed_graph(self):
+        self.random_graph(30, 90, True, False, 1)
+
+        self.assert_matrix(self.build())
+
+    def test_random_directed_graph_with_negative_weights(self):
+        self.random_graph(30, 90, True, True, 2)
+
+        self.assert_matrix(self.build())
+
+    def test_random_undirected_graph(self):
+        self.random_graph(30, 60, False, False, 3)
+
+        self.assert_matrix(self.build())
+
+    def test_csr_graph(self):
+        self.random_graph(20, 50, True, True, 4)
+        expected_matrix = self.build()
+
+        self.graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        self.assertEqual(expected_matrix.distances, self.build().distances)
+
+class PurePythonFloydWarshallTestCase(unittest.TestCase):
+
+    def test_pure_python_against_vectorized(self):
+        if all_pairs_shortest_paths.numpy is None:
+            self.skipTest('NumPy is not installed.')
+
+        graph = graph_util.Graph()
+        generator = random.Random(1)
+        for node in range(30):
+            graph.add_node(node)
+        for u in range(30):
+            for v in range(u + 1, 30):
+                if generator.random() < 0.3:
+                    graph.add_directed_edge(u, v, generator.randint(-5, 20))
+
+        nodes, index_neighbors, index_weights = graph.interned()
+        matrix_class = all_pairs_shortest_paths.DistanceMatrix
+
+        self.assertEqual(
+            matrix_class._floyd_warshall_rows(index_neighbors, index_weights),
+            matrix_class._floyd_warshall_vectorized(index_neighbors,
+                                                    index_weights))
+
+class JohnsonTestCase(FloydWarshallTestCase):
+
+    def build(self):
+        return all_pairs_shortest_paths.DistanceMatrix.johnson(self.graph)
+
+    def test_workers(self):
+        self.random_graph(40, 120, True, True, 5)
+
+        matrix = all_pairs_shortest_paths.DistanceMatrix.johnson(self.graph,
+                                                                 workers=2)
+
+        self.assertEqual(self.build().distances, matrix.distances)
+
+class BuildTestCase(FloydWarshallTestCase):
+
+    def build(self):
+        return all_pairs_shortest_paths.DistanceMatrix.build(self.graph)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+
+import math
+import os
+import random
+import tempfile
+import unittest
+
+import contraction_hierarchy
+import graph_util
+
+class ContractionHierarchyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def random_graph(self, node_count, edge_count, directed, seed):
+        generator = random.Random(seed)
+        for node in range(node_count):
+            self.graph.add_node(node)
+        edges = set()
+        while len(edges) < edge_count:
+            u = generator.randrange(node_count)
+            v = generator.randrange(node_count)
+            if u == v or (u, v) in edges or (v, u) in edges:
+                continue
+            edges.add((u, v))
+            weight = generator.randint(0, 20)
+            if directed:
+                self.graph.add_directed_edge(u, v, weight)
+            else:
+                self.graph.add_undirected_edge(u, v, weight)
+
+    def assert_path(self, source, target, distance, path):
+        total = 0
+        node = source
+        for next_node in path:
+            total += self.graph.weight((node, next_node))
+            node = next_node
+        if len(path) > 0:
+            self.assertEqual(target, path[-1])
+        self.assertEqual(distance, total)
+
+    def assert_queries(self, hierarchy):
+        for source in self.graph.nodes():
+            distance_map, predecessor_map = \
+                         self.util.dijkstra_shortest_paths(self.graph, source)
+            for target in self.graph.nodes():
+                self.assertEqual(distance_map[target],
+                                 hierarchy.distance(source, target))
+
+                distance, path = hierarchy.shortest_path(source, target)
+
+                self.assertEqual(distance_map[target], distance)
+                if distance != math.inf:
+                    self.assert_path(source, target, distance, path)
+                else:
+                    self.assertEqual([], path)
+
+    def test_empty_graph(self):
+        hierarchy = contraction_hierarchy.ContractionHierarchy.build(
+                                                                     self.graph)
+
+        self.assertEqual(0, hierarchy.shortcut_count)
+
+    def test_nonexisting_node(self):
+        self.graph.add_node('A')
+
+        hierarchy = contraction_hierarchy.ContractionHierarchy.build(
+                                                                     self.graph)
+
+        with self.assertRaisesRegex(KeyError, "'B'"):
+            hierarchy.distance('A', 'B')
+
+    def test_negative_weight(self):
+        self.graph.add_node('A')
+        self.graph.add_node('B')
+        self.graph.add_directed_edge('A', 'B', -1)
+
+        with self.assertRaisesRegex(ValueError,
+                                    r'Edge \(A, B\) has a negative weight.'):
+            contraction_hierarchy.ContractionHierarchy.build(self.graph)
+
+    def test_chain_with_shortcut(self):
+        for node in [ 'A', 'B', 'C' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 1)
+        self.graph.add_directed_edge('B', 'C', 2)
+
+        hierarchy = contraction_hierarchy.ContractionHierarchy.build(
+                                                                     self.graph)
+
+        self.assertEqual(0, hierarchy.distance('A', 'A'))
+        self.assertEqual(3, hierarchy.distance('A', 'C'))
+        self.assertEqual(math.inf, hierarchy.distance('C', 'A'))
+        self.assertEqual((3, [ 'B', 'C' ]), hierarchy.shortest_path('A', 'C'))
+        self.assertEqual((math.inf, []), hierarchy.shortest_path('C', 'A'))
+
+    def test_random_directed_graph(self):
+        self.random_graph(40, 120, True, 1)
+
+        hierarchy = contraction_hierarchy.ContractionHierarchy.build(
+                                                                     self.graph)
+
+        self.assert_queries(hierarchy)
+
+    def test_random_undirected_graph(self):
+        self.random_graph(40, 80, False, 2)
+
+        hierarchy = contraction_hierarchy.ContractionHierarchy.build(
+                                                                     self.graph)
+
+        self.assert_queries(hierarchy)
+
+    def test_random_graph_with_limited_witness_search(self):
+        self.random_graph(40, 120, True, 3)
+
+        class LimitedContractionHierarchy(
+                                  contraction_hierarchy.ContractionHierarchy):
+            WITNESS_SETTLED_LIMIT = 1
+
+        hierarchy = LimitedContractionHierarchy.build(self.graph)
+
+        self.assert_queries(hierarchy)
+
+    def test_save_and_load(self):
+        self.random_graph(20, 40, True, 4)
+
+        hierarchy = contraction_hierarchy.ContractionHierarchy.build(
+                                                                     self.graph)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'graph.ch')
+            hierarchy.save(path)
+            loaded_hierarchy = \
+                      contraction_hierarchy.ContractionHierarchy.load(path)
+
+        self.assertEqual(hierarchy.shortcut_count,
+                         loaded_hierarchy.shortcut_count)
+        for node in self.graph.nodes():
+            self.assertEqual(hierarchy.rank(node), loaded_hierarchy.rank(node))
+        self.assert_queries(loaded_hierarchy)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 #!/usr/bin/python3
 
+import array
 import collections
+import json
 import math
+import os
+import random
+import tempfile
 import unittest
 
 import graph_util
@@ -260,6 +265,648 @@ class GraphTestCase(unittest.TestCase):
         self.assertTrue(self.graph.has_node(node1))
         self.assertTrue(self.graph.has_node(node2))
 
+    def test_interned(self):
+        for node in [ (0, 0), (0, 1), (1, 0) ]:
+            self.graph.add_node(node)
+
+        self.graph.add_directed_edge((0, 0), (1, 0), 2)
+        self.graph.add_undirected_edge((0, 1), (0, 0), 5)
+
+        nodes, index_neighbors, index_weights = self.graph.interned()
+
+        self.assertEqual([ (0, 0), (0, 1), (1, 0) ], nodes)
+        self.assertEqual([ [ 2, 1 ], [ 0 ], [] ], index_neighbors)
+        self.assertEqual([ [ 2, 5 ], [ 5 ], [] ], index_weights)
+        self.assertEqual(1, self.graph.index((0, 1)))
+        self.assertEqual((1, 0), self.graph.node(2))
+
+    def test_index_of_nonexisting_node(self):
+        with self.assertRaises(KeyError):
+            self.graph.index('a')
+
+    def test_version(self):
+        versions = [ self.graph.version ]
+
+        self.graph.add_node('a')
+        versions.append(self.graph.version)
+        self.graph.add_node('b')
+        versions.append(self.graph.version)
+        self.graph.add_directed_edge('a', 'b')
+        versions.append(self.graph.version)
+        self.graph.add_node('c')
+        versions.append(self.graph.version)
+        self.graph.add_undirected_edge('a', 'c')
+        versions.append(self.graph.version)
+
+        self.assertEqual(len(versions), len(set(versions)))
+        self.assertNotEqual(graph_util.Graph().version, self.graph.version)
+
+    def test_version_after_failed_change(self):
+        self.graph.add_node('a')
+        version = self.graph.version
+
+        with self.assertRaises(ValueError):
+            self.graph.add_node('a')
+        with self.assertRaises(ValueError):
+            self.graph.add_directed_edge('a', 'b')
+
+        self.assertEqual(version, self.graph.version)
+
+class GraphFromEdgeArraysTestCase(unittest.TestCase):
+
+    def test_directed_edges(self):
+        graph = graph_util.Graph.from_edge_arrays(4,
+                                                  [ 1, 4, 2, 1 ],
+                                                  [ 2, 1, 3, 3 ],
+                                                  [ 1, 2, 2, 5 ])
+
+        Util.assert_items(self, [ 1, 2, 3, 4 ], graph.nodes())
+        self.assertEqual([ 2, 3 ], graph.neighbors(1))
+        self.assertEqual([ 1 ], graph.neighbors(4))
+        self.assertEqual(5, graph.weight((1, 3)))
+        self.assertEqual(4, len(graph.edges()))
+        self.assertEqual(([ 1, 2, 3, 4 ],
+                          [ [ 1, 2 ], [ 2 ], [], [ 0 ] ],
+                          [ [ 1, 5 ], [ 2 ], [], [ 2 ] ]),
+                         graph.interned())
+
+    def test_undirected_edges_without_weights(self):
+        graph = graph_util.Graph.from_edge_arrays(3,
+                                                  array.array('q', [ 1, 2 ]),
+                                                  array.array('q', [ 2, 3 ]),
+                                                  directed=False)
+
+        Util.assert_items(self, [ 1, 3 ], graph.neighbors(2))
+        self.assertEqual(0, graph.weight((3, 2)))
+        self.assertEqual(4, len(graph.edges()))
+
+    def test_first_node(self):
+        graph = graph_util.Graph.from_edge_arrays(2, [ 0 ], [ 1 ],
+                                                  first_node=0)
+
+        Util.assert_items(self, [ 0, 1 ], graph.nodes())
+        self.assertEqual([ 1 ], graph.neighbors(0))
+
+    def test_same_as_added_edges(self):
+        generator = random.Random(1)
+        sources = [generator.randint(1, 20) for i in range(50)]
+        targets = [generator.randint(1, 20) for i in range(50)]
+        edges = {}
+        for u, v in zip(sources, targets):
+            if u != v and (u, v) not in edges and (v, u) not in edges:
+                edges[(u, v)] = generator.randint(0, 9)
+
+        expected_graph = graph_util.Graph()
+        for node in range(1, 21):
+            expected_graph.add_node(node)
+        for (u, v), weight in edges.items():
+            expected_graph.add_undirected_edge(u, v, weight)
+
+        graph = graph_util.Graph.from_edge_arrays(
+                                           20,
+                                           [ u for u, v in edges ],
+                                           [ v for u, v in edges ],
+                                           [ x for x in edges.values() ],
+                                           directed=False,
+                                           check_duplicates=True)
+
+        self.assertEqual(expected_graph.edges(), graph.edges())
+        for node in range(1, 21):
+            self.assertEqual(sorted(expected_graph.neighbors(node)),
+                             sorted(graph.neighbors(node)))
+        self.assertEqual(
+            graph_util.GraphUtil().dijkstra_shortest_paths(expected_graph,
+                                                           1)[0],
+            graph_util.GraphUtil().dijkstra_shortest_paths(graph, 1)[0])
+
+    def test_duplicate_edge(self):
+        with self.assertRaisesRegex(ValueError,
+                                    'Edge \\(2, 1\\) already in graph.'):
+            graph_util.Graph.from_edge_arrays(2,
+                                              [ 1, 2 ],
+                                              [ 2, 1 ],
+                                              directed=False,
+                                              check_duplicates=True)
+
+    def test_nonexisting_node(self):
+        with self.assertRaisesRegex(ValueError, 'Node 3 not in the graph.'):
+            graph_util.Graph.from_edge_arrays(2, [ 1, 2 ], [ 2, 3 ])
+
+    def test_wrong_lengths(self):
+        with self.assertRaisesRegex(ValueError,
+                                    'Expected 2 targets and weights.'):
+            graph_util.Graph.from_edge_arrays(2, [ 1, 2 ], [ 2 ])
+
+    def test_parse_integers(self):
+        numbers = graph_util.Graph.parse_integers(b'4 2\n1 2 -7\n  3 4 0\n')
+
+        self.assertEqual([ 4, 2, 1, 2, -7, 3, 4, 0 ], list(numbers))
+        self.assertEqual([ 1, 3 ], list(numbers[2::3]))
+
+class CSRGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = graph_util.Graph()
+        for node in [ 'a', 'b', 'c', 'd' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('a', 'b', 1)
+        self.graph.add_undirected_edge('b', 'c', 2)
+        self.graph.add_directed_edge('c', 'd', 3)
+
+    def tearDown(self):
+        pass
+
+    def test_from_empty_graph(self):
+        csr_graph = graph_util.CSRGraph.from_graph(graph_util.Graph())
+
+        self.assertEqual(0, csr_graph.node_count)
+        self.assertEqual(0, csr_graph.edge_count)
+        self.assertEqual([ 0 ], list(csr_graph.offsets))
+        Util.assert_items(self, [], csr_graph.nodes())
+        Util.assert_items(self, [], csr_graph.edges())
+
+    def test_from_graph(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        self.assertEqual(4, csr_graph.node_count)
+        self.assertEqual(4, csr_graph.edge_count)
+        self.assertEqual([ 0, 1, 2, 4, 4 ], list(csr_graph.offsets))
+        self.assertEqual([ 1, 2, 1, 3 ], list(csr_graph.targets))
+        self.assertEqual([ 1, 2, 2, 3 ], list(csr_graph.weights))
+        self.assertEqual('q', csr_graph.weights.typecode)
+        Util.assert_items(self, [ 'a', 'b', 'c', 'd' ], csr_graph.nodes())
+        Util.assert_items(self,
+                          [ ('a', 'b'), ('b', 'c'), ('c', 'b'), ('c', 'd') ],
+                          list(csr_graph.edges()))
+        self.assertEqual(repr(self.graph), repr(csr_graph))
+
+    def test_from_graph_with_float_weights(self):
+        self.graph.add_directed_edge('d', 'a', 0.5)
+
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        self.assertEqual('d', csr_graph.weights.typecode)
+        self.assertEqual(0.5, csr_graph.weight(('d', 'a')))
+        self.assertEqual(3, csr_graph.weight(('c', 'd')))
+
+    def test_from_edges_as_directed(self):
+        csr_graph = graph_util.CSRGraph.from_edges(
+                                                 [ 'a', 'b', 'c' ],
+                                                 [ ('b', 'c', 2),
+                                                   ('a', 'b', 1),
+                                                   ('b', 'a', 3) ])
+
+        self.assertEqual([ 0, 1, 3, 3 ], list(csr_graph.offsets))
+        self.assertEqual([ 'b' ], csr_graph.neighbors('a'))
+        self.assertEqual([ 'c', 'a' ], csr_graph.neighbors('b'))
+        self.assertEqual([], csr_graph.neighbors('c'))
+        self.assertEqual(1, csr_graph.weight(('a', 'b')))
+        self.assertEqual(2, csr_graph.weight(('b', 'c')))
+        self.assertEqual(3, csr_graph.weight(('b', 'a')))
+
+    def test_from_edges_as_undirected_with_node_range(self):
+        csr_graph = graph_util.CSRGraph.from_edges(range(1, 4),
+                                                   [ (1, 2, 5), (2, 3, 6) ],
+                                                   directed=False)
+
+        self.assertEqual(range(1, 4), csr_graph.nodes())
+        self.assertEqual([ 2 ], csr_graph.neighbors(1))
+        self.assertEqual([ 1, 3 ], csr_graph.neighbors(2))
+        self.assertEqual([ 2 ], csr_graph.neighbors(3))
+        self.assertEqual(5, csr_graph.weight((2, 1)))
+        self.assertEqual(6, csr_graph.weight((3, 2)))
+        self.assertEqual(2, csr_graph.index(3))
+        self.assertEqual(3, csr_graph.node(2))
+
+    def test_from_edges_with_nonexisting_node(self):
+        with self.assertRaisesRegex(ValueError, 'Node c not in the graph.'):
+            graph_util.CSRGraph.from_edges([ 'a', 'b' ], [ ('a', 'c', 1) ])
+
+    def test_constructor_with_wrong_offsets(self):
+        with self.assertRaisesRegex(ValueError, 'Expected 3 offsets, got 2.'):
+            graph_util.CSRGraph([ 'a', 'b' ],
+                                array.array('q', [ 0, 0 ]),
+                                array.array('i'),
+                                array.array('q'))
+
+    def test_constructor_with_duplicate_node(self):
+        with self.assertRaisesRegex(ValueError,
+                                    'Node a already in the graph.'):
+            graph_util.CSRGraph([ 'a', 'a' ],
+                                array.array('q', [ 0, 0, 0 ]),
+                                array.array('i'),
+                                array.array('q'))
+
+    def test_has_node(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        self.assertTrue(csr_graph.has_node('a'))
+        self.assertFalse(csr_graph.has_node('e'))
+
+    def test_neighbors_of_nonexisting_node(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        with self.assertRaisesRegex(KeyError, "'e'"):
+            csr_graph.neighbors('e')
+
+    def test_weighted_neighbors(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        for graph in [ self.graph, csr_graph ]:
+            self.assertEqual([ ('b', 2), ('d', 3) ],
+                             list(graph.weighted_neighbors('c')))
+            self.assertEqual([], list(graph.weighted_neighbors('d')))
+            Util.assert_items(self,
+                              [ ('a', 'b', 1),
+                                ('b', 'c', 2),
+                                ('c', 'b', 2),
+                                ('c', 'd', 3) ],
+                              list(graph.weighted_edges()))
+
+    def test_weight_of_nonexisting_edge(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        with self.assertRaisesRegex(KeyError, "\\('a', 'c'\\)"):
+            csr_graph.weight(('a', 'c'))
+
+    def test_interned(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        nodes, index_neighbors, index_weights = csr_graph.interned()
+
+        self.assertEqual(self.graph.interned(),
+                         (list(nodes),
+                          [ list(x) for x in index_neighbors ],
+                          [ list(x) for x in index_weights ]))
+        self.assertEqual(4, len(index_neighbors))
+        self.assertEqual([ 1, 3 ], list(index_neighbors[2]))
+        self.assertEqual([ 2, 3 ], list(index_weights[2]))
+        with self.assertRaises(IndexError):
+            index_neighbors[4]
+
+    def test_edges_contains(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        self.assertTrue(('c', 'b') in csr_graph.edges())
+        self.assertFalse(('a', 'c') in csr_graph.edges())
+        self.assertFalse(('a', 'e') in csr_graph.edges())
+
+    def test_memoryview_buffers(self):
+        graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        csr_graph = graph_util.CSRGraph([ 'a', 'b', 'c', 'd' ],
+                                        memoryview(graph.offsets),
+                                        memoryview(graph.targets),
+                                        memoryview(graph.weights))
+
+        self.assertEqual([ 'b', 'd' ], csr_graph.neighbors('c'))
+        self.assertEqual(3, csr_graph.weight(('c', 'd')))
+        self.assertTrue(('c', 'b') in csr_graph.edges())
+        self.assertFalse(('a', 'c') in csr_graph.edges())
+
+class CSRGraphFileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'graph.csr')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_from_edge_list(self):
+        csr_graph = graph_util.CSRGraph.from_edge_list([ '4 3',
+                                                         '1 2 7',
+                                                         '2 4 -1',
+                                                         '1 3 2',
+                                                         '1 4' ])
+
+        self.assertEqual(range(1, 5), csr_graph.nodes())
+        self.assertEqual([ 2, 3 ], csr_graph.neighbors(1))
+        self.assertEqual(-1, csr_graph.weight((2, 4)))
+        self.assertEqual(3, csr_graph.edge_count)
+
+    def test_from_edge_list_without_weights_as_undirected(self):
+        csr_graph = graph_util.CSRGraph.from_edge_list([ '3 2',
+                                                         '1 2',
+                                                         '2 3' ],
+                                                       directed=False)
+
+        self.assertEqual([ 1, 3 ], csr_graph.neighbors(2))
+        self.assertEqual(0, csr_graph.weight((3, 2)))
+
+    def test_save_and_load(self):
+        csr_graph = graph_util.CSRGraph.from_edges(range(1, 5),
+                                                   [ (1, 2, 1),
+                                                     (4, 1, 2),
+                                                     (2, 3, 2),
+                                                     (1, 3, 5) ])
+
+        csr_graph.save(self.path)
+        loaded_graph = graph_util.CSRGraph.load(self.path)
+
+        self.assertEqual(range(1, 5), loaded_graph.nodes())
+        self.assertEqual(list(csr_graph.offsets), list(loaded_graph.offsets))
+        self.assertEqual(list(csr_graph.targets), list(loaded_graph.targets))
+        self.assertEqual(list(csr_graph.weights), list(loaded_graph.weights))
+        self.assertEqual(5, loaded_graph.weight((1, 3)))
+        # the rows are views of the mapped buffers, not copies
+        self.assertIsInstance(loaded_graph.interned()[1][0], memoryview)
+        self.assertEqual(
+            ({ 1: 0, 2: 1, 3: 3, 4: math.inf },
+             { 1: None, 2: 1, 3: 2, 4: None }),
+            graph_util.GraphUtil().dijkstra_shortest_paths(loaded_graph, 1))
+
+    def test_save_and_load_with_float_weights(self):
+        csr_graph = graph_util.CSRGraph.from_edges(range(3),
+                                                   [ (0, 1, 0.5),
+                                                     (1, 2, 1.5),
+                                                     (2, 0, 2.5) ])
+
+        csr_graph.save(self.path)
+        loaded_graph = graph_util.CSRGraph.load(self.path)
+
+        self.assertEqual('d', loaded_graph.weights.format)
+        self.assertEqual(1.5, loaded_graph.weight((1, 2)))
+
+    def test_save_and_load_empty_graph(self):
+        graph_util.CSRGraph.from_edges(range(0), []).save(self.path)
+
+        loaded_graph = graph_util.CSRGraph.load(self.path)
+
+        self.assertEqual(0, loaded_graph.node_count)
+        self.assertEqual(0, loaded_graph.edge_count)
+
+    def test_convert(self):
+        text_path = os.path.join(self.directory.name, 'graph.txt')
+        with open(text_path, 'w') as f:
+            f.write('3 2\n1 2\n2 3\n1 3\n')
+
+        graph_util.CSRGraph.convert(text_path, self.path, directed=False)
+        loaded_graph = graph_util.CSRGraph.load(self.path)
+
+        self.assertEqual([ 1, 3 ], loaded_graph.neighbors(2))
+        self.assertEqual(2, graph_util.GraphUtil().shortest_path_tree(
+                                                      loaded_graph, 1)[0][3])
+
+    def test_save_with_nodes_out_of_range(self):
+        csr_graph = graph_util.CSRGraph.from_edges([ 'a', 'b' ], [])
+
+        with self.assertRaisesRegex(
+            ValueError, 'The nodes must be a range with the step 1.'):
+            csr_graph.save(self.path)
+
+    def test_load_other_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'4 4\n1 2 1\n4 1 2\n2 3 2\n1 3 5\n1 3\n')
+
+        with self.assertRaisesRegex(ValueError, 'Not a graph file: '):
+            graph_util.CSRGraph.load(self.path)
+
+    def test_load_empty_file(self):
+        open(self.path, 'wb').close()
+
+        with self.assertRaisesRegex(ValueError, 'Not a graph file: '):
+            graph_util.CSRGraph.load(self.path)
+
+    def test_load_truncated_file(self):
+        graph_util.CSRGraph.from_edges(range(2), [ (0, 1, 1) ]).save(self.path)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 8)
+
+        with self.assertRaisesRegex(ValueError, 'Truncated graph file: '):
+            graph_util.CSRGraph.load(self.path)
+
+class DirectedAcyclicGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.DirectedAcyclicGraph()
+
+    def tearDown(self):
+        pass
+
+    def assert_order(self):
+        order = self.graph.topological_order()
+
+        Util.assert_items(self, self.graph.nodes(), order)
+        for position, node in enumerate(order):
+            self.assertEqual(position, self.graph.position(node))
+        for u, v in self.graph.edges():
+            self.assertLess(self.graph.position(u), self.graph.position(v))
+
+    def test_empty_graph(self):
+        self.assertEqual([], self.graph.topological_order())
+        self.assertEqual([], self.util.topological_sort(self.graph))
+        self.assertFalse(self.util.has_cycle(self.graph))
+
+    def test_nodes_keep_insertion_order(self):
+        for node in [ 'C', 'A', 'B' ]:
+            self.graph.add_node(node)
+
+        self.assertEqual([ 'C', 'A', 'B' ], self.graph.topological_order())
+
+    def test_edge_against_order(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B')
+
+        self.graph.add_directed_edge('D', 'A')
+
+        # only the nodes between A and D move, into their own positions
+        self.assertEqual([ 'D', 'A', 'C', 'B' ],
+                         self.graph.topological_order())
+        self.assertEqual([ 'D', 'A', 'C', 'B' ],
+                         self.util.topological_sort(self.graph))
+        self.assert_order()
+
+    def test_edge_closing_cycle(self):
+        for node in [ 'A', 'B', 'C' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B')
+        self.graph.add_directed_edge('B', 'C')
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Edge \\(C, A\\) would close a cycle.'):
+            self.graph.add_directed_edge('C', 'A')
+
+        self.assertFalse(('C', 'A') in self.graph.edges())
+        self.assertEqual([], self.graph.neighbors('C'))
+        self.assert_order()
+
+    def test_loop(self):
+        self.graph.add_node('A')
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Edge \\(A, A\\) would close a cycle.'):
+            self.graph.add_directed_edge('A', 'A')
+
+    def test_undirected_edge(self):
+        self.graph.add_node('A')
+        self.graph.add_node('B')
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Edge \\(A, B\\) would close a cycle.'):
+            self.graph.add_undirected_edge('A', 'B')
+
+    def test_from_edge_arrays(self):
+        self.graph = graph_util.DirectedAcyclicGraph.from_edge_arrays(
+                                                                4,
+                                                                [ 3, 1, 4 ],
+                                                                [ 1, 2, 2 ])
+
+        self.assertEqual([ 3, 4, 1, 2 ], self.graph.topological_order())
+        self.assert_order()
+
+        self.graph.add_directed_edge(1, 4)
+
+        self.assertEqual([ 3, 1, 4, 2 ], self.graph.topological_order())
+        self.assert_order()
+        with self.assertRaisesRegex(ValueError,
+                                    'Edge \\(2, 3\\) would close a cycle.'):
+            self.graph.add_directed_edge(2, 3)
+
+    def test_from_edge_arrays_closing_cycle(self):
+        with self.assertRaisesRegex(ValueError, 'The edges close a cycle.'):
+            graph_util.DirectedAcyclicGraph.from_edge_arrays(2,
+                                                             [ 1, 2 ],
+                                                             [ 2, 1 ])
+        with self.assertRaisesRegex(ValueError, 'The edges close a cycle.'):
+            graph_util.DirectedAcyclicGraph.from_edge_arrays(2,
+                                                             [ 1 ],
+                                                             [ 2 ],
+                                                             directed=False)
+
+    def test_existing_edge(self):
+        self.graph.add_node('A')
+        self.graph.add_node('B')
+        self.graph.add_directed_edge('A', 'B')
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Edge \\(A, B\\) already in graph.'):
+            self.graph.add_directed_edge('A', 'B')
+
+    def test_nonexisting_node(self):
+        self.graph.add_node('A')
+
+        with self.assertRaisesRegex(ValueError, 'Node B not in the graph.'):
+            self.graph.add_directed_edge('B', 'A')
+
+    def test_random_edges(self):
+        generator = random.Random(1)
+        for node in range(50):
+            self.graph.add_node(node)
+
+        for i in range(400):
+            u = generator.randrange(50)
+            v = generator.randrange(50)
+            if u == v or (u, v) in self.graph.edges():
+                continue
+
+            try:
+                self.graph.add_directed_edge(u, v)
+            except ValueError:
+                self.assertTrue(self.util.reaches(self.graph, v, u))
+
+        self.assertGreater(len(self.graph.edges()), 100)
+        self.assert_order()
+        self.assertEqual(self.graph.topological_order(),
+                         self.util.topological_sort(self.graph))
+
+class ConnectivityTrackerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def random_edges(self, node_count, edge_count, seed):
+        generator = random.Random(seed)
+        edges = []
+        while len(edges) < edge_count:
+            u, v = generator.sample(range(node_count), 2)
+            if (u, v) not in edges and (v, u) not in edges:
+                edges.append((u, v))
+
+        return edges
+
+    def test_tracks_existing_graph(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge('A', 'C')
+
+        tracker = self.graph.track_connectivity()
+
+        self.assertIs(tracker, self.graph.connectivity)
+        self.assertIs(tracker, self.graph.track_connectivity())
+        self.assertEqual(3, tracker.component_count)
+        self.assertTrue(tracker.connected('C', 'A'))
+        self.assertFalse(tracker.connected('A', 'B'))
+        self.assertEqual(2, tracker.component_size('A'))
+        self.assertEqual([ 'A', 'C' ], tracker.component('C'))
+        self.assertEqual({ 'A': 1, 'B': 2, 'C': 1, 'D': 3 },
+                         tracker.component_numbers())
+
+    def test_directed_edge_in_existing_graph(self):
+        self.graph.add_node('A')
+        self.graph.add_node('B')
+        self.graph.add_directed_edge('A', 'B')
+
+        with self.assertRaisesRegex(ValueError, 'Edge \\(A, B\\) is directed.'):
+            self.graph.track_connectivity()
+
+    def test_directed_edge_detaches_tracker(self):
+        self.graph.add_node('A')
+        self.graph.add_node('B')
+        self.graph.track_connectivity()
+
+        self.graph.add_directed_edge('A', 'B')
+
+        self.assertEqual(None, self.graph.connectivity)
+        self.assertFalse(self.util.reaches(self.graph, 'B', 'A'))
+
+    def test_nonexisting_node(self):
+        self.graph.add_node('A')
+        self.graph.track_connectivity()
+
+        self.assertTrue(self.util.reaches(self.graph, 'B', 'B'))
+        self.assertFalse(self.util.reaches(self.graph, 'A', 'B'))
+        self.assertEqual([ 'B' ], self.util.component(self.graph, 'B'))
+
+    def test_streamed_edges_against_traversal(self):
+        tracked_graph = graph_util.Graph()
+        tracked_graph.track_connectivity()
+        for node in range(60):
+            self.graph.add_node(node)
+            tracked_graph.add_node(node)
+
+        for u, v in self.random_edges(60, 50, 1):
+            self.graph.add_undirected_edge(u, v)
+            tracked_graph.add_undirected_edge(u, v)
+
+            self.assertEqual(self.util.count_components(self.graph),
+                             self.util.count_components(tracked_graph))
+
+        for node in range(0, 60, 7):
+            Util.assert_items(self,
+                              self.util.component(self.graph, node),
+                              self.util.component(tracked_graph, node))
+            for other in range(0, 60, 5):
+                self.assertEqual(
+                    self.util.reaches(self.graph, node, other),
+                    self.util.reaches(tracked_graph, node, other))
+
+        expected_visited, expected_count = \
+                        self.util.number_all_nodes_by_component(self.graph)
+        expected_numbers = self.util.component_id
+        visited, count = \
+                     self.util.number_all_nodes_by_component(tracked_graph)
+
+        self.assertEqual(expected_visited, visited)
+        self.assertEqual(expected_count, count)
+        self.assertEqual(expected_numbers, self.util.component_id)
+
 class ComponentTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -3697,6 +4344,88 @@ class StronglyConnectedComponentsTestCase(unittest.TestCase):
                               ]
         self.assert_components(expected_components, result)
 
+class TarjanStronglyConnectedComponentsTestCase(
+                                           StronglyConnectedComponentsTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        strongly_connected_components = self.util.strongly_connected_components
+        self.util.strongly_connected_components = \
+            lambda graph: strongly_connected_components(graph,
+                                                        algorithm='tarjan')
+
+    def test_unknown_algorithm(self):
+        util = graph_util.GraphUtil()
+
+        with self.assertRaisesRegex(ValueError, 'Unknown algorithm: gabow.'):
+            util.strongly_connected_components(self.graph, algorithm='gabow')
+
+    def test_sink_components_first(self):
+        for node in range(1, 5):
+            self.graph.add_node(node)
+        self.graph.add_directed_edge(1, 2)
+        self.graph.add_directed_edge(2, 1)
+        self.graph.add_directed_edge(2, 3)
+        self.graph.add_directed_edge(3, 4)
+
+        result = graph_util.GraphUtil().tarjan_strongly_connected_components(
+                                                                     self.graph)
+
+        self.assertEqual([ [ 4 ], [ 3 ], [ 1, 2 ] ], result)
+
+class CondensationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def test_empty_graph(self):
+        dag, components = self.util.condensation(self.graph)
+
+        Util.assert_items(self, [], dag.nodes())
+        self.assertEqual([], components)
+
+    def test_one_cycle(self):
+        for node in range(1, 4):
+            self.graph.add_node(node)
+        self.graph.add_directed_edge(1, 2)
+        self.graph.add_directed_edge(2, 3)
+        self.graph.add_directed_edge(3, 1)
+
+        dag, components = self.util.condensation(self.graph)
+
+        Util.assert_items(self, [ 0 ], dag.nodes())
+        Util.assert_items(self, [], dag.edges())
+        self.assertEqual([ [ 1, 2, 3 ] ], components)
+
+    def test_six_nodes(self):
+        for node in range(1, 7):
+            self.graph.add_node(node)
+        for u, v in [ (1, 2), (2, 3), (3, 1), (3, 4), (4, 5), (5, 4),
+                      (6, 5), (2, 4) ]:
+            self.graph.add_directed_edge(u, v)
+
+        dag, components = self.util.condensation(self.graph)
+
+        self.assertEqual(3, len(components))
+        component_map = {}
+        for i, component in enumerate(components):
+            for node in component:
+                component_map[node] = i
+        self.assertEqual(component_map[1], component_map[2])
+        self.assertEqual(component_map[1], component_map[3])
+        self.assertEqual(component_map[4], component_map[5])
+        Util.assert_items(self,
+                          [ (component_map[1], component_map[4]),
+                            (component_map[6], component_map[4]) ],
+                          dag.edges())
+        for u, v in dag.edges():
+            self.assertTrue(u < v)
+
 class ShortestPathTreeTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -4508,6 +5237,142 @@ class IsBipartiteTreeTestCase(unittest.TestCase):
 
         self.assertEqual(True, result)
 
+class BreadthFirstSearchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+        # A - B - C - D   E
+        # |           |
+        # F --------- G
+        for node in [ 'A', 'B', 'C', 'D', 'E', 'F', 'G' ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge('A', 'B')
+        self.graph.add_undirected_edge('B', 'C')
+        self.graph.add_undirected_edge('C', 'D')
+        self.graph.add_undirected_edge('A', 'F')
+        self.graph.add_undirected_edge('F', 'G')
+        self.graph.add_undirected_edge('G', 'D')
+
+    def tearDown(self):
+        pass
+
+    def random_graph(self, node_count, edge_count, seed):
+        random_generator = random.Random(seed)
+
+        graph = graph_util.Graph()
+        for node in range(node_count):
+            graph.add_node(node)
+        for i in range(edge_count):
+            u, v = random_generator.sample(range(node_count), 2)
+            if (u, v) not in graph.edges():
+                graph.add_directed_edge(u, v)
+
+        return graph
+
+    def assert_tree(self, graph, levels, parents):
+        for v in range(len(levels)):
+            if parents[v] != -1:
+                u = parents[v]
+                self.assertEqual(levels[u] + 1, levels[v])
+                self.assertTrue((graph.node(u), graph.node(v))
+                                in graph.edges())
+
+    def test_levels_and_parents(self):
+        levels, parents = self.util.breadth_first_search(self.graph, [ 'A' ])
+
+        self.assertEqual([ 0, 1, 2, 3, -1, 1, 2 ], list(levels))
+        self.assertEqual([ -1, 0, 1, 2, -1, 0, 5 ], list(parents))
+
+    def test_multiple_sources(self):
+        levels, parents = self.util.breadth_first_search(self.graph,
+                                                         [ 'A', 'D' ])
+
+        self.assertEqual([ 0, 1, 1, 0, -1, 1, 1 ], list(levels))
+        self.assertEqual(-1, parents[self.graph.index('D')])
+        self.assert_tree(self.graph, levels, parents)
+
+    def test_direction_optimizing_against_top_down(self):
+        for seed in range(5):
+            graph = self.random_graph(300, 3000, seed)
+
+            expected_levels, expected_parents = \
+                                  self.util.breadth_first_search(graph, [ 0 ])
+            levels, parents = self.util.breadth_first_search(
+                                                    graph,
+                                                    [ 0 ],
+                                                    direction_optimizing=True)
+
+            self.assertEqual(list(expected_levels), list(levels))
+            self.assert_tree(graph, levels, parents)
+
+    def test_direction_optimizing_switches_to_bottom_up(self):
+        graph = self.random_graph(300, 3000, 0)
+        index_neighbors = graph.interned()[1]
+        index_predecessors = self.util._reverse_index_neighbors(
+                                                               index_neighbors)
+
+        levels = array.array('l', [-1]) * 300
+        parents = array.array('l', [-1]) * 300
+        visited = bytearray(300)
+
+        # no in-edges make the bottom-up steps find nothing
+        self.util._frontier_bfs(index_neighbors,
+                                [ 0 ],
+                                levels,
+                                parents,
+                                visited,
+                                [ [] for x in index_predecessors ])
+
+        self.assertLess(sum(visited), 300)
+
+    def test_unweighted_shortest_path(self):
+        distance, path = self.util.unweighted_shortest_path(self.graph,
+                                                            'A',
+                                                            'G')
+
+        self.assertEqual(2, distance)
+        self.assertEqual([ 'F', 'G' ], path)
+
+    def test_unweighted_shortest_path_to_itself(self):
+        self.assertEqual((0, []),
+                         self.util.unweighted_shortest_path(self.graph,
+                                                            'A',
+                                                            'A'))
+
+    def test_unweighted_shortest_path_to_unreachable_node(self):
+        self.assertEqual((math.inf, []),
+                         self.util.unweighted_shortest_path(self.graph,
+                                                            'A',
+                                                            'E'))
+
+    def test_two_coloring(self):
+        coloring = self.util.two_coloring(self.graph)
+
+        self.assertEqual({ 'A': 0, 'B': 1, 'C': 0, 'D': 1, 'E': 0, 'F': 1,
+                           'G': 0 },
+                         coloring)
+
+    def test_two_coloring_of_odd_cycle_in_second_component(self):
+        for node in [ 'X', 'Y', 'Z' ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge('X', 'Y')
+        self.graph.add_undirected_edge('Y', 'Z')
+        self.graph.add_undirected_edge('Z', 'X')
+
+        self.assertEqual(None, self.util.two_coloring(self.graph))
+        self.assertFalse(self.util.is_bipartite(self.graph))
+
+    def test_csr_graph(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        self.assertEqual(
+            [ list(x) for x in self.util.breadth_first_search(self.graph,
+                                                              [ 'A' ]) ],
+            [ list(x) for x in self.util.breadth_first_search(csr_graph,
+                                                              [ 'A' ]) ])
+
 class DijkstraShortestPathsTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -4990,6 +5855,425 @@ class DijkstraShortestPathsTestCase(unittest.TestCase):
         Util.assert_items(self, expected_distance_map, distance_map)
         Util.assert_items(self, expected_predecessor_map, predecessor_map)
 
+    def random_graph(self, node_count, edge_count, maximum_weight, seed):
+        generator = random.Random(seed)
+        for node in range(node_count):
+            self.graph.add_node(node)
+        edges = set()
+        while len(edges) < edge_count:
+            u = generator.randrange(node_count)
+            v = generator.randrange(node_count)
+            if (u, v) in edges:
+                continue
+            edges.add((u, v))
+            self.graph.add_directed_edge(u,
+                                         v,
+                                         generator.randint(0, maximum_weight))
+
+    def test_queues(self):
+        for maximum_weight in [ 0, 1, 10, 100000 ]:
+            self.graph = graph_util.Graph()
+            self.random_graph(50, 200, maximum_weight, maximum_weight)
+
+            expected_distance_map, predecessor_map = \
+                self.util.dijkstra_shortest_paths(self.graph, 0, 'binary')
+
+            for queue in [ None, 'bucket', 'radix' ]:
+                distance_map, predecessor_map = \
+                    self.util.dijkstra_shortest_paths(self.graph, 0, queue)
+
+                self.assertEqual(expected_distance_map, distance_map)
+                for node, predecessor in predecessor_map.items():
+                    if predecessor is not None:
+                        self.assertEqual(
+                            distance_map[node],
+                            distance_map[predecessor] +
+                            self.graph.weight((predecessor, node)))
+
+    def test_queue_with_float_weights(self):
+        self.graph.add_node('A')
+        self.graph.add_node('B')
+        self.graph.add_directed_edge('A', 'B', 1.5)
+
+        self.assertEqual(({ 'A': 0, 'B': 1.5 }, { 'A': None, 'B': 'A' }),
+                         self.util.dijkstra_shortest_paths(self.graph, 'A'))
+        with self.assertRaisesRegex(
+            ValueError,
+            'The bucket queue requires non-negative integer weights.'):
+            self.util.dijkstra_shortest_paths(self.graph, 'A', 'bucket')
+
+    def test_unknown_queue(self):
+        self.graph.add_node('A')
+
+        with self.assertRaisesRegex(ValueError, 'Unknown queue: fibonacci.'):
+            self.util.dijkstra_shortest_paths(self.graph, 'A', 'fibonacci')
+
+class ShortestPathTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def random_graph(self, node_count, edge_count, directed, seed):
+        generator = random.Random(seed)
+        for node in range(node_count):
+            self.graph.add_node(node)
+        edges = set()
+        while len(edges) < edge_count:
+            u = generator.randrange(node_count)
+            v = generator.randrange(node_count)
+            if u == v or (u, v) in edges or (v, u) in edges:
+                continue
+            edges.add((u, v))
+            weight = generator.randint(0, 20)
+            if directed:
+                self.graph.add_directed_edge(u, v, weight)
+            else:
+                self.graph.add_undirected_edge(u, v, weight)
+
+    def assert_path(self, source, target, distance, path):
+        total = 0
+        node = source
+        for next_node in path:
+            total += self.graph.weight((node, next_node))
+            node = next_node
+        if len(path) > 0:
+            self.assertEqual(target, path[-1])
+        self.assertEqual(distance, total)
+
+    def assert_all_pairs(self, **kwargs):
+        for source in self.graph.nodes():
+            distance_map, predecessor_map = \
+                         self.util.dijkstra_shortest_paths(self.graph, source)
+            for target in self.graph.nodes():
+                distance, path = self.util.shortest_path(self.graph,
+                                                         source,
+                                                         target,
+                                                         **kwargs)
+
+                self.assertEqual(distance_map[target], distance)
+                if distance != math.inf:
+                    self.assert_path(source, target, distance, path)
+                else:
+                    self.assertEqual([], path)
+
+    def test_nonexisting_source(self):
+        self.graph.add_node('B')
+
+        with self.assertRaisesRegex(KeyError, "'A'"):
+            self.util.shortest_path(self.graph, 'A', 'B')
+
+    def test_nonexisting_target(self):
+        self.graph.add_node('A')
+
+        with self.assertRaisesRegex(KeyError, "'B'"):
+            self.util.shortest_path(self.graph, 'A', 'B')
+
+    def test_same_source_and_target(self):
+        self.graph.add_node('A')
+
+        self.assertEqual((0, []),
+                         self.util.shortest_path(self.graph, 'A', 'A'))
+
+    def test_unreachable_target(self):
+        self.graph.add_node('A')
+        self.graph.add_node('B')
+        self.graph.add_directed_edge('B', 'A', 1)
+
+        self.assertEqual((math.inf, []),
+                         self.util.shortest_path(self.graph, 'A', 'B'))
+
+    def test_directed_chain(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 1)
+        self.graph.add_directed_edge('B', 'C', 2)
+        self.graph.add_directed_edge('C', 'D', 3)
+        self.graph.add_directed_edge('A', 'D', 7)
+
+        self.assertEqual((6, [ 'B', 'C', 'D' ]),
+                         self.util.shortest_path(self.graph, 'A', 'D'))
+
+    def test_random_directed_graph(self):
+        self.random_graph(30, 90, True, 1)
+
+        self.assert_all_pairs()
+
+    def test_random_undirected_graph_with_graph_as_reverse_graph(self):
+        self.random_graph(30, 60, False, 2)
+
+        self.assert_all_pairs(reverse_graph=self.graph)
+
+    def test_reverse_graph_reused_until_change(self):
+        for node in [ 'A', 'B', 'C' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 1)
+        self.graph.add_directed_edge('B', 'C', 5)
+
+        self.util.shortest_path(self.graph, 'A', 'C')
+        reverse_graph = self.util._reverse_graph[1]
+
+        self.assertEqual((6, [ 'B', 'C' ]),
+                         self.util.shortest_path(self.graph, 'A', 'C'))
+        self.assertIs(reverse_graph, self.util._reverse_graph[1])
+
+        self.graph.add_directed_edge('A', 'C', 2)
+
+        self.assertEqual((2, [ 'C' ]),
+                         self.util.shortest_path(self.graph, 'A', 'C'))
+        self.assertIsNot(reverse_graph, self.util._reverse_graph[1])
+
+    def test_a_star_with_zero_heuristic(self):
+        self.random_graph(30, 90, True, 3)
+
+        self.assert_all_pairs(heuristic=lambda node, target: 0)
+
+    def test_a_star_with_euclidean_distance(self):
+        generator = random.Random(4)
+        points = set()
+        while len(points) < 40:
+            points.add((generator.randint(0, 50), generator.randint(0, 50)))
+        points = sorted(points)
+        for point in points:
+            self.graph.add_node(point)
+        euclidean_distance = graph_util.GraphUtil.euclidean_distance
+        for i, u in enumerate(points):
+            for v in points[i + 1:i + 4]:
+                self.graph.add_undirected_edge(u, v, euclidean_distance(u, v))
+
+        distance_map, predecessor_map = \
+                       self.util.dijkstra_shortest_paths(self.graph, points[0])
+        for target in points:
+            distance, path = self.util.shortest_path(
+                                                  self.graph,
+                                                  points[0],
+                                                  target,
+                                                  heuristic=euclidean_distance)
+
+            self.assertAlmostEqual(distance_map[target], distance)
+
+    def test_euclidean_distance(self):
+        self.assertEqual(5,
+                         graph_util.GraphUtil.euclidean_distance((0, 0),
+                                                                 (3, 4)))
+
+class MultiSourceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+        generator = random.Random(1)
+        for node in range(40):
+            self.graph.add_node(node)
+        edges = set()
+        while len(edges) < 120:
+            u = generator.randrange(40)
+            v = generator.randrange(40)
+            if u == v or (u, v) in edges:
+                continue
+            edges.add((u, v))
+            self.graph.add_directed_edge(u, v, generator.randint(0, 9))
+
+    def tearDown(self):
+        pass
+
+    def test_serial(self):
+        results = self.util.multi_source('dijkstra_shortest_paths',
+                                         self.graph,
+                                         [ 3, 1, 2 ])
+
+        self.assertEqual(
+            [ (x, self.util.dijkstra_shortest_paths(self.graph, x))
+              for x in [ 3, 1, 2 ] ],
+            [x for x in results])
+
+    def test_workers(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        for algorithm in [ 'shortest_path_tree',
+                           'dijkstra_shortest_paths',
+                           'bellman_ford_shortest_paths' ]:
+            results = self.util.multi_source(algorithm,
+                                             self.graph,
+                                             range(10),
+                                             workers=2)
+
+            expected_results = {}
+            for source in range(10):
+                method = getattr(self.util, algorithm)
+                expected_results[source] = method(csr_graph, source)
+            self.assertEqual(expected_results, dict(results))
+
+    def test_closing_results(self):
+        results = self.util.multi_source('component',
+                                         self.graph,
+                                         range(40),
+                                         workers=2)
+
+        source, component = next(results)
+        results.close()
+
+        self.assertEqual(self.util.component(self.graph, source), component)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaisesRegex(ValueError, 'Unknown algorithm: prim.'):
+            self.util.multi_source('prim', self.graph, [ 0 ])
+
+    def test_nonexisting_source(self):
+        with self.assertRaisesRegex(ValueError, 'Node 40 not in the graph.'):
+            self.util.multi_source('component', self.graph, [ 0, 40 ])
+
+class ShortestPathTreeCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = graph_util.ShortestPathTreeCache()
+        self.util = graph_util.GraphUtil(shortest_path_cache=self.cache)
+        self.graph = graph_util.Graph()
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 1)
+        self.graph.add_directed_edge('B', 'C', 2)
+        self.graph.add_directed_edge('A', 'C', 5)
+
+    def tearDown(self):
+        pass
+
+    def tree(self, node_count):
+        distance_map = {}
+        predecessor_map = {}
+        for node in range(node_count):
+            distance_map[node] = float(node)
+            predecessor_map[node] = None
+
+        return distance_map, predecessor_map
+
+    def test_cached_tree(self):
+        result = self.util.dijkstra_shortest_paths(self.graph, 'A')
+
+        self.assertIs(result,
+                      self.util.dijkstra_shortest_paths(self.graph, 'A'))
+        self.assertEqual(
+            { 'A': 0, 'B': 1, 'C': 3, 'D': math.inf }, result[0])
+        self.assertEqual(1, self.cache.size)
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+
+    def test_keys(self):
+        dijkstra_result = self.util.dijkstra_shortest_paths(self.graph, 'A')
+        radix_result = self.util.dijkstra_shortest_paths(self.graph,
+                                                         'A',
+                                                         'radix')
+        tree_result = self.util.shortest_path_tree(self.graph, 'A')
+        other_result = self.util.dijkstra_shortest_paths(self.graph, 'B')
+
+        self.assertEqual(4, self.cache.size)
+        self.assertEqual(dijkstra_result, radix_result)
+        self.assertEqual(1, tree_result[0]['C'])
+        self.assertEqual(0, other_result[0]['B'])
+
+    def test_invalidation(self):
+        self.util.dijkstra_shortest_paths(self.graph, 'A')
+
+        self.graph.add_directed_edge('C', 'D', 1)
+        distance_map, predecessor_map = \
+            self.util.dijkstra_shortest_paths(self.graph, 'A')
+
+        self.assertEqual(4, distance_map['D'])
+        self.assertEqual(0, self.cache.hits)
+
+        self.graph.add_node('E')
+        distance_map, predecessor_map = \
+            self.util.dijkstra_shortest_paths(self.graph, 'A')
+
+        self.assertEqual(math.inf, distance_map['E'])
+        self.assertEqual(0, self.cache.hits)
+
+    def test_csr_graph(self):
+        csr_graph = graph_util.CSRGraph.from_graph(self.graph)
+
+        self.assertNotEqual(self.graph.version, csr_graph.version)
+        self.assertIs(self.util.dijkstra_shortest_paths(csr_graph, 'A'),
+                      self.util.dijkstra_shortest_paths(csr_graph, 'A'))
+
+    def test_maximum_size(self):
+        cache = graph_util.ShortestPathTreeCache(maximum_size=2)
+
+        cache.put(1, 'A', 'dijkstra_shortest_paths', self.tree(1))
+        cache.put(1, 'B', 'dijkstra_shortest_paths', self.tree(2))
+        cache.get(1, 'A', 'dijkstra_shortest_paths')
+        cache.put(1, 'C', 'dijkstra_shortest_paths', self.tree(3))
+
+        self.assertEqual(2, cache.size)
+        self.assertTrue(cache.contains(1, 'A', 'dijkstra_shortest_paths'))
+        self.assertFalse(cache.contains(1, 'B', 'dijkstra_shortest_paths'))
+        self.assertTrue(cache.contains(1, 'C', 'dijkstra_shortest_paths'))
+
+    def test_memory_budget(self):
+        size = graph_util.ShortestPathTreeCache._size(self.tree(100))
+        cache = graph_util.ShortestPathTreeCache(memory_budget=2 * size)
+
+        for version in range(3):
+            cache.put(version, 0, 'dijkstra_shortest_paths', self.tree(100))
+
+        self.assertEqual(2, cache.size)
+        self.assertEqual(2 * size, cache.memory_size)
+        self.assertFalse(cache.contains(0, 0, 'dijkstra_shortest_paths'))
+
+        # a tree larger than the whole budget is not cached
+        cache.put(3, 0, 'dijkstra_shortest_paths', self.tree(1000))
+
+        self.assertEqual(2, cache.size)
+        self.assertFalse(cache.contains(3, 0, 'dijkstra_shortest_paths'))
+
+        cache.clear()
+
+        self.assertEqual(0, cache.size)
+        self.assertEqual(0, cache.memory_size)
+
+    def test_invalid_limits(self):
+        with self.assertRaisesRegex(ValueError, 'Must be memory_budget >= 0.'):
+            graph_util.ShortestPathTreeCache(memory_budget=-1)
+        with self.assertRaisesRegex(ValueError, 'Must be maximum_size >= 0.'):
+            graph_util.ShortestPathTreeCache(maximum_size=-1)
+
+    def test_reconstruct_shortest_path(self):
+        self.assertEqual([ 'B', 'C' ],
+                         self.util.reconstruct_shortest_path('A',
+                                                             'C',
+                                                             graph=self.graph))
+        self.assertEqual([],
+                         self.util.reconstruct_shortest_path('A',
+                                                             'D',
+                                                             graph=self.graph))
+        self.assertEqual(1, self.cache.misses)
+        self.assertEqual(1, self.cache.hits)
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Expected a predecessor map or a graph.'):
+            self.util.reconstruct_shortest_path('A', 'C')
+
+    def test_shortest_path(self):
+        self.util.dijkstra_shortest_paths(self.graph, 'A')
+
+        self.assertEqual((3, [ 'B', 'C' ]),
+                         self.util.shortest_path(self.graph, 'A', 'C'))
+        self.assertEqual((math.inf, []),
+                         self.util.shortest_path(self.graph, 'A', 'D'))
+        self.assertEqual(2, self.cache.hits)
+
+    def test_instrumented_graph_util(self):
+        util = graph_util.InstrumentedGraphUtil(self.cache)
+
+        util.dijkstra_shortest_paths(self.graph, 'A')
+        self.assertEqual(3, util.stats.counters['settled'])
+
+        util.dijkstra_shortest_paths(self.graph, 'A')
+        self.assertEqual(0, util.stats.counters['settled'])
+        self.assertEqual(1, self.cache.hits)
+
 class BellmanForShortestPathsTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -5571,6 +6855,126 @@ class BellmanForShortestPathsTestCase(unittest.TestCase):
         # even for a single negative_cycle_nodes.
         Util.assert_items(self, expected_predecessor_map, predecessor_map)
 
+class SpfaShortestPathsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def assert_negative_cycle(self, cycle):
+        self.assertTrue(len(cycle) > 0)
+
+        weight = 0
+        for i in range(len(cycle)):
+            weight += self.graph.weight((cycle[i],
+                                         cycle[(i + 1) % len(cycle)]))
+
+        self.assertTrue(weight < 0)
+
+    def test_graph_with_one_node(self):
+        self.graph.add_node('A')
+
+        distance_map, predecessor_map, negative_cycle, unbounded_nodes = \
+                                self.util.spfa_shortest_paths(self.graph, 'A')
+
+        self.assertEqual({ 'A': 0 }, distance_map)
+        self.assertEqual({ 'A': None }, predecessor_map)
+        self.assertEqual([], negative_cycle)
+        self.assertEqual(set(), unbounded_nodes)
+
+    def test_three_nodes_with_negative_edge(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 4)
+        self.graph.add_directed_edge('A', 'C', 2)
+        self.graph.add_directed_edge('B', 'C', -3)
+        self.graph.add_directed_edge('D', 'A', 1)
+
+        distance_map, predecessor_map, negative_cycle, unbounded_nodes = \
+                                self.util.spfa_shortest_paths(self.graph, 'A')
+
+        self.assertEqual({ 'A': 0, 'B': 4, 'C': 1, 'D': math.inf },
+                         distance_map)
+        self.assertEqual({ 'A': None, 'B': 'A', 'C': 'B', 'D': None },
+                         predecessor_map)
+        self.assertEqual([], negative_cycle)
+        self.assertEqual(set(), unbounded_nodes)
+
+    def test_negative_cycle(self):
+        for node in [ 'A', 'B', 'C', 'D', 'E' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 1)
+        self.graph.add_directed_edge('B', 'C', 1)
+        self.graph.add_directed_edge('C', 'D', -3)
+        self.graph.add_directed_edge('D', 'B', 1)
+        self.graph.add_directed_edge('D', 'E', 5)
+        self.graph.add_directed_edge('E', 'A', 1)
+
+        distance_map, predecessor_map, negative_cycle, unbounded_nodes = \
+                                self.util.spfa_shortest_paths(self.graph, 'A')
+
+        self.assert_negative_cycle(negative_cycle)
+        Util.assert_items(self, [ 'B', 'C', 'D' ], negative_cycle)
+        self.assertEqual({ 'A', 'B', 'C', 'D', 'E' }, unbounded_nodes)
+        for node in self.graph.nodes():
+            self.assertEqual(-math.inf, distance_map[node])
+
+    def test_unreachable_negative_cycle(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B', 1)
+        self.graph.add_directed_edge('C', 'D', -1)
+        self.graph.add_directed_edge('D', 'C', -1)
+
+        distance_map, predecessor_map, negative_cycle, unbounded_nodes = \
+                                self.util.spfa_shortest_paths(self.graph, 'A')
+
+        self.assertEqual({ 'A': 0, 'B': 1, 'C': math.inf, 'D': math.inf },
+                         distance_map)
+        self.assertEqual([], negative_cycle)
+        self.assertEqual(set(), unbounded_nodes)
+
+    def test_random_graphs_against_bellman_ford(self):
+        generator = random.Random(1)
+        for i in range(100):
+            self.graph = graph_util.Graph()
+            node_count = generator.randint(1, 12)
+            for node in range(node_count):
+                self.graph.add_node(node)
+            for j in range(generator.randint(0, 30)):
+                u = generator.randrange(node_count)
+                v = generator.randrange(node_count)
+                if (u, v) not in self.graph.edges():
+                    self.graph.add_directed_edge(u,
+                                                 v,
+                                                 generator.randint(-5, 10))
+
+            expected_distance_map, expected_predecessor_map, \
+                negative_cycle_nodes = \
+                     self.util.bellman_ford_shortest_paths(self.graph, 0)
+            expected_unbounded_nodes = set()
+            for node in negative_cycle_nodes:
+                expected_unbounded_nodes.update(self.util.explore(self.graph,
+                                                                  node))
+
+            distance_map, predecessor_map, negative_cycle, unbounded_nodes = \
+                                  self.util.spfa_shortest_paths(self.graph, 0)
+
+            self.assertEqual(expected_unbounded_nodes, unbounded_nodes)
+            if len(unbounded_nodes) > 0:
+                self.assert_negative_cycle(negative_cycle)
+            else:
+                self.assertEqual([], negative_cycle)
+            for node in self.graph.nodes():
+                if node in unbounded_nodes:
+                    self.assertEqual(-math.inf, distance_map[node])
+                else:
+                    self.assertEqual(expected_distance_map[node],
+                                     distance_map[node])
+
 class KruskalTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -5933,6 +7337,174 @@ class KruskalTestCase(unittest.TestCase):
                               [ node_c ])
         self.assertEqual(5, tree.weight((node_h, node_c)))
 
+class KruskalEdgesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def test_empty_graph(self):
+        sources, targets, weights = self.util.kruskal_edges(self.graph)
+
+        self.assertEqual(0, len(sources))
+        self.assertEqual(0, len(targets))
+        self.assertEqual(0, len(weights))
+
+    def test_parallel_arrays(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge('A', 'B', 4)
+        self.graph.add_undirected_edge('B', 'C', 1)
+        self.graph.add_undirected_edge('A', 'C', 2)
+        self.graph.add_undirected_edge('C', 'D', 3)
+
+        sources, targets, weights = self.util.kruskal_edges(self.graph)
+
+        self.assertEqual('i', sources.typecode)
+        self.assertEqual('i', targets.typecode)
+        self.assertEqual('q', weights.typecode)
+        self.assertEqual([ 1, 2, 3 ], list(weights))
+        Util.assert_items(self,
+                          [ ('B', 'C'), ('A', 'C'), ('C', 'D') ],
+                          [ tuple(sorted((self.graph.node(u),
+                                          self.graph.node(v))))
+                            for u, v in zip(sources, targets) ])
+
+    def test_float_weights(self):
+        for node in [ 1, 2, 3 ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge(1, 2, 0.5)
+        self.graph.add_undirected_edge(2, 3, 1.5)
+
+        sources, targets, weights = self.util.kruskal_edges(self.graph)
+
+        self.assertEqual('d', weights.typecode)
+        self.assertEqual([ 0.5, 1.5 ], list(weights))
+
+    def test_forest(self):
+        for node in [ 1, 2, 3, 4, 5 ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge(1, 2, 7)
+        self.graph.add_undirected_edge(3, 4, 5)
+        self.graph.add_undirected_edge(4, 5, 6)
+        self.graph.add_undirected_edge(3, 5, 1)
+
+        sources, targets, weights = self.util.kruskal_edges(self.graph)
+
+        self.assertEqual([ 1, 5, 7 ], list(weights))
+
+    def test_random_graphs_against_prim(self):
+        for seed in range(5):
+            random_generator = random.Random(seed)
+            graph = graph_util.Graph()
+            for node in range(40):
+                graph.add_node(node)
+            for node in range(1, 40):
+                # a random spanning tree keeps the graph connected
+                graph.add_undirected_edge(node,
+                                          random_generator.randrange(node),
+                                          random_generator.randint(1, 20))
+            for i in range(80):
+                u, v = random_generator.sample(range(40), 2)
+                if (u, v) not in graph.edges():
+                    graph.add_undirected_edge(u,
+                                              v,
+                                              random_generator.randint(1, 20))
+
+            sources, targets, weights = self.util.kruskal_edges(graph)
+            tree = self.util.prim(graph)
+
+            self.assertEqual(39, len(weights))
+            self.assertEqual(sum(tree.weight(x) for x in tree.edges()),
+                             2 * sum(weights))
+
+class SingleLinkageClusteringTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+        # two tight groups (A, B, C) and (D, E) far apart and a lone F
+        for node in [ 'A', 'B', 'C', 'D', 'E', 'F' ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge('A', 'B', 1)
+        self.graph.add_undirected_edge('B', 'C', 2)
+        self.graph.add_undirected_edge('A', 'C', 3)
+        self.graph.add_undirected_edge('D', 'E', 4)
+        self.graph.add_undirected_edge('C', 'D', 10)
+        self.graph.add_undirected_edge('E', 'F', 20)
+        self.graph.add_undirected_edge('A', 'F', 30)
+
+        self.dendrogram = self.util.single_linkage_clustering(self.graph)
+
+    def tearDown(self):
+        pass
+
+    def test_merges(self):
+        self.assertEqual([ 1, 2, 4, 10, 20 ],
+                         [ x[0] for x in self.dendrogram.merges ])
+        self.assertEqual(1, self.dendrogram.minimum_cluster_count)
+
+    def test_spacing(self):
+        self.assertEqual(None, self.dendrogram.spacing(1))
+        self.assertEqual(20, self.dendrogram.spacing(2))
+        self.assertEqual(10, self.dendrogram.spacing(3))
+        self.assertEqual(4, self.dendrogram.spacing(4))
+        self.assertEqual(2, self.dendrogram.spacing(5))
+        self.assertEqual(1, self.dendrogram.spacing(6))
+
+    def test_labels(self):
+        labels = self.dendrogram.labels(3)
+
+        self.assertEqual({ 'A': 0, 'B': 0, 'C': 0, 'D': 1, 'E': 1, 'F': 2 },
+                         labels)
+
+    def test_clusters(self):
+        self.assertEqual([ [ 'A', 'B', 'C', 'D', 'E' ], [ 'F' ] ],
+                         self.dendrogram.clusters(2))
+        self.assertEqual([ [ 'A', 'B', 'C', 'D', 'E', 'F' ] ],
+                         self.dendrogram.clusters(1))
+
+    def test_linkage(self):
+        self.assertEqual([ (0, 1, 1, 2),
+                           (6, 2, 2, 3),
+                           (3, 4, 4, 2),
+                           (7, 8, 10, 5),
+                           (9, 5, 20, 6) ],
+                         self.dendrogram.linkage())
+
+    def test_invalid_k(self):
+        with self.assertRaisesRegex(ValueError, 'Must be 1 <= k <= |V|.'):
+            self.dendrogram.spacing(0)
+        with self.assertRaisesRegex(ValueError, 'Must be 1 <= k <= |V|.'):
+            self.dendrogram.labels(7)
+
+    def test_disconnected_graph(self):
+        graph = graph_util.Graph()
+        for node in [ 1, 2, 3, 4 ]:
+            graph.add_node(node)
+        graph.add_undirected_edge(1, 2, 5)
+
+        dendrogram = self.util.single_linkage_clustering(graph)
+
+        self.assertEqual(3, dendrogram.minimum_cluster_count)
+        self.assertEqual(None, dendrogram.spacing(3))
+        self.assertEqual(5, dendrogram.spacing(4))
+        with self.assertRaisesRegex(ValueError,
+                                    'Could not form k clusters. '
+                                    'Got 3 clusters.'):
+            dendrogram.labels(2)
+
+    def test_kruskal_agrees(self):
+        tree = self.util.kruskal(self.graph)
+
+        total = sum(tree.weight(x) for x in tree.edges()) / 2
+
+        self.assertEqual(total, sum(x[0] for x in self.dendrogram.merges))
+
 class PrimTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -6235,5 +7807,527 @@ class PrimTestCase(unittest.TestCase):
         else:
             self.fail('An unexpected value of tree.neighbors(node_h).')
 
+    def test_queues(self):
+        generator = random.Random(1)
+        for node in range(40):
+            self.graph.add_node(node)
+        edges = set()
+        while len(edges) < 150:
+            u = generator.randrange(40)
+            v = generator.randrange(40)
+            if u == v or (u, v) in edges or (v, u) in edges:
+                continue
+            edges.add((u, v))
+            self.graph.add_undirected_edge(u, v, generator.randint(0, 20))
+
+        sources, targets, weights = self.util.kruskal_edges(self.graph)
+        expected_total = sum(weights)
+
+        for queue in [ None, 'binary', 'bucket' ]:
+            self.assert_tree(self.util.prim(self.graph, queue), expected_total)
+
+    def test_disconnected_graph(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge('A', 'B', 2)
+        self.graph.add_undirected_edge('C', 'D', 3)
+
+        tree = self.util.prim(self.graph)
+
+        self.assert_tree(tree, 5)
+        self.assert_neighbors(tree, 'A', [ 'B' ])
+        self.assert_neighbors(tree, 'D', [ 'C' ])
+
+    def test_radix_queue(self):
+        self.graph.add_node('A')
+
+        with self.assertRaisesRegex(
+            ValueError, 'The radix heap requires monotone priorities.'):
+            self.util.prim(self.graph, 'radix')
+
+class BoruvkaTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def random_graph(self, node_count, edge_count, maximum_weight, seed):
+        random_generator = random.Random(seed)
+        graph = graph_util.Graph()
+        for node in range(node_count):
+            graph.add_node(node)
+        edges = set()
+        while len(edges) < edge_count:
+            u, v = random_generator.sample(range(node_count), 2)
+            if (u, v) in edges or (v, u) in edges:
+                continue
+            edges.add((u, v))
+            graph.add_undirected_edge(u,
+                                      v,
+                                      random_generator.randint(
+                                                            1,
+                                                            maximum_weight))
+
+        return graph
+
+    def total_weight(self, tree):
+        return sum(tree.weight(x) for x in tree.edges()) // 2
+
+    def test_empty_graph(self):
+        tree = self.util.boruvka(self.graph)
+
+        self.assertEqual(0, len(tree.nodes()))
+        self.assertEqual(0, len(tree.edges()))
+
+    def test_graph_with_one_node(self):
+        self.graph.add_node('A')
+
+        tree = self.util.boruvka(self.graph)
+
+        Util.assert_items(self, [ 'A' ], tree.nodes())
+        self.assertEqual(0, len(tree.edges()))
+
+    def test_small_graph(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge('A', 'B', 4)
+        self.graph.add_undirected_edge('B', 'C', 1)
+        self.graph.add_undirected_edge('A', 'C', 2)
+        self.graph.add_undirected_edge('C', 'D', 3)
+
+        tree = self.util.boruvka(self.graph)
+
+        Util.assert_items(self, [ 'C' ], tree.neighbors('A'))
+        Util.assert_items(self, [ 'A', 'B', 'D' ], tree.neighbors('C'))
+        self.assertEqual(6, self.total_weight(tree))
+
+    def test_forest(self):
+        for node in [ 1, 2, 3, 4, 5 ]:
+            self.graph.add_node(node)
+        self.graph.add_undirected_edge(1, 2, 7)
+        self.graph.add_undirected_edge(3, 4, 5)
+        self.graph.add_undirected_edge(4, 5, 6)
+        self.graph.add_undirected_edge(3, 5, 1)
+
+        sources, targets, weights = self.util.boruvka_edges(self.graph)
+
+        self.assertEqual('q', weights.typecode)
+        self.assertEqual([ 1, 5, 7 ], sorted(weights))
+
+    def test_equal_weights(self):
+        # every spanning tree is minimum, and any cycle among the cheapest
+        # edges would lose one of the nodes
+        for node in range(6):
+            self.graph.add_node(node)
+        for u in range(6):
+            for v in range(u + 1, 6):
+                self.graph.add_undirected_edge(u, v, 1)
+
+        tree = self.util.boruvka(self.graph)
+
+        self.assertEqual(10, len(tree.edges()))
+        self.assertEqual(1, self.util.count_components(tree))
+        self.assertEqual(self.util.kruskal(self.graph).edges(), tree.edges())
+
+    def test_random_graphs_against_kruskal_and_prim(self):
+        for seed in range(5):
+            # few distinct weights make many ties
+            graph = self.random_graph(60, 150, 1 + seed * 10, seed)
+
+            tree = self.util.boruvka(graph)
+
+            self.assertEqual(self.util.kruskal(graph).edges(), tree.edges())
+            self.assertEqual(self.total_weight(self.util.prim(graph)),
+                             self.total_weight(tree))
+
+    def test_workers(self):
+        graph = self.random_graph(80, 200, 5, 7)
+
+        tree = self.util.boruvka(graph, workers=2)
+
+        self.assertEqual(self.util.boruvka(graph).edges(), tree.edges())
+
+    def test_vectorized_phases(self):
+        if graph_util.numpy is None:
+            self.skipTest('NumPy is not installed.')
+
+        graph = self.random_graph(60, 150, 3, 8)
+        sources, targets, weights = self.util._edge_arrays(graph)
+        order = self.util._sorted_edge_order(weights)
+        sources = array.array('i', [sources[x] for x in order])
+        targets = array.array('i', [targets[x] for x in order])
+
+        phases = []
+        vectorized_phases = []
+        for phase_list, phase_function in [
+                (phases, self.util._boruvka_phases),
+                (vectorized_phases, self.util._boruvka_phases_vectorized) ]:
+            components = graph_util.union_find.ArrayUnionFind(60)
+            for positions in phase_function(sources, targets, components):
+                phase_list.append(positions)
+                for position in positions:
+                    components.union(sources[position], targets[position])
+
+        self.assertEqual(phases, vectorized_phases)
+
+class EuclideanMinimumSpanningTreeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+
+    def tearDown(self):
+        pass
+
+    def total_weight(self, tree):
+        return sum(tree.weight(edge) for edge in tree.edges()) / 2
+
+    def complete_graph(self, points):
+        graph = graph_util.Graph()
+        for point in points:
+            graph.add_node(point)
+        for i in range(len(points)):
+            for j in range(i + 1, len(points)):
+                graph.add_undirected_edge(
+                     points[i],
+                     points[j],
+                     graph_util.GraphUtil.euclidean_distance(points[i],
+                                                             points[j]))
+
+        return graph
+
+    def random_points(self, count, seed):
+        generator = random.Random(seed)
+        points = set()
+        while len(points) < count:
+            points.add((generator.randint(-100, 100),
+                        generator.randint(-100, 100)))
+
+        return sorted(points)
+
+    def test_no_points(self):
+        tree = self.util.euclidean_minimum_spanning_tree([])
+
+        Util.assert_items(self, [], tree.nodes())
+        Util.assert_items(self, [], tree.edges())
+
+    def test_one_point(self):
+        tree = self.util.euclidean_minimum_spanning_tree([ (1, 2) ])
+
+        Util.assert_items(self, [ (1, 2) ], tree.nodes())
+        Util.assert_items(self, [], tree.edges())
+
+    def test_four_points(self):
+        points = [ (0, 0), (0, 1), (1, 0), (1, 1) ]
+
+        tree = self.util.euclidean_minimum_spanning_tree(points)
+
+        Util.assert_items(self, points, tree.nodes())
+        self.assertEqual(6, len(tree.edges()))
+        self.assertEqual(3, self.total_weight(tree))
+
+    def test_random_points_against_prim(self):
+        for seed in range(5):
+            points = self.random_points(30, seed)
+
+            tree = self.util.euclidean_minimum_spanning_tree(points)
+            expected_tree = self.util.prim(self.complete_graph(points))
+
+            self.assertEqual(2 * (len(points) - 1), len(tree.edges()))
+            self.assertEqual(1, self.util.count_components(tree))
+            self.assertAlmostEqual(self.total_weight(expected_tree),
+                                   self.total_weight(tree))
+
+    def test_pure_python_against_vectorized(self):
+        if graph_util.numpy is None:
+            self.skipTest('NumPy is not installed.')
+
+        points = self.random_points(50, 1)
+
+        self.assertEqual(self.util._dense_prim(points),
+                         self.util._dense_prim_vectorized(points))
+
+class DeepGraphTestCase(unittest.TestCase):
+
+    NODE_COUNT = 20000
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+        for node in range(self.NODE_COUNT):
+            self.graph.add_node(node)
+        for node in range(self.NODE_COUNT - 1):
+            self.graph.add_directed_edge(node, node + 1)
+
+    def tearDown(self):
+        pass
+
+    def test_explore(self):
+        previsit_nodes = []
+        postvisit_nodes = []
+
+        visited = self.util.explore(self.graph,
+                                    0,
+                                    previsit=previsit_nodes.append,
+                                    postvisit=postvisit_nodes.append)
+
+        self.assertEqual(self.NODE_COUNT, len(visited))
+        self.assertEqual(list(range(self.NODE_COUNT)), previsit_nodes)
+        self.assertEqual(list(reversed(range(self.NODE_COUNT))),
+                         postvisit_nodes)
+
+    def test_depth_first_search(self):
+        self.util.depth_first_search(self.graph)
+
+        self.assertEqual(1, self.util.preorder[0])
+        self.assertEqual(2 * self.NODE_COUNT, self.util.postorder[0])
+
+    def test_has_cycle(self):
+        self.assertFalse(self.util.has_cycle(self.graph))
+
+        self.graph.add_directed_edge(self.NODE_COUNT - 1, 0)
+
+        self.assertTrue(self.util.has_cycle(self.graph))
+
+    def test_topological_sort(self):
+        self.assertEqual(list(range(self.NODE_COUNT)),
+                         self.util.topological_sort(self.graph))
+
+    def test_strongly_connected_components(self):
+        self.assertEqual(self.NODE_COUNT,
+                         len(self.util.strongly_connected_components(
+                                                                  self.graph)))
+
+        self.graph.add_directed_edge(self.NODE_COUNT - 1, 0)
+
+        self.assertEqual(1,
+                         len(self.util.strongly_connected_components(
+                                                                  self.graph)))
+
+    def test_tarjan_strongly_connected_components(self):
+        self.assertEqual(self.NODE_COUNT,
+                         len(self.util.tarjan_strongly_connected_components(
+                                                                  self.graph)))
+
+        self.graph.add_directed_edge(self.NODE_COUNT - 1, 0)
+
+        self.assertEqual(1,
+                         len(self.util.tarjan_strongly_connected_components(
+                                                                  self.graph)))
+
+class CSRGraphAlgorithmsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+
+        self.directed_graph = graph_util.Graph()
+        self.undirected_graph = graph_util.Graph()
+        for node in range(1, 9):
+            self.directed_graph.add_node(node)
+            self.undirected_graph.add_node(node)
+        for u, v, weight in [ (1, 2, 4), (2, 3, 1), (3, 1, 2), (3, 4, 7),
+                              (4, 5, 3), (5, 6, 1), (6, 4, 2), (1, 7, 9),
+                              (7, 8, 5), (2, 8, 8) ]:
+            self.directed_graph.add_directed_edge(u, v, weight)
+            self.undirected_graph.add_undirected_edge(u, v, weight)
+
+        self.csr_directed_graph = graph_util.CSRGraph.from_graph(
+                                                            self.directed_graph)
+        self.csr_undirected_graph = graph_util.CSRGraph.from_graph(
+                                                          self.undirected_graph)
+
+    def tearDown(self):
+        pass
+
+    def total_weight(self, tree):
+        return sum(tree.weight(edge) for edge in tree.edges()) / 2
+
+    def test_explore(self):
+        self.assertEqual(self.util.explore(self.directed_graph, 4),
+                         self.util.explore(self.csr_directed_graph, 4))
+
+    def test_shortest_path_tree(self):
+        self.assertEqual(
+            self.util.shortest_path_tree(self.directed_graph, 1),
+            self.util.shortest_path_tree(self.csr_directed_graph, 1))
+
+    def test_dijkstra_shortest_paths(self):
+        self.assertEqual(
+            self.util.dijkstra_shortest_paths(self.directed_graph, 1),
+            self.util.dijkstra_shortest_paths(self.csr_directed_graph, 1))
+
+    def test_bellman_ford_shortest_paths(self):
+        self.assertEqual(
+            self.util.bellman_ford_shortest_paths(self.directed_graph, 1),
+            self.util.bellman_ford_shortest_paths(self.csr_directed_graph, 1))
+
+    def test_kruskal(self):
+        self.assertEqual(
+            self.total_weight(self.util.kruskal(self.undirected_graph)),
+            self.total_weight(self.util.kruskal(self.csr_undirected_graph)))
+
+    def test_prim(self):
+        self.assertEqual(
+            self.total_weight(self.util.prim(self.undirected_graph)),
+            self.total_weight(self.util.prim(self.csr_undirected_graph)))
+
+    def test_strongly_connected_components(self):
+        expected = self.util.strongly_connected_components(
+                                                            self.directed_graph)
+        actual = self.util.strongly_connected_components(
+                                                        self.csr_directed_graph)
+
+        self.assertEqual(sorted(sorted(x) for x in expected),
+                         sorted(sorted(x) for x in actual))
+
+    def test_topological_sort(self):
+        graph = graph_util.CSRGraph.from_edges(range(1, 5),
+                                               [ (1, 2, 0), (1, 3, 0),
+                                                 (3, 2, 0), (2, 4, 0) ])
+
+        self.assertEqual([ 1, 3, 2, 4 ], self.util.topological_sort(graph))
+
+class InstrumentedGraphUtilTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.instrumented_util = graph_util.InstrumentedGraphUtil()
+        self.graph = graph_util.Graph()
+        for node in [ 'A', 'B', 'C', 'D', 'E', 'F' ]:
+            self.graph.add_node(node)
+        for u, v, weight in [ ('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 5),
+                              ('C', 'D', 1), ('D', 'E', 3), ('B', 'E', 9) ]:
+            self.graph.add_undirected_edge(u, v, weight)
+
+    def tearDown(self):
+        pass
+
+    def test_no_stats_before_a_call(self):
+        self.assertIsNone(self.instrumented_util.stats)
+
+    def test_dijkstra_shortest_paths(self):
+        for queue in [ None, 'binary', 'bucket', 'radix' ]:
+            self.assertEqual(
+                self.util.dijkstra_shortest_paths(self.graph, 'A', queue),
+                self.instrumented_util.dijkstra_shortest_paths(self.graph,
+                                                               'A',
+                                                               queue))
+
+            stats = self.instrumented_util.stats
+            self.assertEqual('dijkstra_shortest_paths', stats.algorithm)
+            # F is unreachable
+            self.assertEqual(5, stats.counters['settled'])
+            self.assertEqual(5, stats.counters['heap_extracts'])
+            self.assertEqual(12, stats.counters['relaxed'])
+            # A-B, A-C, B-C, B-E, C-D and D-E improve a distance
+            self.assertEqual(6, stats.counters['successful_relaxations'])
+            self.assertEqual(5, stats.counters['heap_inserts'])
+            self.assertEqual(2, stats.counters['heap_decrease_keys'])
+            self.assertIn('total', stats.phase_seconds)
+            self.assertIn('queue_selection', stats.phase_seconds)
+
+    def test_bellman_ford_shortest_paths(self):
+        self.assertEqual(
+            self.util.bellman_ford_shortest_paths(self.graph, 'A'),
+            self.instrumented_util.bellman_ford_shortest_paths(self.graph,
+                                                               'A'))
+
+        counters = self.instrumented_util.stats.counters
+        self.assertEqual(5 * 12, counters['relaxed'])
+        # the edges come in the order A-B, B-C, C-D and D-E in the first
+        # pass, which finds all distances at once
+        self.assertEqual(4, counters['successful_relaxations'])
+
+    def test_prim(self):
+        minimum_spanning_tree = self.instrumented_util.prim(self.graph)
+
+        self.assertEqual(self.util.prim(self.graph).edges(),
+                         minimum_spanning_tree.edges())
+
+        counters = self.instrumented_util.stats.counters
+        self.assertEqual(6, counters['settled'])
+        self.assertEqual(12, counters['relaxed'])
+        # the roots A and F are inserted without a relaxation
+        self.assertEqual(counters['heap_inserts'] +
+                         counters['heap_decrease_keys'] - 2,
+                         counters['successful_relaxations'])
+
+    def test_kruskal(self):
+        self.assertEqual(self.util.kruskal(self.graph).edges(),
+                         self.instrumented_util.kruskal(self.graph).edges())
+
+        stats = self.instrumented_util.stats
+        self.assertEqual('kruskal', stats.algorithm)
+        self.assertGreater(stats.counters['finds'], 0)
+        self.assertLessEqual(stats.counters['maximum_find_depth'],
+                             stats.counters['find_depth'])
+        self.assertIn('sort', stats.phase_seconds)
+
+    def test_boruvka(self):
+        self.assertEqual(self.util.boruvka(self.graph).edges(),
+                         self.instrumented_util.boruvka(self.graph).edges())
+
+        stats = self.instrumented_util.stats
+        self.assertEqual('boruvka', stats.algorithm)
+        self.assertGreater(stats.counters['finds'], 0)
+
+    def test_depth_first_searches(self):
+        self.assertEqual(self.util.topological_sort(self.graph),
+                         self.instrumented_util.topological_sort(self.graph))
+
+        stats = self.instrumented_util.stats
+        self.assertEqual(6, stats.counters['dfs_pushes'])
+
+        self.instrumented_util.explore(self.graph, 'A')
+
+        stats = self.instrumented_util.stats
+        self.assertEqual('explore', stats.algorithm)
+        self.assertEqual(5, stats.counters['dfs_pushes'])
+
+    def test_nested_calls(self):
+        self.instrumented_util.strongly_connected_components(self.graph)
+
+        # the Depth First Search over the reversed graph and the
+        # explorations of the components add to the same stats
+        stats = self.instrumented_util.stats
+        self.assertEqual('strongly_connected_components', stats.algorithm)
+        self.assertEqual(12, stats.counters['dfs_pushes'])
+        self.assertIn('reverse', stats.phase_seconds)
+
+        self.instrumented_util.strongly_connected_components(self.graph,
+                                                             'tarjan')
+
+        stats = self.instrumented_util.stats
+        self.assertEqual('strongly_connected_components', stats.algorithm)
+        self.assertEqual(6, stats.counters['dfs_pushes'])
+
+    def test_breadth_first_search(self):
+        self.assertEqual(
+            self.util.breadth_first_search(self.graph, [ 'A' ]),
+            self.instrumented_util.breadth_first_search(self.graph, [ 'A' ]))
+        self.assertEqual(5, self.instrumented_util.stats.counters['settled'])
+
+    def test_as_dict(self):
+        self.instrumented_util.spfa_shortest_paths(self.graph, 'A')
+
+        data = self.instrumented_util.stats.as_dict()
+
+        self.assertEqual('spfa_shortest_paths', data['algorithm'])
+        self.assertGreater(data['counters']['relaxed'], 0)
+        self.assertEqual(data, json.loads(json.dumps(data)))
+
+    def test_helpers_outside_of_an_instrumented_call(self):
+        self.instrumented_util.dijkstra_shortest_paths(self.graph, 'A')
+        stats = self.instrumented_util.stats
+
+        component_count = self.instrumented_util.count_components(self.graph)
+
+        self.assertEqual(2, component_count)
+
+        self.assertIs(stats, self.instrumented_util.stats)
+        self.assertNotIn('dfs_pushes', stats.counters)
+
 if __name__ == '__main__':
     unittest.main()
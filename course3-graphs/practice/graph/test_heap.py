@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 
+import collections
 import unittest
 
 import heap
@@ -1239,12 +1240,455 @@ class BinHeapAsMaxTestCase(unittest.TestCase):
                          list)
         self.assertEqual(7, self.heap.size)
 
+class IndexedBinHeapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.heap = heap.IndexedBinHeap(heap.HeapMode.min)
+
+    def tearDown(self):
+        pass
+
+    def assert_positions(self):
+        for i, item in enumerate(self.heap.elements):
+            self.assertEqual(i, self.heap.position(item.datum))
+
+    def test_constructor(self):
+        self.assertEqual(0, self.heap.size)
+        self.assertEqual([], self.heap.elements)
+        self.assertFalse(self.heap.contains('a'))
+
+    def test_position_of_nonexisting_datum(self):
+        with self.assertRaisesRegex(KeyError, 'a not in the heap.'):
+            self.heap.position('a')
+
+    def test_insert(self):
+        self.heap.insert(heap.HeapItem(3, 'a'))
+        self.heap.insert(heap.HeapItem(2, 'b'))
+        self.heap.insert(heap.HeapItem(1, 'c'))
+
+        self.assertEqual(3, self.heap.size)
+        self.assertEqual([ heap.HeapItem(1, 'c'), heap.HeapItem(3, 'a'),
+                          heap.HeapItem(2, 'b') ],
+                         self.heap.elements)
+        self.assertTrue(self.heap.contains('a'))
+        self.assertTrue(self.heap.contains('b'))
+        self.assertTrue(self.heap.contains('c'))
+        self.assert_positions()
+
+    def test_insert_as_existing_datum(self):
+        self.heap.insert(heap.HeapItem(1, 'a'))
+
+        with self.assertRaisesRegex(ValueError, 'a already in the heap.'):
+            self.heap.insert(heap.HeapItem(2, 'a'))
+
+    def test_build(self):
+        self.heap.build([ heap.HeapItem(9, 'a'), heap.HeapItem(5, 'b'),
+                         heap.HeapItem(6, 'c'), heap.HeapItem(2, 'd'),
+                         heap.HeapItem(3, 'e') ])
+
+        self.assertEqual(5, self.heap.size)
+        self.assertEqual(heap.HeapItem(2, 'd'), self.heap.elements[0])
+        self.assert_positions()
+
+    def test_build_with_duplicate_datum(self):
+        with self.assertRaisesRegex(ValueError, 'a already in the heap.'):
+            self.heap.build([ heap.HeapItem(1, 'a'), heap.HeapItem(2, 'a') ])
+
+    def test_extract(self):
+        self.heap.build([ heap.HeapItem(9, 'a'), heap.HeapItem(5, 'b'),
+                         heap.HeapItem(6, 'c'), heap.HeapItem(2, 'd'),
+                         heap.HeapItem(3, 'e') ])
+
+        result = []
+        while self.heap.size > 0:
+            item = self.heap.extract()
+            result.append(item.datum)
+
+            self.assertFalse(self.heap.contains(item.datum))
+            self.assert_positions()
+
+        self.assertEqual([ 'd', 'e', 'b', 'c', 'a' ], result)
+        self.assertEqual([], self.heap.elements)
+
+    def test_decrease_key(self):
+        self.heap.build([ heap.HeapItem(9, 'a'), heap.HeapItem(5, 'b'),
+                         heap.HeapItem(6, 'c'), heap.HeapItem(2, 'd'),
+                         heap.HeapItem(3, 'e') ])
+
+        self.heap.decrease_key('a', 1)
+
+        self.assertEqual(heap.HeapItem(1, 'a'), self.heap.elements[0])
+        self.assert_positions()
+
+        self.heap.decrease_key('c', 4)
+
+        result = []
+        while self.heap.size > 0:
+            result.append(self.heap.extract())
+
+        self.assertEqual([ heap.HeapItem(1, 'a'), heap.HeapItem(2, 'd'),
+                          heap.HeapItem(3, 'e'), heap.HeapItem(4, 'c'),
+                          heap.HeapItem(5, 'b') ],
+                         result)
+
+    def test_decrease_key_with_same_priority(self):
+        self.heap.build([ heap.HeapItem(1, 'a'), heap.HeapItem(2, 'b') ])
+
+        self.heap.decrease_key('b', 2)
+
+        self.assertEqual([ heap.HeapItem(1, 'a'), heap.HeapItem(2, 'b') ],
+                         self.heap.elements)
+
+    def test_decrease_key_with_lower_priority(self):
+        self.heap.build([ heap.HeapItem(1, 'a'), heap.HeapItem(2, 'b') ])
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Priority 3 of b is not higher than 2.'):
+            self.heap.decrease_key('b', 3)
+
+    def test_decrease_key_with_nonexisting_datum(self):
+        with self.assertRaisesRegex(KeyError, 'a not in the heap.'):
+            self.heap.decrease_key('a', 1)
+
+    def test_decrease_key_as_max(self):
+        self.heap = heap.IndexedBinHeap(heap.HeapMode.max)
+        self.heap.build([ heap.HeapItem(1, 'a'), heap.HeapItem(2, 'b'),
+                         heap.HeapItem(3, 'c') ])
+
+        self.heap.decrease_key('a', 4)
+
+        self.assertEqual(heap.HeapItem(4, 'a'), self.heap.elements[0])
+        self.assert_positions()
+
+    def test_change_priority(self):
+        self.heap.build([ heap.HeapItem(1, 'a'), heap.HeapItem(2, 'b'),
+                         heap.HeapItem(3, 'c') ])
+
+        self.heap.change_priority(self.heap.position('a'), 4)
+
+        self.assertEqual(heap.HeapItem(2, 'b'), self.heap.elements[0])
+        self.assert_positions()
+
+    def test_change_priority_with_exceeding_index(self):
+        self.heap.build([ heap.HeapItem(1, 'a') ])
+
+        with self.assertRaisesRegex(IndexError, ''):
+            self.heap.change_priority(self.heap.size, 1)
+
+    def test_sort_in_place(self):
+        data = [ heap.HeapItem(3, 'a'), heap.HeapItem(1, 'b'),
+                 heap.HeapItem(2, 'c') ]
+
+        self.heap.sort_in_place(data)
+
+        self.assertEqual([ heap.HeapItem(3, 'a'), heap.HeapItem(2, 'c'),
+                          heap.HeapItem(1, 'b') ],
+                         data)
+        self.assert_positions()
+
+class BucketQueueTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.heap = heap.BucketQueue(3)
+
+    def tearDown(self):
+        pass
+
+    def extract_all(self):
+        result = []
+        while self.heap.size > 0:
+            result.append(self.heap.extract())
+
+        return result
+
+    def test_constructor(self):
+        self.assertEqual(0, self.heap.size)
+        self.assertFalse(self.heap.contains('a'))
+
+    def test_constructor_with_negative_spread(self):
+        with self.assertRaisesRegex(ValueError,
+                                    'Maximum spread must be non-negative.'):
+            heap.BucketQueue(-1)
+
+    def test_extract_on_empty_queue(self):
+        with self.assertRaises(IndexError):
+            self.heap.extract()
+
+        self.heap.insert(heap.HeapItem(2, 'a'))
+        self.heap.extract()
+
+        with self.assertRaises(IndexError):
+            self.heap.extract()
+
+    def test_insert_and_extract(self):
+        self.heap.insert(heap.HeapItem(3, 'a'))
+        self.heap.insert(heap.HeapItem(1, 'b'))
+        self.heap.insert(heap.HeapItem(2, 'c'))
+        self.heap.insert(heap.HeapItem(1, 'd'))
+
+        self.assertEqual(4, self.heap.size)
+        self.assertTrue(self.heap.contains('a'))
+        self.assertEqual([ heap.HeapItem(1, 'b'), heap.HeapItem(1, 'd'),
+                          heap.HeapItem(2, 'c'), heap.HeapItem(3, 'a') ],
+                         self.extract_all())
+        self.assertFalse(self.heap.contains('a'))
+
+    def test_wrap_around(self):
+        self.heap.insert(heap.HeapItem(2, 'a'))
+        self.heap.extract()
+        self.heap.insert(heap.HeapItem(5, 'b'))
+        self.heap.insert(heap.HeapItem(3, 'c'))
+        self.heap.extract()
+        self.heap.insert(heap.HeapItem(6, 'd'))
+
+        self.assertEqual([ heap.HeapItem(5, 'b'), heap.HeapItem(6, 'd') ],
+                         self.extract_all())
+
+    def test_insert_below_minimum(self):
+        self.heap.insert(heap.HeapItem(3, 'a'))
+        self.heap.extract()
+        self.heap.insert(heap.HeapItem(2, 'b'))
+        self.heap.insert(heap.HeapItem(0, 'c'))
+
+        self.assertEqual([ heap.HeapItem(0, 'c'), heap.HeapItem(2, 'b') ],
+                         self.extract_all())
+
+    def test_insert_as_existing_datum(self):
+        self.heap.insert(heap.HeapItem(1, 'a'))
+
+        with self.assertRaisesRegex(ValueError, 'a already in the heap.'):
+            self.heap.insert(heap.HeapItem(2, 'a'))
+
+    def test_insert_with_negative_priority(self):
+        with self.assertRaisesRegex(ValueError,
+                                    'Priority -1 must be non-negative.'):
+            self.heap.insert(heap.HeapItem(-1, 'a'))
+
+    def test_insert_exceeding_spread(self):
+        self.heap.insert(heap.HeapItem(1, 'a'))
+
+        with self.assertRaisesRegex(
+            ValueError, 'Priority 5 exceeds the spread of the queue.'):
+            self.heap.insert(heap.HeapItem(5, 'b'))
+
+    def test_insert_below_minimum_exceeding_spread(self):
+        self.heap = heap.BucketQueue(2)
+        self.heap.insert(heap.HeapItem(2, 'a'))
+        self.heap.insert(heap.HeapItem(4, 'b'))
+
+        with self.assertRaisesRegex(
+            ValueError, 'Priority 0 exceeds the spread of the queue.'):
+            self.heap.insert(heap.HeapItem(0, 'c'))
+
+        self.assertEqual([ heap.HeapItem(2, 'a'), heap.HeapItem(4, 'b') ],
+                         self.extract_all())
+
+    def test_decrease_key_exceeding_spread(self):
+        self.heap = heap.BucketQueue(2)
+        self.heap.insert(heap.HeapItem(2, 'a'))
+        self.heap.insert(heap.HeapItem(4, 'b'))
+
+        with self.assertRaisesRegex(
+            ValueError, 'Priority 1 exceeds the spread of the queue.'):
+            self.heap.decrease_key('a', 1)
+
+        # the largest priority moves down when its datum is decreased
+        self.heap.decrease_key('b', 0)
+
+        self.assertEqual([ heap.HeapItem(0, 'b'), heap.HeapItem(2, 'a') ],
+                         self.extract_all())
+
+    def test_decrease_key(self):
+        self.heap.insert(heap.HeapItem(3, 'a'))
+        self.heap.insert(heap.HeapItem(2, 'b'))
+        self.heap.insert(heap.HeapItem(3, 'c'))
+
+        self.heap.decrease_key('c', 1)
+        self.heap.decrease_key('a', 3)
+
+        self.assertEqual([ heap.HeapItem(1, 'c'), heap.HeapItem(2, 'b'),
+                          heap.HeapItem(3, 'a') ],
+                         self.extract_all())
+
+    def test_decrease_key_with_lower_priority(self):
+        self.heap.insert(heap.HeapItem(2, 'b'))
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Priority 3 of b is not higher than 2.'):
+            self.heap.decrease_key('b', 3)
+
+    def test_decrease_key_with_nonexisting_datum(self):
+        with self.assertRaisesRegex(KeyError, 'a not in the heap.'):
+            self.heap.decrease_key('a', 1)
+
+class RadixHeapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.heap = heap.RadixHeap()
+
+    def tearDown(self):
+        pass
+
+    def extract_all(self):
+        result = []
+        while self.heap.size > 0:
+            result.append(self.heap.extract())
+
+        return result
+
+    def test_constructor(self):
+        self.assertEqual(0, self.heap.size)
+        self.assertFalse(self.heap.contains('a'))
+
+    def test_insert_and_extract(self):
+        self.heap.insert(heap.HeapItem(1000, 'a'))
+        self.heap.insert(heap.HeapItem(7, 'b'))
+        self.heap.insert(heap.HeapItem(0, 'c'))
+        self.heap.insert(heap.HeapItem(8, 'd'))
+
+        self.assertEqual(4, self.heap.size)
+        self.assertTrue(self.heap.contains('a'))
+        self.assertEqual([ heap.HeapItem(0, 'c'), heap.HeapItem(7, 'b'),
+                          heap.HeapItem(8, 'd'), heap.HeapItem(1000, 'a') ],
+                         self.extract_all())
+        self.assertFalse(self.heap.contains('a'))
+
+    def test_monotone_inserts(self):
+        deltas = [ 5, 9, 0, 33, 1, 64, 70, 100 ]
+        result = []
+        self.heap.insert(heap.HeapItem(0, 0))
+        for i, delta in enumerate(deltas):
+            result.append(self.heap.extract().priority)
+            self.heap.insert(heap.HeapItem(result[-1] + delta, i + 1))
+            self.heap.insert(heap.HeapItem(result[-1] + 50, -i - 1))
+
+        result.extend([x.priority for x in self.extract_all()])
+
+        self.assertEqual(sorted(result), result)
+        self.assertEqual(17, len(result))
+
+    def test_insert_as_existing_datum(self):
+        self.heap.insert(heap.HeapItem(1, 'a'))
+
+        with self.assertRaisesRegex(ValueError, 'a already in the heap.'):
+            self.heap.insert(heap.HeapItem(2, 'a'))
+
+    def test_insert_below_last_extracted(self):
+        self.heap.insert(heap.HeapItem(3, 'a'))
+        self.heap.extract()
+
+        with self.assertRaisesRegex(
+            ValueError, 'Priority 2 is lower than the last extracted 3.'):
+            self.heap.insert(heap.HeapItem(2, 'b'))
+
+    def test_decrease_key(self):
+        self.heap.insert(heap.HeapItem(1, 'a'))
+        self.heap.insert(heap.HeapItem(20, 'b'))
+        self.heap.insert(heap.HeapItem(30, 'c'))
+        self.heap.extract()
+
+        self.heap.decrease_key('c', 10)
+        self.heap.decrease_key('b', 20)
+
+        self.assertEqual([ heap.HeapItem(10, 'c'), heap.HeapItem(20, 'b') ],
+                         self.extract_all())
+
+    def test_decrease_key_below_last_extracted(self):
+        self.heap.insert(heap.HeapItem(3, 'a'))
+        self.heap.insert(heap.HeapItem(5, 'b'))
+        self.heap.extract()
+
+        with self.assertRaisesRegex(
+            ValueError, 'Priority 2 is lower than the last extracted 3.'):
+            self.heap.decrease_key('b', 2)
+        self.assertTrue(self.heap.contains('b'))
+
+    def test_decrease_key_with_lower_priority(self):
+        self.heap.insert(heap.HeapItem(2, 'b'))
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Priority 3 of b is not higher than 2.'):
+            self.heap.decrease_key('b', 3)
+
+    def test_decrease_key_with_nonexisting_datum(self):
+        with self.assertRaisesRegex(KeyError, 'a not in the heap.'):
+            self.heap.decrease_key('a', 1)
+
+class InstrumentedQueueTestCase(unittest.TestCase):
+
+    def test_indexed_bin_heap(self):
+        queue = heap.InstrumentedIndexedBinHeap()
+        for priority, datum in [ (3, 'c'), (2, 'b'), (1, 'a') ]:
+            queue.insert(heap.HeapItem(priority, datum))
+
+        self.assertEqual(2, queue.counters['heap_sift_steps'])
+
+        queue.decrease_key('c', 0)
+
+        self.assertEqual([ 'c', 'a', 'b' ],
+                         [ queue.extract().datum for i in range(3) ])
+        self.assertEqual(3, queue.counters['heap_inserts'])
+        self.assertEqual(3, queue.counters['heap_extracts'])
+        self.assertEqual(1, queue.counters['heap_decrease_keys'])
+
+    def test_bucket_queue(self):
+        queue = heap.InstrumentedBucketQueue(10)
+        queue.insert(heap.HeapItem(0, 'a'))
+        queue.insert(heap.HeapItem(7, 'b'))
+        queue.decrease_key('b', 5)
+
+        self.assertEqual(0, queue.extract().priority)
+        self.assertEqual(0, queue.counters['heap_sift_steps'])
+        self.assertEqual(5, queue.extract().priority)
+        self.assertEqual(5, queue.counters['heap_sift_steps'])
+        self.assertEqual(2, queue.counters['heap_inserts'])
+        self.assertEqual(1, queue.counters['heap_decrease_keys'])
+
+    def test_radix_heap(self):
+        queue = heap.InstrumentedRadixHeap()
+        for priority, datum in [ (0, 'a'), (5, 'b'), (6, 'c') ]:
+            queue.insert(heap.HeapItem(priority, datum))
+
+        self.assertEqual('a', queue.extract().datum)
+        self.assertEqual(0, queue.counters['heap_sift_steps'])
+        self.assertEqual('b', queue.extract().datum)
+        self.assertEqual(2, queue.counters['heap_sift_steps'])
+        self.assertEqual(3, queue.counters['heap_inserts'])
+        self.assertEqual(2, queue.counters['heap_extracts'])
+
+    def test_shared_counters(self):
+        counters = collections.Counter()
+        queues = [ heap.InstrumentedIndexedBinHeap(heap.HeapMode.min,
+                                                   counters),
+                   heap.InstrumentedBucketQueue(1, counters),
+                   heap.InstrumentedRadixHeap(counters) ]
+
+        for queue in queues:
+            queue.insert(heap.HeapItem(1, 'a'))
+
+        self.assertEqual(3, counters['heap_inserts'])
+
+    def test_failed_decrease_key(self):
+        queue = heap.InstrumentedBucketQueue(10)
+        queue.insert(heap.HeapItem(2, 'a'))
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Priority 3 of a is not higher than 2.'):
+            queue.decrease_key('a', 3)
+
+        self.assertEqual(1, queue.counters['heap_inserts'])
+        self.assertEqual(0, queue.counters['heap_decrease_keys'])
+
 if __name__ == '__main__':
     class_names = \
     [
         HeapItemTestCase,
         BinHeapAsMinTestCase,
         BinHeapAsMaxTestCase,
+        IndexedBinHeapTestCase,
+        BucketQueueTestCase,
+        RadixHeapTestCase,
+        InstrumentedQueueTestCase,
     ]
 
     suite = unittest.TestSuite()
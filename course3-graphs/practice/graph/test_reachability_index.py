@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+
+import os
+import random
+import tempfile
+import unittest
+
+import graph_util
+import reachability_index
+
+class IntervalReachabilityIndex(reachability_index.ReachabilityIndex):
+    # forces the GRAIL labels even on small graphs
+    BITSET_COMPONENT_LIMIT = 0
+
+class ReachabilityIndexTestCase(unittest.TestCase):
+
+    index_class = reachability_index.ReachabilityIndex
+
+    def setUp(self):
+        self.util = graph_util.GraphUtil()
+        self.graph = graph_util.Graph()
+
+    def tearDown(self):
+        pass
+
+    def random_graph(self, node_count, edge_count, seed):
+        generator = random.Random(seed)
+        for node in range(node_count):
+            self.graph.add_node(node)
+        edges = set()
+        while len(edges) < edge_count:
+            u = generator.randrange(node_count)
+            v = generator.randrange(node_count)
+            if u == v or (u, v) in edges:
+                continue
+            edges.add((u, v))
+            self.graph.add_directed_edge(u, v)
+
+    def assert_queries(self, index):
+        for x in self.graph.nodes():
+            for y in self.graph.nodes():
+                self.assertEqual(self.util.reaches(self.graph, x, y),
+                                 index.reaches(x, y),
+                                 (x, y))
+
+    def test_empty_graph(self):
+        index = self.index_class.build(self.graph)
+
+        self.assertEqual(0, index.component_count)
+
+    def test_nonexisting_node(self):
+        self.graph.add_node('A')
+
+        index = self.index_class.build(self.graph)
+
+        with self.assertRaises(KeyError):
+            index.reaches('A', 'B')
+
+    def test_cycle_and_tail(self):
+        for node in [ 'A', 'B', 'C', 'D' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B')
+        self.graph.add_directed_edge('B', 'C')
+        self.graph.add_directed_edge('C', 'A')
+        self.graph.add_directed_edge('C', 'D')
+
+        index = self.index_class.build(self.graph)
+
+        self.assertEqual(2, index.component_count)
+        self.assertEqual(index.component('A'), index.component('C'))
+        self.assertTrue(index.reaches('B', 'A'))
+        self.assertTrue(index.reaches('A', 'D'))
+        self.assertFalse(index.reaches('D', 'A'))
+        self.assertTrue(index.reaches('D', 'D'))
+
+    def test_random_sparse_graph(self):
+        self.random_graph(60, 70, 1)
+
+        self.assert_queries(self.index_class.build(self.graph, seed=1))
+
+    def test_random_dense_graph(self):
+        self.random_graph(40, 120, 2)
+
+        self.assert_queries(self.index_class.build(self.graph, seed=2))
+
+    def test_save_and_load(self):
+        self.random_graph(30, 40, 3)
+
+        index = self.index_class.build(self.graph)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'graph.reach')
+            index.save(path)
+            loaded_index = self.index_class.load(path)
+
+        self.assertEqual(index.component_count, loaded_index.component_count)
+        self.assert_queries(loaded_index)
+
+    def test_add_node(self):
+        self.random_graph(20, 30, 4)
+        index = self.index_class.build(self.graph)
+
+        self.graph.add_node(20)
+        index.add_node(20)
+
+        self.assertFalse(index.stale)
+        self.assert_queries(index)
+        with self.assertRaisesRegex(ValueError,
+                                    'Node 20 already in the index.'):
+            index.add_node(20)
+
+    def test_add_edges(self):
+        self.random_graph(30, 30, 5)
+        index = self.index_class.build(self.graph)
+
+        generator = random.Random(5)
+        for i in range(20):
+            u = generator.randrange(30)
+            v = generator.randrange(30)
+            if u == v or (u, v) in self.graph.edges():
+                continue
+
+            self.graph.add_directed_edge(u, v)
+            index.add_edge(u, v)
+            if index.stale:
+                index = self.index_class.build(self.graph)
+
+            self.assert_queries(index)
+
+    def test_add_edge_closing_cycle(self):
+        for node in [ 'A', 'B' ]:
+            self.graph.add_node(node)
+        self.graph.add_directed_edge('A', 'B')
+        index = self.index_class.build(self.graph)
+
+        index.add_edge('A', 'B')
+        self.assertFalse(index.stale)
+
+        index.add_edge('B', 'A')
+        self.assertTrue(index.stale)
+
+    def test_invalidate(self):
+        self.graph.add_node('A')
+        index = self.index_class.build(self.graph)
+
+        index.invalidate()
+
+        self.assertTrue(index.stale)
+        with self.assertRaisesRegex(ValueError,
+                                    'The index is stale, rebuild it.'):
+            index.reaches('A', 'A')
+        with self.assertRaisesRegex(ValueError,
+                                    'The index is stale, rebuild it.'):
+            index.save(os.devnull)
+
+class IntervalReachabilityIndexTestCase(ReachabilityIndexTestCase):
+
+    index_class = IntervalReachabilityIndex
+
+    def test_add_edge_between_unconnected_components(self):
+        for node in [ 'A', 'B' ]:
+            self.graph.add_node(node)
+        index = self.index_class.build(self.graph)
+
+        index.add_edge('A', 'B')
+
+        self.assertTrue(index.stale)
+
+if __name__ == '__main__':
+    unittest.main()
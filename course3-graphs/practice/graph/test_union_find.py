@@ -691,11 +691,133 @@ class UnionFindTestCase(unittest.TestCase):
         self.assert_node(node7, value7, node1, 1)
         self.assert_node(node8, value8, node1, 0)
 
+class ArrayUnionFindTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.structure = union_find.ArrayUnionFind(8)
+
+    def tearDown(self):
+        pass
+
+    def test_singletons(self):
+        self.assertEqual(8, len(self.structure))
+        self.assertEqual(8, self.structure.component_count)
+        for x in range(8):
+            self.assertEqual(x, self.structure.find(x))
+            self.assertEqual(1, self.structure.component_size(x))
+
+    def test_empty(self):
+        structure = union_find.ArrayUnionFind(0)
+
+        self.assertEqual(0, len(structure))
+        self.assertEqual(0, structure.component_count)
+
+    def test_find_of_nonexisting_element(self):
+        with self.assertRaisesRegex(ValueError, '8 not in the set.'):
+            self.structure.find(8)
+        with self.assertRaisesRegex(ValueError, '-1 not in the set.'):
+            self.structure.find(-1)
+
+    def test_union(self):
+        self.assertTrue(self.structure.union(0, 1))
+        self.assertTrue(self.structure.union(2, 1))
+        self.assertFalse(self.structure.union(0, 2))
+
+        self.assertEqual(6, self.structure.component_count)
+        self.assertEqual(3, self.structure.component_size(2))
+        self.assertEqual(1, self.structure.component_size(3))
+        self.assertEqual(self.structure.find(0), self.structure.find(2))
+        self.assertNotEqual(self.structure.find(0), self.structure.find(3))
+
+    def test_union_attaches_smaller_tree(self):
+        self.structure.union(0, 1)
+        self.structure.union(0, 2)
+
+        self.structure.union(3, 0)
+
+        self.assertEqual(self.structure.find(1), self.structure.find(3))
+        self.assertEqual(self.structure.find(0), self.structure.find(3))
+        self.assertNotEqual(3, self.structure.find(3))
+
+    def test_union_many(self):
+        merge_count = self.structure.union_many([ (0, 1), (2, 3), (1, 0),
+                                                  (3, 1), (6, 7) ])
+
+        self.assertEqual(4, merge_count)
+        self.assertEqual(4, self.structure.component_count)
+        self.assertEqual(4, self.structure.component_size(0))
+        self.assertEqual(2, self.structure.component_size(7))
+
+    def test_find_many(self):
+        self.structure.union_many([ (0, 1), (1, 2), (5, 6) ])
+
+        roots = self.structure.find_many([ 0, 1, 2, 3, 5, 6 ])
+
+        self.assertEqual(roots[0], roots[1])
+        self.assertEqual(roots[0], roots[2])
+        self.assertEqual(3, roots[3])
+        self.assertEqual(roots[4], roots[5])
+        self.assertNotEqual(roots[0], roots[4])
+
+    def test_add(self):
+        self.structure.union(0, 1)
+
+        x = self.structure.add()
+
+        self.assertEqual(8, x)
+        self.assertEqual(9, len(self.structure))
+        self.assertEqual(8, self.structure.component_count)
+        self.assertEqual(8, self.structure.find(8))
+
+        self.structure.union(8, 0)
+
+        self.assertEqual(3, self.structure.component_size(8))
+
+    def test_path_halving(self):
+        structure = union_find.ArrayUnionFind(1000)
+        for x in range(1, 1000):
+            structure.union(0, x)
+
+        roots = structure.find_many(range(1000))
+
+        self.assertEqual(1, len(set(roots)))
+        self.assertEqual(1, structure.component_count)
+        self.assertEqual(1000, structure.component_size(999))
+
+class InstrumentedArrayUnionFindTestCase(unittest.TestCase):
+
+    def test_find_depth(self):
+        structure = union_find.InstrumentedArrayUnionFind(4)
+        structure.union_many([ (0, 1), (2, 3), (1, 3) ])
+
+        self.assertEqual(6, structure.counters['finds'])
+        self.assertEqual(2, structure.counters['find_depth'])
+
+        # follows 3 -> 2 -> 0 and halves it into 3 -> 0
+        self.assertEqual(0, structure.find(3))
+        self.assertEqual(0, structure.find(3))
+
+        self.assertEqual(8, structure.counters['finds'])
+        self.assertEqual(4, structure.counters['find_depth'])
+        self.assertEqual(1, structure.counters['maximum_find_depth'])
+
+    def test_same_sets_as_array_union_find(self):
+        pairs = [ (0, 1), (2, 3), (1, 3), (5, 4), (6, 7), (7, 4) ]
+        structure = union_find.ArrayUnionFind(8)
+        instrumented_structure = union_find.InstrumentedArrayUnionFind(8)
+
+        self.assertEqual(structure.union_many(pairs),
+                         instrumented_structure.union_many(pairs))
+        self.assertEqual(structure.find_many(range(8)),
+                         instrumented_structure.find_many(range(8)))
+
 if __name__ == '__main__':
     class_names = \
     [
         NodeTestCase,
         UnionFindTestCase,
+        ArrayUnionFindTestCase,
+        InstrumentedArrayUnionFindTestCase,
     ]
 
     suite = unittest.TestSuite()
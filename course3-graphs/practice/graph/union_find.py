@@ -1,3 +1,6 @@
+import array
+import collections
+
 class Node:
 
     def __init__ (self, value):
@@ -75,3 +78,148 @@ class UnionFind:
             x.parent = self.find(x.parent)
 
             return x.parent
+
+class ArrayUnionFind:
+    """
+    Represents disjoint sets of the integers 0, 1, ..., n - 1 in two flat
+    arrays instead of wrapper nodes: the parent of every element and the
+    size of every tree (meaningful at the roots only).
+
+    Union by size keeps the trees shallow and find() halves the path it
+    follows (every visited element is pointed to its grandparent), so no
+    recursion is needed.
+    """
+
+    def __init__(self, n):
+        """
+        Initializes n singletons.
+
+        @type  n: int
+        @param n: The number of elements.
+        """
+
+        self._parent = array.array('i', range(n))
+        self._size = array.array('i', [1]) * n
+        self._component_count = n
+
+    def __len__(self):
+        return len(self._parent)
+
+    @property
+    def component_count(self):
+        return self._component_count
+
+    def add(self):
+        """
+        Adds a new singleton and returns its element, which is the next
+        integer.
+        """
+
+        x = len(self._parent)
+        self._parent.append(x)
+        self._size.append(1)
+        self._component_count += 1
+
+        return x
+
+    def find(self, x):
+        """
+        Follows parent links until it reaches the root.
+
+        Applies path halving.
+        """
+
+        parent = self._parent
+        if not (0 <= x < len(parent)):
+            raise ValueError('{} not in the set.'.format(x))
+
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+
+        return x
+
+    def union(self, x, y):
+        """
+        Attaches the root of the smaller tree to the root of the larger one.
+
+        Returns whether x and y were in different sets.
+        """
+
+        x_root = self.find(x)
+        y_root = self.find(y)
+
+        if x_root == y_root:
+            return False
+
+        size = self._size
+        if size[x_root] < size[y_root]:
+            x_root, y_root = y_root, x_root
+        self._parent[y_root] = x_root
+        size[x_root] += size[y_root]
+        self._component_count -= 1
+
+        return True
+
+    def union_many(self, pairs):
+        """
+        Unites every (x, y) pair in turn and returns the number of unions
+        that merged two different sets.
+        """
+
+        merge_count = 0
+        for x, y in pairs:
+            if self.union(x, y):
+                merge_count += 1
+
+        return merge_count
+
+    def find_many(self, xs):
+        """
+        Returns the list of the roots of the given elements.
+        """
+
+        return [self.find(x) for x in xs]
+
+    def component_size(self, x):
+        """
+        Returns the number of elements in the set of x.
+        """
+
+        return self._size[self.find(x)]
+
+class InstrumentedArrayUnionFind(ArrayUnionFind):
+    """
+    Represents an ArrayUnionFind that counts its finds in a shared
+    collections.Counter: finds, find_depth (the parent links followed by
+    all finds) and maximum_find_depth.
+
+    Only this subclass counts, so the plain ArrayUnionFind costs nothing
+    extra.
+    """
+
+    def __init__(self, n, counters=None):
+        super().__init__(n)
+
+        if counters is None:
+            counters = collections.Counter()
+        self.counters = counters
+
+    def find(self, x):
+        parent = self._parent
+        if not (0 <= x < len(parent)):
+            raise ValueError('{} not in the set.'.format(x))
+
+        depth = 0
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+            depth += 1
+
+        counters = self.counters
+        counters['finds'] += 1
+        counters['find_depth'] += depth
+        if depth > counters['maximum_find_depth']:
+            counters['maximum_find_depth'] = depth
+
+        return x